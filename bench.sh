@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+# Runs benchmarks, see `./bench.sh --help`.
+
+set -eu
+
+python3 -m yo1k.tic_tac_toe.bench "$@"
@@ -1,4 +1,4 @@
 REM An application launcher for Windows Command shell and PowerShell.
 
 cd "%~p0"
-py -m yo1k.tic_tac_toe
+py -m yo1k.tic_tac_toe %*
@@ -4,4 +4,4 @@
 set -eu
 
 cd "$(dirname "${0}")"
-python3 -m yo1k.tic_tac_toe
+python3 -m yo1k.tic_tac_toe "$@"
@@ -1,10 +1,47 @@
+"""The command-line interface, run `python -m yo1k.tic_tac_toe --help` for the usage.
+
+The module of a command is imported only when the command runs, and the modules of `AI`s
+only when they are requested from `registry.AIS`, so that short-lived processes start fast.
+Run `python -X importtime -m yo1k.tic_tac_toe COMMAND` to see what a command imports.
+"""
+from __future__ import annotations
+import importlib
 import os
-import numpy as np
+import sys
+from collections.abc import Mapping, Sequence
+from typing import Optional
+
+_COMMANDS: Mapping[str, tuple[str, str]] = {
+        "play": ("yo1k.tic_tac_toe.play", "plays a game between two AIs, the default command"),
+        "tournament": ("yo1k.tic_tac_toe.tournament", "plays many games between two AIs"),
+        "stats": ("yo1k.tic_tac_toe.events", "streams statistics of many games between two AIs"),
+        "serve": ("yo1k.tic_tac_toe.server", "hosts matches between players over TCP"),
+        "load": ("yo1k.tic_tac_toe.client", "generates load on a local server"),
+        "bench": ("yo1k.tic_tac_toe.bench", "runs benchmarks"),
+        "book": ("yo1k.tic_tac_toe.book", "generates the book of all positions")}
+"""Modules with `main(argv)` by command, and descriptions of the commands."""
+
+
+def _usage() -> str:
+    lines = ["usage: python -m yo1k.tic_tac_toe [COMMAND] [ARGS...]", "", "commands:"]
+    lines.extend(f"  {command:<12} {description}"
+                 for (command, (_, description)) in _COMMANDS.items())
+    lines.extend(["", "Run `python -m yo1k.tic_tac_toe COMMAND --help` for the usage of COMMAND."])
+    return os.linesep.join(lines)
+
 
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) > 0 and argv[0] in ("-h", "--help"):
+        print(_usage(), end=os.linesep)
+        return
+    if len(argv) > 0 and argv[0] in _COMMANDS:
+        (command, args) = (argv[0], argv[1:])
+    else:
+        (command, args) = ("play", argv)
+    (module, _) = _COMMANDS[command]
+    importlib.import_module(module).main(args)
 
-data = np.array([[1, 2], [3, 4]])
-ones = np.array([[1, 1], [1, 1]])
-result = np.array([[2, 3], [4, 5]])
 
-assert np.array_equal(result, ones + data), "Code is not working."
-print("Code is working.", end=os.linesep)
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
+from abc import abstractmethod
+from collections.abc import Hashable
+from functools import cache
 from random import Random
+from typing import Optional
+from yo1k.tic_tac_toe import position
 from yo1k.tic_tac_toe.game import (
     Action,
+    Board,
     PlayerID,
     State,
     Phase,
@@ -9,10 +15,12 @@ from yo1k.tic_tac_toe.game import (
     DefaultActionQueue)
 
 
-class RandomAI(AI):
-    def __init__(self, player_id: PlayerID, seed: int, action_queue: DefaultActionQueue):
+class OccupyingAI(AI):
+    """An `AI` which gets ready whenever it is required to, and occupies the cell returned by
+    `choose` whenever it is its turn."""
+
+    def __init__(self, player_id: PlayerID, action_queue: DefaultActionQueue):
         self.__player_id: PlayerID = player_id
-        self.__rng: Random = Random(seed)
         self.__action_queue: DefaultActionQueue = action_queue
 
     def act(self, state: State) -> None:
@@ -24,6 +32,23 @@ class RandomAI(AI):
         else:
             assert False
 
+    @abstractmethod
+    def choose(self, state: State) -> Cell:
+        """Returns an empty cell to occupy, is called only when it is the turn of `player_id`."""
+
+    def settings(self) -> Hashable:
+        """Returns the settings other than `player_id` and seeds which `choose` depends on,
+        so that `position_cache.CachedAI` does not share choices of differently set `AI`s."""
+        return ()
+
+    @property
+    def player_id(self) -> PlayerID:
+        return self.__player_id
+
+    @property
+    def action_queue(self) -> DefaultActionQueue:
+        return self.__action_queue
+
     def __act_beginning_outround(self, state: State) -> None:
         if self.__player_id in state.required_ready:
             self.__action_queue.add(Action.new_ready())
@@ -31,18 +56,160 @@ class RandomAI(AI):
     def __act_inround(self, state: State) -> None:
         if self.__player_id != state.turn():
             return
-        empty_cells_cnt = state.board.size() ** 2 - state.step
-        shift = self.__rng.randrange(empty_cells_cnt)
-        for x in range(state.board.size()):
-            for y in range(state.board.size()):
-                cell = Cell(x, y)
-                if state.board.get(cell) is None:
-                    if shift == 0:
-                        self.__action_queue.add(Action.new_occupy(cell))
-                        return
-                    shift -= 1
+        self.__action_queue.add(Action.new_occupy(self.choose(state)))
+
+
+class RandomAI(OccupyingAI):
+    def __init__(self, player_id: PlayerID, seed: int, action_queue: DefaultActionQueue):
+        super().__init__(player_id, action_queue)
+        self.__rng: Random = Random(seed)
+
+    def choose(self, state: State) -> Cell:
+        board = state.board
+        return board.empty_cell(self.__rng.randrange(board.empty_count()))
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"player_id={self.player_id},"
+                f"action_queue={self.action_queue})")
+
+
+class Minimax:
+    """Searches for the best move using negamax with alpha-beta pruning.
+
+    Searched positions are stored in a transposition table keyed by `position.canonical_key`,
+    so positions that are rotations or reflections of each other share an entry.
+    The best move found for a position is remembered as well, so that deciding in a position
+    seen before is a single lookup.
+    A score is from the point of view of the player to move: a win scores the number of cells
+    that were empty before the winning move, so faster wins are preferred, and a draw scores `0`.
+    """
+
+    __EXACT: int = 0
+    __LOWER: int = 1
+    __UPPER: int = 2
+
+    def __init__(self) -> None:
+        self.__table: dict[int, tuple[int, int]] = {}
+        self.__best_moves: dict[int, int] = {}
+
+    def best_move(self, pos: position.Position, mark: int) -> int:
+        """Returns the index of the best cell for the player with the `mark` to occupy
+        in the non-terminal `pos`. Ties are broken in favor of the smallest index."""
+        key = position.key(pos) * 3 + mark
+        best_idx = self.__best_moves.get(key, -1)
+        if best_idx >= 0:
+            return best_idx
+        best_score = -Minimax.__infinity()
+        for (idx, v) in enumerate(pos):
+            if v == 0:
+                score = self.__move_score(
+                        pos, mark, idx, -Minimax.__infinity(), Minimax.__infinity())
+                if score > best_score:
+                    best_idx = idx
+                    best_score = score
+        assert best_idx >= 0
+        self.__best_moves[key] = best_idx
+        return best_idx
+
+    def score(self, pos: position.Position, mark: int) -> int:
+        """Returns the score of the non-terminal `pos` for the player with the `mark` to move."""
+        return self.__negamax(pos, mark, -Minimax.__infinity(), Minimax.__infinity())
+
+    def table_size(self) -> int:
+        """Returns the number of entries in the transposition table and the best move table."""
+        return len(self.__table) + len(self.__best_moves)
+
+    def __move_score(
+            self, pos: position.Position, mark: int, idx: int, alpha: int, beta: int) -> int:
+        """Returns the score of occupying the empty cell `idx` by the player with the `mark`."""
+        empty = pos.count(0)
+        pos[idx] = mark
+        if position.is_win(pos, idx):
+            score = empty
+        elif empty == 1:
+            score = 0
+        else:
+            score = -self.__negamax(pos, position.other(mark), -beta, -alpha)
+        pos[idx] = 0
+        return score
+
+    def __negamax(self, pos: position.Position, mark: int, alpha: int, beta: int) -> int:
+        # the same cells may be reached with either player to move because players alternate
+        # making the first move in different rounds
+        key = position.canonical_key(pos) * 3 + mark
+        entry = self.__table.get(key)
+        if entry is not None:
+            (score, bound) = entry
+            if bound == Minimax.__EXACT \
+                    or (bound == Minimax.__LOWER and score >= beta) \
+                    or (bound == Minimax.__UPPER and score <= alpha):
+                return score
+        original_alpha = alpha
+        best_score = -Minimax.__infinity()
+        for (idx, v) in enumerate(pos):
+            if v != 0:
+                continue
+            best_score = max(best_score, self.__move_score(pos, mark, idx, alpha, beta))
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                break
+        if best_score <= original_alpha:
+            bound = Minimax.__UPPER
+        elif best_score >= beta:
+            bound = Minimax.__LOWER
+        else:
+            bound = Minimax.__EXACT
+        self.__table[key] = (best_score, bound)
+        return best_score
+
+    @staticmethod
+    def __infinity() -> int:
+        return Board.const_size() ** 2 + 1
 
     def __repr__(self) -> str:
         return (f"{type(self).__qualname__}("
-                f"player_id={self.__player_id},"
-                f"action_queue={self.__action_queue})")
+                f"table_size={self.table_size()})")
+
+
+class MinimaxAI(OccupyingAI):
+    """Plays optimally using `Minimax`, which may be shared by multiple `MinimaxAI`s
+    so that they share the tables of searched positions."""
+
+    def __init__(self, player_id: PlayerID, action_queue: DefaultActionQueue,
+                 minimax: Optional[Minimax] = None):
+        super().__init__(player_id, action_queue)
+        self.__minimax: Minimax = Minimax() if minimax is None else minimax
+
+    def choose(self, state: State) -> Cell:
+        """Chooses the best cell of the `position.canonical` image of the board and maps it back,
+        so that the cells chosen for symmetric boards are images of each other."""
+        mark = position.value(state.players[self.player_id.idx].mark)
+        (image, k) = position.canonical(position.from_board(state.board))
+        return position.cell_at(position.SYMMETRIES[k].index(self.__minimax.best_move(image, mark)))
+
+    @property
+    def minimax(self) -> Minimax:
+        return self.__minimax
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"player_id={self.player_id},"
+                f"action_queue={self.action_queue},"
+                f"minimax={self.__minimax})")
+
+
+def new_random_ai(player_id: PlayerID, seed: int, action_queue: DefaultActionQueue) -> AI:
+    return RandomAI(player_id, seed, action_queue)
+
+
+@cache
+def _shared_minimax() -> Minimax:
+    """Returns `Minimax` shared by all `MinimaxAI`s created by `new_minimax_ai` in a process,
+    so that games after the first one are played with the tables of searched positions
+    already filled."""
+    return Minimax()
+
+
+def new_minimax_ai(player_id: PlayerID, _: int, action_queue: DefaultActionQueue) -> AI:
+    return MinimaxAI(player_id, action_queue, _shared_minimax())
@@ -0,0 +1,95 @@
+from __future__ import annotations
+import numpy as np
+import numpy.typing as npt
+from yo1k.tic_tac_toe.game import AbstractBoard, Mark, State
+
+
+def _lines(size: int) -> npt.NDArray[np.intp]:
+    """Returns flat cell indexes of all rows, columns and diagonals,
+    the shape is `(2 * size + 2, size)`."""
+    indexes = np.arange(size * size).reshape(size, size)
+    return np.concatenate((
+            indexes,
+            indexes.T,
+            np.diagonal(indexes)[np.newaxis],
+            np.diagonal(np.fliplr(indexes))[np.newaxis]))
+
+
+class BatchSimulator:
+    """Plays `games` independent games of random moves as NumPy arrays.
+
+    Boards are stored in `boards` of shape `(games, size, size)`, where an empty cell is `0`
+    and a cell occupied by the player with index `i` in `State.players` is `i + 1`.
+    The player with index `0` plays `Mark.X`, the one with index `1` plays `Mark.O`.
+    Moves are taken from `moves` of shape `(games, rounds, size ** 2)`, which holds a seeded
+    permutation of flat cell indexes (`x * size + y`) for each round of each game.
+    Turns follow the `State.turn` rule, so the same moves played via `Logic`
+    give the same `wins`, `outcomes` and `steps`.
+    """
+
+    __LINES: npt.NDArray[np.intp] = _lines(AbstractBoard.const_size())
+
+    def __init__(self, games: int, rounds: int = State.default_rounds(), seed: int = 0):
+        size = AbstractBoard.const_size()
+        player_count = State.const_player_count()
+        self.rounds: int = rounds
+        self.round: int = 0
+        cells = np.arange(size * size, dtype=np.int8)
+        self.moves: npt.NDArray[np.int8] = np.random.default_rng(seed).permuted(
+                np.broadcast_to(cells, (games, rounds, len(cells))), axis=2)
+        self.boards: npt.NDArray[np.int8] = np.zeros((games, size, size), dtype=np.int8)
+        self.wins: npt.NDArray[np.int64] = np.zeros((games, player_count), dtype=np.int64)
+        self.outcomes: npt.NDArray[np.int8] \
+            = np.full((games, rounds), BatchSimulator.const_draw(), dtype=np.int8)
+        self.steps: npt.NDArray[np.int8] = np.zeros((games, rounds), dtype=np.int8)
+
+    def advance(self) -> None:
+        """Plays the next round of all games."""
+        assert not self.is_game_over()
+        games = len(self.boards)
+        size = AbstractBoard.const_size()
+        cells = self.boards.reshape(games, size * size)
+        cells[:] = 0
+        active = np.ones(games, dtype=bool)
+        for step in range(size * size):
+            turn = (step + self.round) % State.const_player_count()
+            value = turn + 1
+            idx = np.flatnonzero(active)
+            cells[idx, self.moves[idx, self.round, step]] = value
+            self.steps[idx, self.round] = step
+            # a line can not be completed before the first player makes `size` moves
+            if step >= State.const_player_count() * (size - 1):
+                won = (cells[idx][:, BatchSimulator.__LINES] == value).all(axis=2).any(axis=1)
+                winners = idx[won]
+                self.wins[winners, turn] += 1
+                self.outcomes[winners, self.round] = turn
+                active[winners] = False
+                if not active.any():
+                    break
+        self.round += 1
+
+    def run(self) -> None:
+        """Plays all remaining rounds of all games."""
+        while not self.is_game_over():
+            self.advance()
+
+    def is_game_over(self) -> bool:
+        return self.round == self.rounds
+
+    @staticmethod
+    def const_draw() -> int:
+        """The value in `outcomes` for a round that ended in a draw,
+        otherwise the value is the index of the winner in `State.players`."""
+        return -1
+
+    @staticmethod
+    def mark(value: int) -> Mark:
+        """Returns the `Mark` of a non-empty cell value in `boards`."""
+        assert 1 <= value <= State.const_player_count(), f"{value}"
+        return Mark.X if value == 1 else Mark.O
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"games={len(self.boards)},"
+                f"rounds={self.rounds},"
+                f"round={self.round})")
@@ -0,0 +1,544 @@
+"""Benchmarks. Run `python -m yo1k.tic_tac_toe.bench --help` for the command-line usage.
+
+`core` benchmarks the game itself and `extended` the other parts of the package.
+The benchmarks of `core` depend only on `game` and `ai`, those of other areas of the package
+are in the modules `_AREAS`, which `extended` imports, so that running `core` does not import
+them, and an area which fails to import does not stop the benchmarks of the others.
+Results may be written to JSON and compared with an earlier run to detect regressions.
+"""
+from __future__ import annotations
+import argparse
+import copy
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import tracemalloc
+from collections.abc import Callable, Mapping, Sequence
+from functools import partial
+from pathlib import Path
+from random import Random
+from time import perf_counter, perf_counter_ns
+from typing import Optional, Union
+from yo1k.tic_tac_toe.game import (
+    AI,
+    AbstractBoard,
+    Action,
+    ActionQueue,
+    Board,
+    Cell,
+    ConcurrentActionQueue,
+    DefaultActionQueue,
+    Logic,
+    Mark,
+    Phase,
+    Player,
+    PlayerID,
+    State,
+    UndoStack,
+    World)
+from yo1k.tic_tac_toe.ai import OccupyingAI, RandomAI
+
+_AREAS: Sequence[str] = (
+        "yo1k.tic_tac_toe.bench_simulation",
+        "yo1k.tic_tac_toe.bench_search",
+        "yo1k.tic_tac_toe.bench_hosting")
+"""Modules with `extended()`, which runs the benchmarks of an area of the package."""
+
+
+def _move_sequences(count: int, seed: int, size: int = AbstractBoard.const_size()) \
+        -> Sequence[Sequence[Cell]]:
+    rng = Random(seed)
+    cells = [Cell(x, y) for x in range(size) for y in range(size)]
+    sequences = []
+    for _ in range(count):
+        rng.shuffle(cells)
+        sequences.append(tuple(cells))
+    return sequences
+
+
+def board_moves_per_sec(
+        new_board: Callable[[], AbstractBoard],
+        games: int = 20_000,
+        seed: int = 0) -> float:
+    """Plays `games` rounds of random moves through `Logic.advance` on boards created by
+    `new_board` and returns the number of moves per second."""
+    sequences = _move_sequences(games, seed, new_board().size())
+    player_x = Player(PlayerID(0), Mark.X)
+    player_o = Player(PlayerID(1), Mark.O)
+    action_queues = (DefaultActionQueue(player_x.id), DefaultActionQueue(player_o.id))
+    logic = Logic(action_queues)
+    moves = 0
+    start = perf_counter()
+    for sequence in sequences:
+        state = State(
+                rounds=1,
+                players=(player_x, player_o),
+                board=new_board(),
+                phase=Phase.INROUND,
+                required_ready=set())
+        for cell in sequence:
+            action_queues[state.turn().idx].add(Action.new_occupy(cell))
+            logic.advance(state)
+            moves += 1
+            if state.phase is not Phase.INROUND:
+                break
+    return moves / (perf_counter() - start)
+
+
+def is_win_latency(size: int, win_length: int, checks: int = 100_000, seed: int = 0) -> float:
+    """Returns the mean duration in seconds of `Board.is_win` for a random occupied cell
+    of a `Board` with `size` and `win_length` half-filled with random moves."""
+    board = Board(size=size, win_length=win_length)
+    cells = _move_sequences(1, seed, size)[0][:size * size // 2]
+    for (step, cell) in enumerate(cells):
+        board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+    rng = Random(seed)
+    sample = [rng.choice(cells) for _ in range(checks)]
+    start = perf_counter()
+    for cell in sample:
+        board.is_win(cell)
+    return (perf_counter() - start) / checks
+
+
+def random_ai_move_latency(
+        size: int, moves: int = 20_000, seed: int = 0,
+        new_ai: Callable[[PlayerID, int, DefaultActionQueue], OccupyingAI] = RandomAI) -> float:
+    """Returns the mean duration in seconds of `choose` of an `AI` created by `new_ai`,
+    by default `RandomAI`, on a half-filled `Board` with `size`."""
+    board = Board(size=size)
+    cells = _move_sequences(1, seed, size)[0][:size * size // 2]
+    for (step, cell) in enumerate(cells):
+        board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+    player_x = Player(PlayerID(0), Mark.X)
+    state = State(
+            rounds=1,
+            players=(player_x, Player(PlayerID(1), Mark.O)),
+            board=board,
+            phase=Phase.INROUND,
+            step=len(cells),
+            required_ready=set())
+    ai = new_ai(player_x.id, seed, DefaultActionQueue(player_x.id))
+    start = perf_counter()
+    for _ in range(moves):
+        ai.choose(state)
+    return (perf_counter() - start) / moves
+
+
+def _new_world(state: State, action_queues: Sequence[ActionQueue], ais: Sequence[AI]) -> World:
+    return World(state, Logic(action_queues), ais)
+
+
+def world_games_per_sec(
+        games: int = 1_000,
+        seed: int = 0,
+        run: bool = False,
+        rounds: int = State.default_rounds(),
+        new_ai: Callable[[PlayerID, int, DefaultActionQueue], AI] = RandomAI,
+        new_world: Callable[[State, Sequence[ActionQueue], Sequence[AI]], World] = _new_world) \
+        -> tuple[float, int]:
+    """Plays `games` games of `AI`s created by `new_ai`, by default `RandomAI`s, via `World`
+    and returns the number of games per second and the number of calls avoided by `World.run`.
+
+    Games are played either by `World.run`, or by calling `World.advance` until a game is over.
+    `World`s are created by `new_world`, which may instrument them for example.
+    """
+    avoided_calls = 0
+    start = perf_counter()
+    for game in range(games):
+        player_x = Player(PlayerID(0), Mark.X)
+        player_o = Player(PlayerID(1), Mark.O)
+        act_queue_px = DefaultActionQueue(player_x.id)
+        act_queue_po = DefaultActionQueue(player_o.id)
+        state = State(rounds=rounds, board=Board(), players=(player_x, player_o))
+        world = new_world(state, (act_queue_px, act_queue_po), (
+                new_ai(player_x.id, seed + 2 * game, act_queue_px),
+                new_ai(player_o.id, seed + 2 * game + 1, act_queue_po)))
+        if run:
+            avoided_calls += world.run().avoided_calls()
+        else:
+            while not Logic.is_game_over(state):
+                world.advance()
+    return games / (perf_counter() - start), avoided_calls
+
+
+def _count_nodes(state: State, depth: int, undo: Optional[UndoStack]) -> int:
+    """Counts the positions reachable from `state` in `depth` moves within a round,
+    by `Logic.make` and `Logic.unmake` if `undo` is specified, or by copying `state` otherwise."""
+    if depth == 0 or state.phase is not Phase.INROUND:
+        return 1
+    nodes = 1
+    player_id = state.turn()
+    for cell in state.board.empty_cells():
+        if undo is None:
+            child = copy.deepcopy(state)
+            Logic.make(child, player_id, Action.new_occupy(cell), UndoStack())
+            nodes += _count_nodes(child, depth - 1, undo)
+        else:
+            Logic.make(state, player_id, Action.new_occupy(cell), undo)
+            nodes += _count_nodes(state, depth - 1, undo)
+            Logic.unmake(state, undo)
+    return nodes
+
+
+def search_nodes_per_sec(size: int = 3, depth: int = 4, make_unmake: bool = True) -> float:
+    """Returns the number of positions per second visited by a full-width search from an empty
+    `Board` with `size` using either make/unmake or copying the `State` per position."""
+    state = State(
+            rounds=1,
+            players=(Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O)),
+            board=Board(size=size),
+            phase=Phase.INROUND,
+            required_ready=set())
+    start = perf_counter()
+    nodes = _count_nodes(state, depth, UndoStack() if make_unmake else None)
+    return nodes / (perf_counter() - start)
+
+
+def trusted_games_per_sec(games: int = 3_000) -> tuple[float, float]:
+    """Returns `world_games_per_sec` of `World.run` measured in a new process with `assert`s
+    and in a new process in the trusted mode, `python -O`, see `ValidatingActionQueue`."""
+    code = ("from yo1k.tic_tac_toe.bench import world_games_per_sec; "
+            f"print(world_games_per_sec({games}, run=True)[0])")
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).parents[2]))
+    (checked, trusted) = (float(subprocess.run(
+            [sys.executable, *options, "-c", code],
+            check=True, capture_output=True, text=True, env=env).stdout)
+            for options in ((), ("-O",)))
+    return checked, trusted
+
+
+def queue_add_pop_latency(
+        new_queue: Callable[[PlayerID], Union[DefaultActionQueue, ConcurrentActionQueue]],
+        actions: int = 100_000) -> float:
+    """Returns the mean duration of an `add` followed by a `pop` in one thread in seconds."""
+    action_queue = new_queue(PlayerID(0))
+    action = Action.new_ready()
+    start = perf_counter()
+    for _ in range(actions):
+        action_queue.add(action)
+        action_queue.pop()
+    return (perf_counter() - start) / actions
+
+
+def concurrent_queue_actions_per_sec(
+        producers: int = 4, actions: int = 50_000, capacity: int = 64) -> float:
+    """Returns actions per second passed from `producers` threads, each adding `actions`,
+    to a consumer draining a `ConcurrentActionQueue` with `wait` and `pop_all`."""
+    action_queue = ConcurrentActionQueue(PlayerID(0), capacity)
+    action = Action.new_ready()
+
+    def produce() -> None:
+        for _ in range(actions):
+            action_queue.add(action)
+    threads = [threading.Thread(target=produce) for _ in range(producers)]
+    start = perf_counter()
+    for thread in threads:
+        thread.start()
+    popped = 0
+    while popped < producers * actions:
+        action_queue.wait()
+        popped += len(action_queue.pop_all())
+    duration = perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return popped / duration
+
+
+def memory_per_game(games: int = 10_000, seed: int = 0) -> float:
+    """Returns the mean number of bytes allocated for a live game of `RandomAI`s,
+    including its `State`, `Logic`, `World`, `AI`s and queued actions, after a few moves."""
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    worlds = []
+    for game in range(games):
+        player_x = Player(PlayerID(0), Mark.X)
+        player_o = Player(PlayerID(1), Mark.O)
+        act_queue_px = DefaultActionQueue(player_x.id)
+        act_queue_po = DefaultActionQueue(player_o.id)
+        state = State(rounds=State.default_rounds(), board=Board(), players=(player_x, player_o))
+        world = World(
+                state,
+                Logic((act_queue_px, act_queue_po)),
+                (
+                        RandomAI(player_x.id, seed + 2 * game, act_queue_px),
+                        RandomAI(player_o.id, seed + 2 * game + 1, act_queue_po)
+                ))
+        for _ in range(5):
+            world.advance()
+        worlds.append(world)
+    allocated = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return allocated / games
+
+
+Measurement = tuple[float, str]
+"""A value and its unit. Values in units ending with `/s` are better when higher,
+values in units starting with `ns` or `bytes` are better when lower,
+other values are informational."""
+
+
+def _ns_per_op(run: Callable[[], int], repeat: int) -> float:
+    """Calls `run`, which returns the number of operations it made, `repeat` times
+    and returns the least mean duration of an operation in nanoseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter_ns()
+        ops = run()
+        best = min(best, (perf_counter_ns() - start) / ops)
+    return best
+
+
+def _new_state(board: AbstractBoard, rounds: int = 1, phase: Phase = Phase.INROUND) -> State:
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    return State(
+            rounds=rounds,
+            players=players,
+            board=board,
+            phase=phase,
+            required_ready=set() if phase is Phase.INROUND else {player.id for player in players})
+
+
+def board_ns_per_op(calls: int = 10_000, repeat: int = 5) -> Mapping[str, float]:
+    """Returns nanoseconds per `Board.set`, `Board.get` and `Board.clear`, and `Logic.is_win`
+    for the last occupied cell, on boards filled in random orders."""
+    sequences = _move_sequences(64, 0)
+    board = Board()
+
+    def fill_clear() -> int:
+        for idx in range(calls):
+            for (step, cell) in enumerate(sequences[idx % len(sequences)]):
+                board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+            board.clear()
+        return calls * board.size() ** 2
+
+    def clear() -> int:
+        for _ in range(calls):
+            board.clear()
+        return calls
+
+    def get() -> int:
+        for idx in range(calls):
+            for cell in sequences[idx % len(sequences)]:
+                board.get(cell)
+        return calls * board.size() ** 2
+
+    def is_win() -> int:
+        checks = 0
+        for idx in range(calls // 10):
+            for (step, cell) in enumerate(sequences[idx % len(sequences)]):
+                board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+                if Logic.is_win(board, cell):
+                    break
+                checks += 1
+            board.clear()
+        return checks
+
+    clear_ns = _ns_per_op(clear, repeat)
+    is_win_ns = _ns_per_op(is_win, repeat)
+    set_ns = _ns_per_op(fill_clear, repeat) - clear_ns / board.size() ** 2
+    return {
+            "Board.set": set_ns,
+            "Board.get": _ns_per_op(get, repeat),
+            "Board.clear": clear_ns,
+            # filling the board is timed as well
+            "Logic.is_win": is_win_ns - set_ns}
+
+
+def advance_ns_per_op(calls: int = 10_000, repeat: int = 5) -> Mapping[str, float]:
+    """Returns nanoseconds per `Logic.advance` which processes the actions queued for it
+    in each `Phase`: both players getting ready in `BEGINNING` and in `OUTROUND`,
+    which starts the next round, and occupying a cell in `INROUND`."""
+    sequences = _move_sequences(64, 0)
+    action_queues = (DefaultActionQueue(PlayerID(0)), DefaultActionQueue(PlayerID(1)))
+    logic = Logic(action_queues)
+    ready = Action.new_ready()
+
+    def beginning() -> int:
+        state = _new_state(Board(), phase=Phase.BEGINNING)
+        for _ in range(calls):
+            state.phase = Phase.BEGINNING
+            state.required_ready.update((PlayerID(0), PlayerID(1)))
+            action_queues[0].add(ready)
+            action_queues[1].add(ready)
+            logic.advance(state)
+        return calls
+
+    def outround() -> int:
+        state = _new_state(Board(), rounds=calls + 1, phase=Phase.OUTROUND)
+        for _ in range(calls):
+            state.board.set(Cell(1, 1), Mark.X)
+            state.phase = Phase.OUTROUND
+            state.required_ready.update((PlayerID(0), PlayerID(1)))
+            action_queues[0].add(ready)
+            action_queues[1].add(ready)
+            logic.advance(state)
+        return calls
+
+    def inround() -> int:
+        state = _new_state(Board(), rounds=calls + 1)
+        moves = 0
+        for idx in range(calls // 5):
+            state.board.clear()
+            state.phase = Phase.INROUND
+            state.round = idx
+            state.step = 0
+            for cell in sequences[idx % len(sequences)]:
+                action_queues[state.turn().idx].add(Action.new_occupy(cell))
+                logic.advance(state)
+                moves += 1
+                if state.phase is not Phase.INROUND:
+                    break
+            state.required_ready.clear()
+        return moves
+
+    return {
+            "Logic.advance BEGINNING": _ns_per_op(beginning, repeat),
+            "Logic.advance INROUND": _ns_per_op(inround, repeat),
+            "Logic.advance OUTROUND": _ns_per_op(outround, repeat)}
+
+
+def random_ai_act_ns_per_op(calls: int = 10_000, repeat: int = 5) -> float:
+    """Returns nanoseconds per `RandomAI.act` when it is the turn of the `AI`
+    on a half-filled board."""
+    state = _new_state(Board())
+    for (step, cell) in enumerate(_move_sequences(1, 0)[0][:4]):
+        state.board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+    state.step = 4
+    action_queue = DefaultActionQueue(PlayerID(0))
+    ai = RandomAI(PlayerID(0), 0, action_queue)
+
+    def act() -> int:
+        for _ in range(calls):
+            ai.act(state)
+            action_queue.actions.clear()
+        return calls
+
+    return _ns_per_op(act, repeat)
+
+
+def core(scale: float = 1) -> Mapping[str, Measurement]:
+    """Runs the benchmarks of `Board`, `Logic`, `RandomAI` and `World`.
+    `scale` multiplies the number of iterations."""
+    calls = max(10, int(10_000 * scale))
+    results: dict[str, Measurement] = {}
+    for (name, value) in board_ns_per_op(calls).items():
+        results[name] = (value, "ns/op")
+    for (name, value) in advance_ns_per_op(calls).items():
+        results[name] = (value, "ns/op")
+    results["RandomAI.act"] = (random_ai_act_ns_per_op(calls), "ns/op")
+    for rounds in (1, 5, 25):
+        games = max(1, int(2_000 * scale / rounds))
+        results[f"World.run {rounds} rounds"] \
+            = (world_games_per_sec(games, run=True, rounds=rounds)[0], "games/s")
+        results[f"World.advance {rounds} rounds"] \
+            = (world_games_per_sec(games, rounds=rounds)[0], "games/s")
+    return results
+
+
+def extended() -> Mapping[str, Measurement]:
+    """Runs the benchmarks of the other parts of the package. Reports the areas in `_AREAS`
+    which fail to import to `sys.stderr` and skips them."""
+    results: dict[str, Measurement] = {}
+    results["Board moves"] = (board_moves_per_sec(Board), "moves/s")
+    for (size, win_length, games) in ((3, 3, 20_000), (15, 5, 1_000), (19, 5, 500)):
+        board = f"{size}x{size} {win_length} in a row"
+        results[f"Board {board} moves"] = (board_moves_per_sec(
+                partial(Board, size=size, win_length=win_length), games), "moves/s")
+        results[f"Board.is_win {board}"] = (is_win_latency(size, win_length) * 1e9, "ns/op")
+        results[f"RandomAI.choose {size}x{size}"] \
+            = (random_ai_move_latency(size) * 1e9, "ns/op")
+    (checked, trusted) = trusted_games_per_sec()
+    results["World.run checked process"] = (checked, "games/s")
+    results["World.run trusted process"] = (trusted, "games/s")
+    for (name, new_queue) in (("DefaultActionQueue", DefaultActionQueue),
+                              ("ConcurrentActionQueue", ConcurrentActionQueue)):
+        results[f"{name} add and pop"] = (queue_add_pop_latency(new_queue) * 1e9, "ns/op")
+    results["ConcurrentActionQueue 4 producers"] \
+        = (concurrent_queue_actions_per_sec(), "actions/s")
+    results["World.run idle polls avoided"] = (world_games_per_sec(run=True)[1], "calls")
+    results["Memory"] = (memory_per_game(), "bytes/game")
+    results["Search make/unmake"] = (search_nodes_per_sec(), "positions/s")
+    results["Search copying"] = (search_nodes_per_sec(make_unmake=False), "positions/s")
+    for area in _AREAS:
+        try:
+            module = importlib.import_module(area)
+        except ImportError as e:
+            print(f"skipped {area}: {e!r}", end=os.linesep, file=sys.stderr)
+            continue
+        results.update(module.extended())
+    return results
+
+
+def regressions(
+        results: Mapping[str, Measurement],
+        baseline: Mapping[str, Measurement],
+        tolerance: float) -> Mapping[str, float]:
+    """Returns the relative changes of the `results` that are worse than in `baseline`
+    by more than `tolerance`, where `0.1` means 10%. Results with different units are skipped."""
+    worse = {}
+    for (name, (value, unit)) in results.items():
+        if name not in baseline or baseline[name][1] != unit or baseline[name][0] == 0:
+            continue
+        change = value / baseline[name][0] - 1
+        if (unit.endswith("/s") and change < -tolerance) \
+                or (unit.startswith(("ns", "bytes")) and change > tolerance):
+            worse[name] = change
+    return worse
+
+
+def write_json(results: Mapping[str, Measurement], path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"version": 1, "results": {
+                name: {"value": value, "unit": unit}
+                for (name, (value, unit)) in results.items()}}, file, indent=2)
+        file.write("\n")
+
+
+def read_json(path: Path) -> Mapping[str, Measurement]:
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    assert data["version"] == 1, f"{data['version']}"
+    return {name: (result["value"], result["unit"]) for (name, result) in data["results"].items()}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+            prog="python -m yo1k.tic_tac_toe.bench",
+            description="Runs benchmarks, optionally compares them with a baseline "
+                        "and exits with the status 1 if any of them regressed.")
+    parser.add_argument(
+            "--extended", action="store_true",
+            help="also run the benchmarks of the other parts of the package")
+    parser.add_argument(
+            "--scale", type=float, default=1, help="multiplies the number of iterations")
+    parser.add_argument("--json", type=Path, default=None, help="write the results to JSON")
+    parser.add_argument(
+            "--baseline", type=Path, default=None,
+            help="JSON written by --json of an earlier run to compare with")
+    parser.add_argument(
+            "--tolerance", type=float, default=0.1,
+            help="relative change considered a regression, defaults to 0.1")
+    args = parser.parse_args(argv)
+    results = dict(core(args.scale))
+    if args.extended:
+        results.update(extended())
+    baseline = {} if args.baseline is None else read_json(args.baseline)
+    worse = regressions(results, baseline, args.tolerance)
+    for (name, (value, unit)) in results.items():
+        line = f"{name:<40} {value:>16,.1f} {unit}"
+        if name in baseline and baseline[name][1] == unit and baseline[name][0] != 0:
+            line += f" ({value / baseline[name][0] - 1:+.1%})"
+        if name in worse:
+            line += " REGRESSION"
+        print(line, end=os.linesep)
+    if args.json is not None:
+        write_json(results, args.json)
+    if len(worse) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
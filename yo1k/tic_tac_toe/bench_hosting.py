@@ -0,0 +1,178 @@
+"""Benchmarks of hosting matches: scheduling, matchmaking, statistics, encoding
+and replay logs, see `bench`."""
+from __future__ import annotations
+import pickle
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from random import Random
+from time import perf_counter
+from yo1k.tic_tac_toe import codec, replay
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.bench import Measurement
+from yo1k.tic_tac_toe.events import FirstMoverStats, OpeningStats, aggregate, game_events
+from yo1k.tic_tac_toe.game import (
+    AI, AbstractBoard, Board, Cell, DefaultActionQueue, Logic, Mark, Phase, Player, PlayerID,
+    State, World)
+from yo1k.tic_tac_toe.rating import Ladder, Rating
+from yo1k.tic_tac_toe.registry import AIS
+from yo1k.tic_tac_toe.replay import LogWriter, RecordingActionQueue
+from yo1k.tic_tac_toe.scheduler import Scheduler
+from yo1k.tic_tac_toe.tournament import game_seeds, play_game
+
+
+def scheduler_ticks_per_sec(
+        matches: int = 10_000, active: int = 100, ticks: int = 100, seed: int = 0,
+        polling: bool = False) -> float:
+    """Hosts `matches` games of a human player and a `RandomAI`, where in each tick `active`
+    random human players act and then all matches are advanced, and returns ticks per second.
+
+    Matches are advanced either by a `Scheduler`, or by calling `World.run` for every match.
+    """
+    rng = Random(seed)
+    scheduler = Scheduler()
+    humans: list[tuple[int, World, RandomAI]] = []
+    for match in range(matches):
+        players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+        state = State(rounds=1_000, board=Board(), players=players)
+        action_queues = (DefaultActionQueue(players[0].id), DefaultActionQueue(players[1].id))
+        world = World(state, Logic(action_queues), (
+                AI(), RandomAI(players[1].id, seed + 2 * match + 1, action_queues[1])))
+        humans.append((scheduler.add(world), world, RandomAI(
+                players[0].id, seed + 2 * match, action_queues[0])))
+    scheduler.run()
+    start = perf_counter()
+    for _ in range(ticks):
+        for (match, world, human) in rng.sample(humans, active):
+            human.act(world.state)
+            scheduler.notify(match)
+        if polling:
+            for (_, world, _) in humans:
+                world.run()
+        else:
+            scheduler.run()
+    return ticks / (perf_counter() - start)
+
+
+def matchmaking_games_per_sec(
+        players: int = 10_000, games: int = 5_000, rounds: int = 1, seed: int = 0) -> float:
+    """Runs a `Ladder` of `players` where random idle players join the queue, and each pair
+    plays a game of `RandomAI`s whose outcome is recorded, and returns games per second."""
+    rng = Random(seed)
+    ladder = Ladder()
+    idle = [ladder.add() for _ in range(players)]
+    random_ais = (AIS["random"], AIS["random"])
+    start = perf_counter()
+    for game in range(games):
+        opponent = None
+        while opponent is None:
+            idx = rng.randrange(len(idle))
+            (player, idle[idx]) = (idle[idx], idle[-1])
+            idle.pop()
+            opponent = ladder.join(player)
+        ladder.record((opponent, player), play_game(random_ais, rounds, game_seeds(seed, game)))
+        idle.extend((opponent, player))
+    return games / (perf_counter() - start)
+
+
+def ladder_join_latency(players: int = 1_000_000, joins: int = 100_000, seed: int = 0) -> float:
+    """Returns the mean duration in seconds of `Ladder.join` pairing a player
+    from a queue of `players` players with random ratings, which shrinks by `joins`."""
+    rng = Random(seed)
+    ladder = Ladder()
+    for player in range(players + joins):
+        ladder.add(Rating(rng.gauss(1500, 300)))
+        if player < players:
+            ladder.queue(player)
+    start = perf_counter()
+    for player in range(players, players + joins):
+        ladder.join(player)
+    return (perf_counter() - start) / joins
+
+
+def event_games_per_sec(games: int = 5_000, seed: int = 0) -> tuple[float, float]:
+    """Returns games and events per second streamed from games of `RandomAI`s
+    into `FirstMoverStats` and `OpeningStats`."""
+    start = perf_counter()
+    events = aggregate(
+            game_events((AIS["random"], AIS["random"]), games, seed=seed),
+            (FirstMoverStats(), OpeningStats()))
+    duration = perf_counter() - start
+    return games / duration, events / duration
+
+
+def codec_vs_pickle(states: int = 10_000, seed: int = 0) -> Mapping[str, tuple[int, float]]:
+    """Returns the encoded size in bytes and the encode + decode round trip time in seconds
+    of a `State` in the middle of a game, by `codec` and by `pickle`."""
+    rng = Random(seed)
+    size = AbstractBoard.const_size()
+    state = State(
+            rounds=State.default_rounds(),
+            players=(Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O)),
+            board=Board(),
+            phase=Phase.INROUND,
+            round_=2,
+            step=4,
+            required_ready=set())
+    for (idx, cell) in enumerate(rng.sample([Cell(x, y) for x in range(size)
+                                             for y in range(size)], state.step)):
+        state.board.set(cell, Mark.X if idx % 2 == 0 else Mark.O)
+    result = {}
+    for (name, encode, decode) in (
+            ("codec", codec.encode, codec.decode),
+            ("pickle", pickle.dumps, pickle.loads)):
+        start = perf_counter()
+        for _ in range(states):
+            decode(encode(state))
+        result[name] = (len(encode(state)), (perf_counter() - start) / states)
+    return result
+
+
+def replay_actions_per_sec(games: int = 1_000, seed: int = 0) -> tuple[float, float]:
+    """Records `games` games of `RandomAI`s to a replay log, replays all of them,
+    and returns the number of replayed actions per second and the mean size of the log
+    per game in bytes."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "log.bin"
+        log = LogWriter(path)
+        for game in range(games):
+            player_x = Player(PlayerID(0), Mark.X)
+            player_o = Player(PlayerID(1), Mark.O)
+            state = State(
+                    rounds=State.default_rounds(), board=Board(), players=(player_x, player_o))
+            match = log.start(state)
+            action_queues = (DefaultActionQueue(player_x.id), DefaultActionQueue(player_o.id))
+            World(
+                    state,
+                    Logic(tuple(RecordingActionQueue(action_queue, log, match)
+                                for action_queue in action_queues)),
+                    (
+                            RandomAI(player_x.id, seed + 2 * game, action_queues[0]),
+                            RandomAI(player_o.id, seed + 2 * game + 1, action_queues[1])
+                    )).run()
+            log.end(match)
+        log.close()
+        data = path.read_bytes()
+    start = perf_counter()
+    actions = sum(len(match_replay.actions()) for match_replay in replay.load(data).values())
+    return actions / (perf_counter() - start), len(data) / games
+
+
+def extended() -> Mapping[str, Measurement]:
+    """Runs the benchmarks of `Scheduler`, `Ladder`, `events`, `codec` and `replay`."""
+    results: dict[str, Measurement] = {}
+    for polling in (False, True):
+        results[f"10000 matches of humans {'polled' if polling else 'scheduled'}"] \
+            = (scheduler_ticks_per_sec(polling=polling), "ticks/s")
+    results["Ladder matchmaking RandomAI"] = (matchmaking_games_per_sec(), "games/s")
+    results["Ladder.join 1000000 players"] = (ladder_join_latency() * 1e9, "ns/op")
+    (games_per_sec, events_per_sec) = event_games_per_sec()
+    results["Event stream RandomAI"] = (games_per_sec, "games/s")
+    results["Event stream RandomAI events"] = (events_per_sec, "events/s")
+    (actions_per_sec, log_bytes_per_game) = replay_actions_per_sec()
+    results["Replay"] = (actions_per_sec, "actions/s")
+    results["Replay log"] = (log_bytes_per_game, "bytes/game")
+    for (name, (size, latency)) in codec_vs_pickle().items():
+        results[f"State via {name}"] = (latency * 1e9, "ns/op")
+        results[f"State via {name} size"] = (size, "bytes")
+    return results
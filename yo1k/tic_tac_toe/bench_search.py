@@ -0,0 +1,134 @@
+"""Benchmarks of the searching `AI`s and their tables, see `bench`."""
+from __future__ import annotations
+import os
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from random import Random
+from time import perf_counter
+from typing import Optional
+from yo1k.tic_tac_toe import position
+from yo1k.tic_tac_toe.ai import Minimax, MinimaxAI
+from yo1k.tic_tac_toe.bench import Measurement
+from yo1k.tic_tac_toe.book import Book
+from yo1k.tic_tac_toe.fast_random import FastRandomAI, new_rng
+from yo1k.tic_tac_toe.game import (
+    AI, AbstractBoard, Board, DefaultActionQueue, Mark, Phase, Player, PlayerID, State)
+from yo1k.tic_tac_toe.mcts import MctsAI
+from yo1k.tic_tac_toe.position_cache import CachedAI, PositionCache
+from yo1k.tic_tac_toe.tournament import play_game
+
+
+def _random_positions(count: int, seed: int) -> Sequence[tuple[position.Position, int]]:
+    """Returns non-terminal positions with the mark to move reached by random moves."""
+    rng = Random(seed)
+    positions = []
+    for _ in range(count):
+        pos = [0] * AbstractBoard.const_size() ** 2
+        mark = rng.choice((position.value(Mark.X), position.value(Mark.O)))
+        for idx in rng.sample(range(len(pos)), rng.randrange(len(pos) - 1)):
+            pos[idx] = mark
+            if position.is_win(pos, idx):
+                pos[idx] = 0
+                break
+            mark = position.other(mark)
+        positions.append((pos, mark))
+    return positions
+
+
+def minimax_move_latency(moves: int = 1_000, seed: int = 0) -> tuple[float, float, int]:
+    """Returns the latency in seconds of `Minimax.best_move` in a cold position from an empty
+    table, the mean latency in random reachable positions once the table is warm,
+    and the size of the table."""
+    ai = Minimax()
+    start = perf_counter()
+    ai.best_move([0] * AbstractBoard.const_size() ** 2, position.value(Mark.X))
+    ai.best_move([0] * AbstractBoard.const_size() ** 2, position.value(Mark.O))
+    cold = perf_counter() - start
+    positions = _random_positions(moves, seed)
+    start = perf_counter()
+    for (pos, mark) in positions:
+        ai.best_move(pos, mark)
+    return cold, (perf_counter() - start) / moves, ai.table_size()
+
+
+def book_move_latency(moves: int = 10_000, seed: int = 0) -> tuple[float, float]:
+    """Returns the latency in seconds of opening a `Book`
+    and the mean latency of `Book.lookup` in random reachable positions."""
+    start = perf_counter()
+    book = Book()
+    startup = perf_counter() - start
+    positions = _random_positions(moves, seed)
+    start = perf_counter()
+    for (pos, mark) in positions:
+        book.lookup(pos, mark)
+    latency = (perf_counter() - start) / moves
+    book.close()
+    return startup, latency
+
+
+def position_cache_hit_rate(games: int = 100_000, capacity: int = 100_000,
+                            symmetric: bool = True, seed: int = 0) -> tuple[float, float]:
+    """Returns the hit rate of `PositionCache` shared by `CachedAI`s wrapping `MinimaxAI`,
+    which play one-round games against `FastRandomAI` as X in even games and as O in odd games,
+    and games per second."""
+    cache_: PositionCache[int] = PositionCache(capacity, symmetric)
+    minimax = Minimax()
+    rng = new_rng(seed)
+
+    def new_cached_ai(player_id: PlayerID, _: int, action_queue: DefaultActionQueue) -> AI:
+        return CachedAI(MinimaxAI(player_id, action_queue, minimax), cache_)
+
+    def new_random_ai(player_id: PlayerID, _: int, action_queue: DefaultActionQueue) -> AI:
+        return FastRandomAI(player_id, rng, action_queue, batch=8)
+    start = perf_counter()
+    for game in range(games):
+        play_game((new_cached_ai, new_random_ai) if game % 2 == 0
+                  else (new_random_ai, new_cached_ai), 1, (0, 0))
+    duration = perf_counter() - start
+    return cache_.hit_rate(), games / duration
+
+
+def mcts_playouts_per_sec(
+        size: int,
+        win_length: int,
+        playouts: int = 2_000,
+        executor: Optional[Executor] = None,
+        workers: int = 1) -> float:
+    """Returns playouts per second of `MctsAI` choosing the first move on an empty board."""
+    player_x = Player(PlayerID(0), Mark.X)
+    state = State(
+            rounds=1,
+            players=(player_x, Player(PlayerID(1), Mark.O)),
+            board=Board(size=size, win_length=win_length),
+            phase=Phase.INROUND,
+            required_ready=set())
+    ai = MctsAI(player_x.id, 0, DefaultActionQueue(player_x.id), playouts, None, executor, workers)
+    ai.choose(state)
+    return ai.playouts_per_sec()
+
+
+def extended() -> Mapping[str, Measurement]:
+    """Runs the benchmarks of `Minimax`, `Book`, `PositionCache` and `MctsAI`."""
+    results: dict[str, Measurement] = {}
+    for (name, capacity, symmetric) in (("canonical", 100_000, True),
+                                        ("canonical 64 entries", 64, True),
+                                        ("raw", 100_000, False)):
+        (hit_rate, games_per_sec) = position_cache_hit_rate(
+                capacity=capacity, symmetric=symmetric)
+        results[f"PositionCache {name} hit rate"] = (hit_rate * 100, "%")
+        results[f"PositionCache {name} CachedAI"] = (games_per_sec, "games/s")
+    (cold, warm, table_size) = minimax_move_latency()
+    results["Minimax.best_move cold"] = (cold * 1e9, "ns/op")
+    results["Minimax.best_move warm"] = (warm * 1e9, "ns/op")
+    results["Minimax table"] = (table_size, "entries")
+    (startup, latency) = book_move_latency()
+    results["Book startup"] = (startup * 1e9, "ns")
+    results["Book.lookup"] = (latency * 1e9, "ns/op")
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (size, win_length) in ((3, 3), (15, 5), (19, 5)):
+            board = f"{size}x{size} {win_length} in a row"
+            results[f"MctsAI {board}"] = (mcts_playouts_per_sec(size, win_length), "playouts/s")
+            results[f"MctsAI {board} {workers} processes"] = (mcts_playouts_per_sec(
+                    size, win_length, 2_000 * workers, executor, workers), "playouts/s")
+    return results
@@ -0,0 +1,53 @@
+"""Benchmarks of the faster or instrumented ways to simulate games, see `bench`."""
+from __future__ import annotations
+from collections.abc import Mapping, Sequence
+from time import perf_counter
+from yo1k.tic_tac_toe.bench import (
+    Measurement, board_moves_per_sec, random_ai_move_latency, world_games_per_sec)
+from yo1k.tic_tac_toe.batch import BatchSimulator
+from yo1k.tic_tac_toe.bitboard import BitBoard
+from yo1k.tic_tac_toe.fast_random import FastRandomAI, new_rng
+from yo1k.tic_tac_toe.game import AI, ActionQueue, DefaultActionQueue, PlayerID, State, World
+from yo1k.tic_tac_toe.instrument import Metrics, instrumented_world
+
+
+def batch_games_per_sec(games: int = 100_000, seed: int = 0) -> float:
+    """Plays `games` games of random moves via `BatchSimulator`
+    and returns the number of games per second."""
+    start = perf_counter()
+    BatchSimulator(games, State.default_rounds(), seed).run()
+    return games / (perf_counter() - start)
+
+
+def fast_world_games_per_sec(games: int = 1_000, seed: int = 0) -> float:
+    """Returns `world_games_per_sec` of `World.run` where `FastRandomAI`s sharing
+    a `Generator` per player across games play instead of `RandomAI`s."""
+    rngs = (new_rng(seed), new_rng(seed + 1))
+
+    def new_ai(player_id: PlayerID, _: int, action_queue: DefaultActionQueue) -> AI:
+        return FastRandomAI(player_id, rngs[player_id.idx], action_queue)
+    return world_games_per_sec(games, seed, run=True, new_ai=new_ai)[0]
+
+
+def instrumented_world_games_per_sec(games: int = 1_000, seed: int = 0) -> float:
+    """Returns `world_games_per_sec` of `World.run` where games are instrumented."""
+    metrics = Metrics()
+
+    def new_world(state: State, action_queues: Sequence[ActionQueue], ais: Sequence[AI]) \
+            -> World:
+        return instrumented_world(state, action_queues, ais, metrics)
+    return world_games_per_sec(games, seed, run=True, new_world=new_world)[0]
+
+
+def extended() -> Mapping[str, Measurement]:
+    """Runs the benchmarks of `BitBoard`, `FastRandomAI`, `BatchSimulator` and `instrument`."""
+    results: dict[str, Measurement] = {}
+    results["BitBoard moves"] = (board_moves_per_sec(BitBoard), "moves/s")
+    for size in (3, 15, 19):
+        results[f"FastRandomAI.choose {size}x{size}"] \
+            = (random_ai_move_latency(size, new_ai=lambda player_id, seed, action_queue:
+                   FastRandomAI(player_id, new_rng(seed), action_queue)) * 1e9, "ns/op")
+    results["World.run FastRandomAI"] = (fast_world_games_per_sec(), "games/s")
+    results["World.run instrumented"] = (instrumented_world_games_per_sec(), "games/s")
+    results["BatchSimulator"] = (batch_games_per_sec(), "games/s")
+    return results
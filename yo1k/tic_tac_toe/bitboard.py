@@ -0,0 +1,109 @@
+from __future__ import annotations
+from collections.abc import Sequence
+from typing import Optional
+from yo1k.tic_tac_toe.game import AbstractBoard, Cell, EmptyCells, Mark
+from yo1k.tic_tac_toe.util import eq
+
+
+def _line_masks(size: int) -> Sequence[Sequence[int]]:
+    """Returns masks of all lines going through a cell, indexed by `BitBoard.bit_idx`."""
+    rows = [sum(1 << (x * size + y) for y in range(size)) for x in range(size)]
+    columns = [sum(1 << (x * size + y) for x in range(size)) for y in range(size)]
+    diagonal = sum(1 << (i * size + i) for i in range(size))
+    anti_diagonal = sum(1 << (i * size + size - 1 - i) for i in range(size))
+    masks_by_cell = []
+    for x in range(size):
+        for y in range(size):
+            masks = [rows[x], columns[y]]
+            if x == y:
+                masks.append(diagonal)
+            if x == size - 1 - y:
+                masks.append(anti_diagonal)
+            masks_by_cell.append(tuple(masks))
+    return tuple(masks_by_cell)
+
+
+@eq
+class BitBoard(AbstractBoard):
+    """An `AbstractBoard` which packs marks of each player into an integer bitmask.
+
+    A cell `(x, y)` corresponds to the bit `BitBoard.bit_idx(cell)`.
+    A win is detected by matching the bitmask against precomputed masks of the lines
+    going through the last occupied cell, which does not allocate.
+    """
+
+    __LINE_MASKS: Sequence[Sequence[int]] = _line_masks(AbstractBoard.const_size())
+
+    def __init__(self, x_bits: int = 0, o_bits: int = 0):
+        assert x_bits & o_bits == 0, f"{x_bits}, {o_bits}"
+        assert x_bits | o_bits < 1 << self.size() ** 2, f"{x_bits}, {o_bits}"
+        self.x_bits: int = x_bits
+        self.o_bits: int = o_bits
+        size = self.size()
+        self.__empty: EmptyCells = EmptyCells(
+                size, [Cell(x, y) for x in range(size) for y in range(size)
+                       if (x_bits | o_bits) >> (x * size + y) & 1])
+
+    def set(self, cell: Cell, mark: Mark) -> None:
+        bit = 1 << BitBoard.bit_idx(cell)
+        assert (self.x_bits | self.o_bits) & bit == 0
+        if mark is Mark.X:
+            self.x_bits |= bit
+        else:
+            self.o_bits |= bit
+        self.__empty.remove(cell)
+
+    def unset(self, cell: Cell) -> None:
+        bit = 1 << BitBoard.bit_idx(cell)
+        assert (self.x_bits | self.o_bits) & bit != 0
+        self.x_bits &= ~bit
+        self.o_bits &= ~bit
+        self.__empty.restore(cell)
+
+    def get(self, cell: Cell) -> Optional[Mark]:
+        bit = 1 << BitBoard.bit_idx(cell)
+        if self.x_bits & bit:
+            return Mark.X
+        elif self.o_bits & bit:
+            return Mark.O
+        else:
+            return None
+
+    def clear(self) -> None:
+        self.x_bits = 0
+        self.o_bits = 0
+        self.__empty.reset()
+
+    def size(self) -> int:
+        return AbstractBoard.const_size()
+
+    def empty_count(self) -> int:
+        return self.__empty.count()
+
+    def empty_cell(self, i: int) -> Cell:
+        return self.__empty.get(i)
+
+    def empty_cells(self) -> Sequence[Cell]:
+        return self.__empty.cells()
+
+    def is_win(self, last_occupied: Cell) -> bool:
+        idx = BitBoard.bit_idx(last_occupied)
+        bit = 1 << idx
+        if self.x_bits & bit:
+            bits = self.x_bits
+        else:
+            assert self.o_bits & bit
+            bits = self.o_bits
+        for mask in BitBoard.__LINE_MASKS[idx]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    @staticmethod
+    def bit_idx(cell: Cell) -> int:
+        return cell.x * AbstractBoard.const_size() + cell.y
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"x_bits={self.x_bits:#x},"
+                f"o_bits={self.o_bits:#x})")
@@ -0,0 +1,173 @@
+"""The game-tree table of all positions reachable under `Logic` rules.
+
+Run `python -m yo1k.tic_tac_toe book --help` for how to (re)generate the table file.
+
+The file starts with `Book.const_magic()` followed by one section per mark to move,
+in the order `Mark.X`, `Mark.O`. A section has one byte per position addressed by
+`position.key`. A byte holds the index of the best cell to occupy in the lower 4 bits
+and the `Outcome` for the player to move in the upper 4 bits. The best cell is
+`Book.const_no_move()` for terminal positions, and the byte is `Book.const_no_entry()`
+for positions that are not reachable.
+"""
+from __future__ import annotations
+import argparse
+import mmap
+import os
+from collections import deque
+from collections.abc import Sequence
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+from yo1k.tic_tac_toe import position
+from yo1k.tic_tac_toe.ai import Minimax, OccupyingAI
+from yo1k.tic_tac_toe.game import (
+    AI, AbstractBoard, Cell, DefaultActionQueue, Mark, PlayerID, State)
+
+
+class Outcome(Enum):
+    """The game value of a position for the player to move, assuming perfect play."""
+    LOSS = 0
+    DRAW = 1
+    WIN = 2
+
+
+class Book:
+    """A read-only memory-mapped game-tree table, see the module docstring for the format.
+
+    Raises `ValueError` if the file at `path` is not a book."""
+
+    def __init__(self, path: Optional[Path] = None):
+        path = Book.default_path() if path is None else path
+        with open(path, "rb") as file:
+            self.__data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic = Book.const_magic()
+        if self.__data[:len(magic)] != magic or len(self.__data) != Book.const_file_size():
+            self.__data.close()
+            raise ValueError(f"not a book {path}")
+
+    def lookup(self, pos: position.Position, mark: int) -> Optional[tuple[int, Outcome]]:
+        """Returns the index of the best cell to occupy and the `Outcome` for the player with
+        the `mark` to move in `pos`, or `None` if `pos` is not reachable with that player to move.
+        The index is `Book.const_no_move()` if `pos` is terminal."""
+        entry = self.__data[Book.__offset(pos, mark)]
+        if entry == Book.const_no_entry():
+            return None
+        return entry & 0xF, Outcome(entry >> 4)
+
+    def close(self) -> None:
+        self.__data.close()
+
+    @staticmethod
+    def generate(path: Path) -> int:
+        """Writes the table of all reachable positions to `path` and returns the number of
+        entries written, which is the number of reachable positions with each mark to move."""
+        data = bytearray(Book.const_file_size())
+        magic = Book.const_magic()
+        data[:len(magic)] = magic
+        data[len(magic):] = bytes([Book.const_no_entry()]) * (len(data) - len(magic))
+        minimax = Minimax()
+        entries = 0
+        for first in (position.value(Mark.X), position.value(Mark.O)):
+            empty = [0] * AbstractBoard.const_size() ** 2
+            queue: deque[tuple[position.Position, int, int]] = deque([(empty, first, -1)])
+            while len(queue) > 0:
+                (pos, mark, last_occupied) = queue.popleft()
+                offset = Book.__offset(pos, mark)
+                if data[offset] != Book.const_no_entry():
+                    continue
+                entries += 1
+                if last_occupied >= 0 and position.is_win(pos, last_occupied):
+                    data[offset] = Book.__entry(Book.const_no_move(), Outcome.LOSS)
+                elif pos.count(0) == 0:
+                    data[offset] = Book.__entry(Book.const_no_move(), Outcome.DRAW)
+                else:
+                    score = minimax.score(pos, mark)
+                    outcome = Outcome.WIN if score > 0 \
+                        else Outcome.LOSS if score < 0 \
+                        else Outcome.DRAW
+                    data[offset] = Book.__entry(minimax.best_move(pos, mark), outcome)
+                    for (idx, v) in enumerate(pos):
+                        if v == 0:
+                            child = list(pos)
+                            child[idx] = mark
+                            queue.append((child, position.other(mark), idx))
+        with open(path, "wb") as file:
+            file.write(data)
+        return entries
+
+    @staticmethod
+    def default_path() -> Path:
+        return Path(__file__).with_name("book.bin")
+
+    @staticmethod
+    def const_magic() -> bytes:
+        return b"TTTBOOK\x01"
+
+    @staticmethod
+    def const_no_move() -> int:
+        return 0xF
+
+    @staticmethod
+    def const_no_entry() -> int:
+        return 0xFF
+
+    @staticmethod
+    def const_file_size() -> int:
+        section: int = 3 ** AbstractBoard.const_size() ** 2
+        return len(Book.const_magic()) + 2 * section
+
+    @staticmethod
+    def __offset(pos: position.Position, mark: int) -> int:
+        section: int = 3 ** len(pos)
+        return len(Book.const_magic()) + (mark - 1) * section + position.key(pos)
+
+    @staticmethod
+    def __entry(idx: int, outcome: Outcome) -> int:
+        return outcome.value << 4 | idx
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"size={len(self.__data)})")
+
+
+class BookAI(OccupyingAI):
+    """Plays optimally by looking moves up in a `Book`, which makes each decision O(1)."""
+
+    def __init__(self, player_id: PlayerID, action_queue: DefaultActionQueue,
+                 book: Optional[Book] = None):
+        super().__init__(player_id, action_queue)
+        self.__book: Book = Book() if book is None else book
+
+    def choose(self, state: State) -> Cell:
+        mark = position.value(state.players[self.player_id.idx].mark)
+        entry = self.__book.lookup(position.from_board(state.board), mark)
+        assert entry is not None
+        (idx, _) = entry
+        assert idx != Book.const_no_move()
+        return position.cell_at(idx)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"player_id={self.player_id},"
+                f"action_queue={self.action_queue},"
+                f"book={self.__book})")
+
+
+def new_book_ai(player_id: PlayerID, _: int, action_queue: DefaultActionQueue) -> AI:
+    return BookAI(player_id, action_queue)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+            prog="python -m yo1k.tic_tac_toe book",
+            description="Generates the book of all positions.")
+    parser.add_argument(
+            "path", type=Path, nargs="?", default=Book.default_path(),
+            help="the file to write the book to, defaults to the book read by `BookAI`s")
+    args = parser.parse_args(argv)
+    entries = Book.generate(args.path)
+    print(f"{entries} entries written to {args.path}", end=os.linesep)
+
+
+if __name__ == "__main__":
+    main()
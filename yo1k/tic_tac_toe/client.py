@@ -0,0 +1,119 @@
+"""A load generator for `server`, which plays with `RandomAI`s over loopback connections.
+
+Run `python -m yo1k.tic_tac_toe.client --help` for the command-line usage.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import math
+import os
+from collections.abc import Sequence
+from statistics import quantiles
+from time import perf_counter
+from typing import Optional
+from yo1k.tic_tac_toe import protocol
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.game import DefaultActionQueue, Logic, PlayerID, State
+from yo1k.tic_tac_toe.server import Server
+
+
+class LoadStats:
+    """Move latencies in seconds, measured from sending an occupy action until receiving
+    the `State` it results in, and the number of games played to the end."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.games: int = 0
+
+    def percentile(self, percent: int) -> float:
+        """Returns NaN if no moves were measured."""
+        assert 1 <= percent <= 99, f"{percent}"
+        if len(self.latencies) < 2:
+            # `quantiles` requires at least two latencies
+            return self.latencies[0] if len(self.latencies) == 1 else math.nan
+        return quantiles(self.latencies, n=100)[percent - 1]
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"moves={len(self.latencies)},"
+                f"games={self.games})")
+
+
+async def play(host: str, port: int, seed: int, stats: LoadStats) -> None:
+    """Connects to a server and plays a game with a `RandomAI`."""
+    (reader, writer) = await asyncio.open_connection(host, port)
+    ai: Optional[RandomAI] = None
+    action_queue: Optional[DefaultActionQueue] = None
+    sent_at: Optional[float] = None
+    try:
+        while True:
+            line = await reader.readline()
+            if len(line) == 0:
+                break
+            message = protocol.decode(line)
+            if message["type"] != "state":
+                continue
+            if sent_at is not None:
+                stats.latencies.append(perf_counter() - sent_at)
+                sent_at = None
+            state = protocol.decode_state(message)
+            if Logic.is_game_over(state):
+                stats.games += 1
+                break
+            if ai is None or action_queue is None:
+                player_id = PlayerID(message["player"])
+                action_queue = DefaultActionQueue(player_id)
+                ai = RandomAI(player_id, seed, action_queue)
+            ai.act(state)
+            action = action_queue.pop()
+            if action is not None:
+                writer.write(protocol.encode_action(action))
+                await writer.drain()
+                if action.occupy is not None:
+                    sent_at = perf_counter()
+    finally:
+        writer.close()
+
+
+async def generate_load(host: str, port: int, connections: int, seed: int = 0) -> LoadStats:
+    """Plays games over `connections` concurrent connections to a server."""
+    stats = LoadStats()
+    await asyncio.gather(*(play(host, port, seed + i, stats) for i in range(connections)))
+    return stats
+
+
+async def generate_local_load(connections: int, rounds: int, seed: int = 0) -> LoadStats:
+    """Starts a `Server` in this event loop and plays games over loopback connections to it."""
+    server = await Server(rounds).start("127.0.0.1", 0)
+    (host, port) = server.sockets[0].getsockname()[:2]
+    async with server:
+        return await generate_load(host, port, connections, seed)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+            prog="python -m yo1k.tic_tac_toe.client",
+            description="Plays games with RandomAIs over many concurrent connections to a server "
+                        "and reports move latency.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument(
+            "--local", action="store_true",
+            help="start a server in this process instead of connecting to HOST:PORT")
+    parser.add_argument("--connections", type=int, default=2_000)
+    parser.add_argument("--rounds", type=int, default=State.default_rounds())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    start = perf_counter()
+    if args.local:
+        stats = asyncio.run(generate_local_load(args.connections, args.rounds, args.seed))
+    else:
+        stats = asyncio.run(generate_load(args.host, args.port, args.connections, args.seed))
+    duration = perf_counter() - start
+    print(f"{stats.games} games, {len(stats.latencies)} moves in {duration:.1f} s", end=os.linesep)
+    print(f"move latency p50: {stats.percentile(50) * 1e3:.2f} ms, "
+          f"p99: {stats.percentile(99) * 1e3:.2f} ms", end=os.linesep)
+
+
+if __name__ == "__main__":
+    main()
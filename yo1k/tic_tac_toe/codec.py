@@ -0,0 +1,96 @@
+"""A compact versioned binary encoding of `State`.
+
+All numbers are little-endian. Version 1 is a single `RECORD` of 15 bytes:
+
+| field   | type | content                                                                    |
+|---------|------|----------------------------------------------------------------------------|
+| version | u8   | `1`                                                                        |
+| flags   | u8   | bits 0-1: index in `Phase`; bits 2-3: `required_ready`, bit `2 + idx`      |
+|         |      | per `PlayerID.idx`; bits 4-5: marks, bit `4 + idx` is set iff it is `O`   |
+| rounds  | u16  | `State.rounds`                                                             |
+| round   | u16  | `State.round`                                                              |
+| step    | u8   | `State.step`                                                               |
+| wins    | u16  | `Player.wins` per player, in the order of `State.players`                  |
+| board   | u32  | 2 bits per cell `(x, y)` at bit `2 * (x * size + y)`: `0` empty, `1` X, `2` O |
+"""
+from __future__ import annotations
+import struct
+from typing import Union
+from yo1k.tic_tac_toe.game import AbstractBoard, Board, Cell, Mark, Phase, Player, PlayerID, State
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+RECORD: struct.Struct = struct.Struct("<BBHHBHHI")
+VERSION: int = 1
+
+_SIZE: int = AbstractBoard.const_size()
+_PHASES: tuple[Phase, ...] = tuple(Phase)
+_MARKS: tuple[Mark, ...] = (Mark.X, Mark.O)
+
+
+def encode(state: State) -> bytes:
+    buffer = bytearray(RECORD.size)
+    encode_into(state, buffer)
+    return bytes(buffer)
+
+
+def encode_into(state: State, buffer: Union[bytearray, memoryview], offset: int = 0) -> None:
+    """Writes `state` to `buffer` starting at `offset` without intermediate copies."""
+    assert state.board.size() == _SIZE, f"{state.board.size()}, {_SIZE}"
+    assert state.board.win_length() == _SIZE, f"{state.board.win_length()}, {_SIZE}"
+    assert len(state.players) == State.const_player_count() == 2, f"{len(state.players)}"
+    flags = _PHASES.index(state.phase)
+    for player_id in state.required_ready:
+        flags |= 1 << (2 + player_id.idx)
+    for player in state.players:
+        if player.mark is Mark.O:
+            flags |= 1 << (4 + player.id.idx)
+    board = 0
+    for x in range(_SIZE):
+        for y in range(_SIZE):
+            mark = state.board.get(Cell(x, y))
+            if mark is not None:
+                board |= (_MARKS.index(mark) + 1) << (2 * (x * _SIZE + y))
+    RECORD.pack_into(
+            buffer, offset,
+            VERSION, flags, state.rounds, state.round, state.step,
+            state.players[0].wins, state.players[1].wins, board)
+
+
+def decode(buffer: Buffer, offset: int = 0) -> State:
+    """Reads a `State` encoded by `encode` from `buffer` starting at `offset`
+    without copying the buffer, for example from a `memoryview` over a memory-mapped file.
+
+    Raises `ValueError` if the data is not a valid encoding."""
+    (version, flags, rounds, round_, step, wins_x, wins_o, board) \
+        = RECORD.unpack_from(buffer, offset)
+    if version != VERSION:
+        raise ValueError(f"unsupported version {version}")
+    phase_idx = flags & 0b11
+    if phase_idx >= len(_PHASES) or flags >> 6 != 0:
+        raise ValueError(f"invalid flags {flags:#x}")
+    players = []
+    for (idx, wins) in enumerate((wins_x, wins_o)):
+        player = Player(PlayerID(idx), _MARKS[flags >> (4 + idx) & 1])
+        player.wins = wins
+        players.append(player)
+    cells = []
+    for x in range(_SIZE):
+        row = []
+        for y in range(_SIZE):
+            value = board >> (2 * (x * _SIZE + y)) & 0b11
+            if value == 3:
+                raise ValueError(f"invalid board {board:#x}")
+            row.append(None if value == 0 else _MARKS[value - 1])
+        cells.append(row)
+    if board >> (2 * _SIZE * _SIZE) != 0:
+        raise ValueError(f"invalid board {board:#x}")
+    return State(
+            rounds=rounds,
+            players=tuple(players),
+            board=Board(cells),
+            phase=_PHASES[phase_idx],
+            round_=round_,
+            step=step,
+            required_ready=set(player.id for player in players
+                               if flags >> (2 + player.id.idx) & 1))
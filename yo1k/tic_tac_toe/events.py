@@ -0,0 +1,293 @@
+"""Typed events of running games, and statistics aggregated from the events of many games.
+
+`events` advances a `World` lazily and yields an `Event` for every move, surrender,
+end of a round and end of the game, so analyses need not inspect `State` after each
+`World.advance`. `game_events` chains the events of seeded games into one stream,
+and `Aggregator`s consume a stream incrementally in memory which does not depend
+on the number of games.
+
+Run `python -m yo1k.tic_tac_toe stats --help` for the command-line usage.
+"""
+from __future__ import annotations
+import argparse
+import os
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Sequence
+from time import perf_counter
+from typing import Optional
+from yo1k.tic_tac_toe.game import (
+    AI, Action, ActionQueue, Board, Cell, DefaultActionQueue, Logic, Mark, Phase, Player,
+    PlayerID, State)
+from yo1k.tic_tac_toe.registry import AIS, AIFactory
+from yo1k.tic_tac_toe.tournament import game_seeds
+from yo1k.tic_tac_toe.util import eq
+
+
+class Event:
+    """Something that happened in the round number `round` of a game."""
+
+    __slots__ = ("round",)
+
+    def __init__(self, round_: int):
+        self.round: int = round_
+
+
+@eq
+class Move(Event):
+    """The player with `player_id` occupied `cell` in the step number `step` of a round."""
+
+    __slots__ = ("step", "player_id", "cell")
+
+    def __init__(self, round_: int, step: int, player_id: PlayerID, cell: Cell):
+        super().__init__(round_)
+        self.step: int = step
+        self.player_id: PlayerID = player_id
+        self.cell: Cell = cell
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"round={self.round},"
+                f"step={self.step},"
+                f"player_id={self.player_id},"
+                f"cell={self.cell})")
+
+
+@eq
+class Surrender(Event):
+    """The player with `player_id` surrendered in the step number `step` of a round,
+    which is followed by `RoundWon` of the other player."""
+
+    __slots__ = ("step", "player_id")
+
+    def __init__(self, round_: int, step: int, player_id: PlayerID):
+        super().__init__(round_)
+        self.step: int = step
+        self.player_id: PlayerID = player_id
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"round={self.round},"
+                f"step={self.step},"
+                f"player_id={self.player_id})")
+
+
+@eq
+class RoundWon(Event):
+    __slots__ = ("player_id",)
+
+    def __init__(self, round_: int, player_id: PlayerID):
+        super().__init__(round_)
+        self.player_id: PlayerID = player_id
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"round={self.round},"
+                f"player_id={self.player_id})")
+
+
+@eq
+class Draw(Event):
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"round={self.round})")
+
+
+@eq
+class GameOver(Event):
+    """The game is over after the round number `round`,
+    `wins[i]` is the number of rounds won by `State.players[i]`."""
+
+    __slots__ = ("wins",)
+
+    def __init__(self, round_: int, wins: Sequence[int]):
+        super().__init__(round_)
+        self.wins: tuple[int, ...] = tuple(wins)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"round={self.round},"
+                f"wins={self.wins})")
+
+
+class _ObservedActionQueue(ActionQueue):
+    """Wraps `action_queue` and appends every action popped from it to `popped`."""
+
+    def __init__(self, action_queue: ActionQueue, popped: list[tuple[PlayerID, Action]]):
+        self.__action_queue: ActionQueue = action_queue
+        self.__popped: list[tuple[PlayerID, Action]] = popped
+
+    def player_id(self) -> PlayerID:
+        return self.__action_queue.player_id()
+
+    def pop(self) -> Optional[Action]:
+        action = self.__action_queue.pop()
+        if action is not None:
+            self.__popped.append((self.__action_queue.player_id(), action))
+        return action
+
+    def has_actions(self) -> bool:
+        return self.__action_queue.has_actions()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"action_queue={self.__action_queue})")
+
+
+def events(state: State, action_queues: Sequence[ActionQueue], ais: Sequence[AI]) \
+        -> Iterator[Event]:
+    """Plays the game of `World(state, Logic(action_queues), ais)` as `World.run` does
+    and yields its events, advancing `Logic` only when the next event is requested,
+    so the consumer may inspect `state` between events.
+
+    Stops once the game is over or no action arrives. Players getting ready produce no events.
+    """
+    assert len(ais) == len(state.players), f"{len(ais)}, {len(state.players)}"
+    popped: list[tuple[PlayerID, Action]] = []
+    logic = Logic(tuple(_ObservedActionQueue(action_queue, popped)
+                        for action_queue in action_queues))
+    while not Logic.is_game_over(state):
+        # the loop of `World.run`, which would create `RunStats` for each event
+        awaited = Logic.awaited(state)
+        for player_id in awaited:
+            ais[player_id.idx].act(state)
+        if not logic.has_actions(awaited):
+            return
+        if state.phase is not Phase.INROUND:
+            logic.advance(state)
+            popped.clear()
+            continue
+        (round_, step) = (state.round, state.step)
+        wins = tuple(player.wins for player in state.players)
+        logic.advance(state)
+        for (player_id, action) in popped:
+            if action.occupy is not None:
+                yield Move(round_, step, player_id, action.occupy)
+            else:
+                yield Surrender(round_, step, player_id)
+        popped.clear()
+        phase: Phase = state.phase
+        if phase is Phase.OUTROUND:
+            winners = [player.id for player in state.players if player.wins > wins[player.id.idx]]
+            yield Draw(round_) if len(winners) == 0 else RoundWon(round_, winners[0])
+            if Logic.is_game_over(state):
+                yield GameOver(round_, tuple(player.wins for player in state.players))
+
+
+def game_events(ais: Sequence[AIFactory], games: int, rounds: int = State.default_rounds(),
+                seed: int = 0) -> Iterator[Event]:
+    """Yields the events of `games` games between `AI`s created by `ais`, one game after
+    another, where the game number `game` is seeded as in `tournament.game_seeds`."""
+    for game in range(games):
+        players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+        action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+        yield from events(
+                State(rounds=rounds, players=players, board=Board()),
+                action_queues,
+                tuple(new_ai(player.id, ai_seed, action_queue)
+                      for (new_ai, player, ai_seed, action_queue)
+                      in zip(ais, players, game_seeds(seed, game), action_queues)))
+
+
+class Aggregator(ABC):
+    @abstractmethod
+    def add(self, event: Event) -> None:
+        pass
+
+
+class FirstMoverStats(Aggregator):
+    """Outcomes of rounds by whether the player who won moved first in the round."""
+
+    def __init__(self) -> None:
+        self.first_mover_wins: int = 0
+        self.second_mover_wins: int = 0
+        self.draws: int = 0
+        self.__first_mover: Optional[PlayerID] = None
+
+    @property
+    def rounds(self) -> int:
+        return self.first_mover_wins + self.second_mover_wins + self.draws
+
+    def add(self, event: Event) -> None:
+        if isinstance(event, (Move, Surrender)) and event.step == 0:
+            self.__first_mover = event.player_id
+        elif isinstance(event, RoundWon):
+            if event.player_id == self.__first_mover:
+                self.first_mover_wins += 1
+            else:
+                self.second_mover_wins += 1
+        elif isinstance(event, Draw):
+            self.draws += 1
+
+    def win_rates(self) -> tuple[float, float, float]:
+        """Returns the shares of rounds won by the first mover, won by the second mover,
+        and drawn."""
+        rounds = max(self.rounds, 1)
+        return self.first_mover_wins / rounds, self.second_mover_wins / rounds, self.draws / rounds
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"first_mover_wins={self.first_mover_wins},"
+                f"second_mover_wins={self.second_mover_wins},"
+                f"draws={self.draws})")
+
+
+class OpeningStats(Aggregator):
+    """The number of rounds opened by occupying each cell."""
+
+    def __init__(self) -> None:
+        self.counts: dict[Cell, int] = {}
+
+    def add(self, event: Event) -> None:
+        if isinstance(event, Move) and event.step == 0:
+            self.counts[event.cell] = self.counts.get(event.cell, 0) + 1
+
+    def frequencies(self) -> dict[Cell, float]:
+        """Returns the share of rounds opened by occupying each cell."""
+        rounds = sum(self.counts.values())
+        return dict((cell, count / rounds) for (cell, count) in self.counts.items())
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"counts={self.counts})")
+
+
+def aggregate(stream: Iterable[Event], aggregators: Sequence[Aggregator]) -> int:
+    """Adds every event of `stream` to all `aggregators` and returns the number of events."""
+    count = 0
+    for event in stream:
+        count += 1
+        for aggregator in aggregators:
+            aggregator.add(event)
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+            prog="python -m yo1k.tic_tac_toe stats",
+            description="Streams events of seeded games between two AIs into statistics.")
+    parser.add_argument("ai_x", choices=AIS.keys(), help="the AI playing for X")
+    parser.add_argument("ai_o", choices=AIS.keys(), help="the AI playing for O")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=State.default_rounds())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    first_mover = FirstMoverStats()
+    openings = OpeningStats()
+    start = perf_counter()
+    event_count = aggregate(
+            game_events((AIS[args.ai_x], AIS[args.ai_o]), args.games, args.rounds, args.seed),
+            (first_mover, openings))
+    duration = perf_counter() - start
+    (first, second, draws) = first_mover.win_rates()
+    print(f"first mover wins: {first:.1%}, second mover wins: {second:.1%}, draws: {draws:.1%}",
+          end=os.linesep)
+    for (cell, frequency) in sorted(openings.frequencies().items(), key=lambda item: -item[1]):
+        print(f"opening ({cell.x}, {cell.y}): {frequency:.1%}", end=os.linesep)
+    print(f"{args.games / duration:,.0f} games/s, {event_count / duration:,.0f} events/s",
+          end=os.linesep)
+
+
+if __name__ == "__main__":
+    main()
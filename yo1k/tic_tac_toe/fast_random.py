@@ -0,0 +1,53 @@
+"""A random policy which draws its random numbers in bulk.
+
+`FastRandomAI` chooses a uniformly random empty cell as `RandomAI` does, but instead of
+calling `Random.randrange` for each move, it draws uniform numbers for `batch` moves with one
+NumPy call and scales one of them by the number of empty cells, which indexes the empty cells
+of the board directly, so there are no occupied cells to skip.
+
+The numbers are drawn by `Generator.random` of PCG64, which derives each number from the bits
+PCG64 generates, so a seed gives the same games on all platforms regardless of `batch`.
+"""
+from __future__ import annotations
+from collections.abc import Iterator
+import numpy as np
+from yo1k.tic_tac_toe.ai import OccupyingAI
+from yo1k.tic_tac_toe.game import AI, Cell, DefaultActionQueue, PlayerID, State
+
+
+class FastRandomAI(OccupyingAI):
+    """Occupies a uniformly random empty cell using numbers drawn by `rng` in batches.
+
+    `rng` may be shared by `AI`s which do not play at the same time, for example by
+    the `AI`s of games played one after another, which avoids creating a `Generator` per game.
+    """
+
+    def __init__(self, player_id: PlayerID, rng: np.random.Generator,
+                 action_queue: DefaultActionQueue, batch: int = 256):
+        assert batch > 0, f"{batch}"
+        super().__init__(player_id, action_queue)
+        self.__rng: np.random.Generator = rng
+        self.__batch: int = batch
+        self.__draws: Iterator[float] = iter(())
+
+    def choose(self, state: State) -> Cell:
+        draw = next(self.__draws, None)
+        if draw is None:
+            self.__draws = iter(self.__rng.random(self.__batch).tolist())
+            draw = next(self.__draws)
+        board = state.board
+        return board.empty_cell(int(draw * board.empty_count()))
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"player_id={self.player_id},"
+                f"batch={self.__batch},"
+                f"action_queue={self.action_queue})")
+
+
+def new_rng(seed: int) -> np.random.Generator:
+    return np.random.Generator(np.random.PCG64(seed))
+
+
+def new_fast_random_ai(player_id: PlayerID, seed: int, action_queue: DefaultActionQueue) -> AI:
+    return FastRandomAI(player_id, new_rng(seed), action_queue, batch=32)
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import queue
+import threading
 from collections import deque
-from collections.abc import Sequence, MutableSequence
+from collections.abc import Callable, Sequence, MutableSequence
 from enum import Enum, auto
-from typing import Optional
+from typing import ClassVar, Optional
 from abc import ABC, abstractmethod
 from yo1k.tic_tac_toe.util import eq
 
@@ -14,8 +16,29 @@ class Mark(Enum):
 
 @eq
 class PlayerID:
-    def __init__(self, idx: int):
-        self.idx: int = idx
+    """Immutable and interned: `PlayerID(idx)` returns the same object for equal `idx`."""
+
+    __slots__ = ("__idx",)
+    __idx: int
+    __interned: ClassVar[dict[int, PlayerID]] = {}
+
+    def __new__(cls, idx: int) -> PlayerID:
+        player_id = PlayerID.__interned.get(idx)
+        if player_id is None:
+            player_id = super().__new__(cls)
+            player_id.__idx = idx
+            PlayerID.__interned[idx] = player_id
+        return player_id
+
+    @property
+    def idx(self) -> int:
+        return self.__idx
+
+    def __hash__(self) -> int:
+        return hash(self.__idx)
+
+    def __reduce__(self) -> tuple[type[PlayerID], tuple[int]]:
+        return PlayerID, (self.__idx,)
 
     def __repr__(self) -> str:
         return (f"{type(self).__qualname__}("
@@ -24,11 +47,21 @@ class PlayerID:
 
 @eq
 class Player:
+    __slots__ = ("__id", "__mark", "wins")
+
     def __init__(self, id_: PlayerID, mark: Mark):
-        self.id: PlayerID = id_
-        self.mark: Mark = mark
+        self.__id: PlayerID = id_
+        self.__mark: Mark = mark
         self.wins: int = 0
 
+    @property
+    def id(self) -> PlayerID:
+        return self.__id
+
+    @property
+    def mark(self) -> Mark:
+        return self.__mark
+
     def __repr__(self) -> str:
         return (f"{type(self).__qualname__}("
                 f"id={self.id},"
@@ -43,13 +76,54 @@ class Phase(Enum):
 
 
 class Cell:
-    """A game board cell."""
+    """A game board cell.
+
+    Immutable and interned: `Cell(x, y)` returns the same object for equal `x` and `y`,
+    so cells are compared and hashed by identity.
+    """
+
+    __slots__ = ("__x", "__y", "__occupy")
+    __x: int
+    __y: int
+    __occupy: Action
+    __interned: ClassVar[list[list[Cell]]] = []
+
+    def __new__(cls, x: int, y: int) -> Cell:
+        assert 0 <= x < AbstractBoard.const_max_size(), f"{x}, {AbstractBoard.const_max_size()}"
+        assert 0 <= y < AbstractBoard.const_max_size(), f"{y}, {AbstractBoard.const_max_size()}"
+        interned = Cell.__interned
+        if x >= len(interned) or y >= len(interned):
+            size = max(x, y) + 1
+            for cell_x in range(size):
+                if cell_x == len(interned):
+                    interned.append([])
+                row = interned[cell_x]
+                for cell_y in range(len(row), size):
+                    cell = super().__new__(cls)
+                    cell.__intern(cell_x, cell_y)
+                    row.append(cell)
+        return interned[x][y]
+
+    def __intern(self, x: int, y: int) -> None:  # pylint: disable=W0238
+        self.__x = x
+        self.__y = y
+        self.__occupy = Action(False, self, False)
 
-    def __init__(self, x: int, y: int):
-        assert 0 <= x < Board.const_size(), f"{x}, {Board.const_size()}"
-        assert 0 <= y < Board.const_size(), f"{y}, {Board.const_size()}"
-        self.x: int = x
-        self.y: int = y
+    @property
+    def x(self) -> int:
+        return self.__x
+
+    @property
+    def y(self) -> int:
+        return self.__y
+
+    @property
+    def occupy(self) -> Action:
+        """The interned action occupying this cell, see `Action.new_occupy`."""
+        return self.__occupy
+
+    def __reduce__(self) -> tuple[type[Cell], tuple[int, int]]:
+        return Cell, (self.__x, self.__y)
 
     def __repr__(self) -> str:
         return (f"{type(self).__qualname__}("
@@ -57,16 +131,185 @@ class Cell:
                 f"y={self.y})")
 
 
+class AbstractBoard(ABC):
+    """A game board.
+
+    Implementations may store cells in any way, but must keep the `set/get/clear/size` contract
+    so that `Logic` and `AI`s work with any of them.
+    """
+
+    @abstractmethod
+    def set(self, cell: Cell, mark: Mark) -> None:
+        pass
+
+    @abstractmethod
+    def unset(self, cell: Cell) -> None:
+        """Empties the occupied `cell`, reverting `set`."""
+
+    @abstractmethod
+    def get(self, cell: Cell) -> Optional[Mark]:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        pass
+
+    @abstractmethod
+    def is_win(self, last_occupied: Cell) -> bool:
+        """Returns `True` iff `last_occupied` completes a line of `win_length` equal marks."""
+
+    def empty_count(self) -> int:
+        """Returns the number of empty cells.
+
+        The default implementation scans the board.
+        """
+        return len(self.empty_cells())
+
+    def empty_cell(self, i: int) -> Cell:
+        """Returns the `i`-th empty cell in an unspecified order, which is changed by `set`
+        and `clear`, where `0 <= i < empty_count()`.
+
+        The default implementation scans the board.
+        """
+        return self.empty_cells()[i]
+
+    def empty_cells(self) -> Sequence[Cell]:
+        """Returns all empty cells in the order of `empty_cell`.
+
+        The default implementation scans the board.
+        """
+        return [Cell(x, y) for x in range(self.size()) for y in range(self.size())
+                if self.get(Cell(x, y)) is None]
+
+    def win_length(self) -> int:
+        """Returns the number of equal marks in a line required to win.
+
+        The default implementation returns `size`.
+        """
+        return self.size()
+
+    @staticmethod
+    def const_size() -> int:
+        """Returns the default `size`."""
+        return 3
+
+    @staticmethod
+    def const_max_size() -> int:
+        return 64
+
+
+class EmptyCells:
+    """An index of the empty cells of a board, which supports occupying a cell
+    and emptying all cells in `O(1)`.
+
+    It is a permutation of all cells whose first `count()` elements are the empty ones.
+    `remove` swaps the occupied cell out of the empty prefix, and `reset` restores the length
+    of the prefix. The order of the empty cells depends only on the sequence of calls,
+    so `AbstractBoard`s using `EmptyCells` return the same `empty_cell(i)`.
+    """
+
+    def __init__(self, size: int, occupied: Sequence[Cell] = ()):
+        self.__order: list[Cell] = [Cell(x, y) for x in range(size) for y in range(size)]
+        self.__positions: dict[Cell, int] = dict(
+                (cell, position) for (position, cell) in enumerate(self.__order))
+        self.__count: int = size ** 2
+        for cell in occupied:
+            self.remove(cell)
+
+    def remove(self, cell: Cell) -> None:
+        """Removes the empty `cell`."""
+        order = self.__order
+        positions = self.__positions
+        position = positions[cell]
+        last = self.__count - 1
+        assert position <= last, f"{cell}"
+        last_cell = order[last]
+        order[position] = last_cell
+        positions[last_cell] = position
+        order[last] = cell
+        positions[cell] = last
+        self.__count = last
+
+    def restore(self, cell: Cell) -> None:
+        """Adds the occupied `cell`."""
+        order = self.__order
+        positions = self.__positions
+        position = positions[cell]
+        first = self.__count
+        assert position >= first, f"{cell}"
+        first_cell = order[first]
+        order[position] = first_cell
+        positions[first_cell] = position
+        order[first] = cell
+        positions[cell] = first
+        self.__count = first + 1
+
+    def reset(self) -> None:
+        """Makes all cells empty."""
+        self.__count = len(self.__order)
+
+    def count(self) -> int:
+        return self.__count
+
+    def get(self, i: int) -> Cell:
+        assert 0 <= i < self.__count, f"{i}, {self.__count}"
+        return self.__order[i]
+
+    def cells(self) -> Sequence[Cell]:
+        return self.__order[:self.__count]
+
+    def __eq__(self, other: object) -> bool:
+        """Ignores the order of the empty cells."""
+        return isinstance(other, EmptyCells) and set(self.cells()) == set(other.cells())
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"cells={self.cells()})")
+
+
 @eq
-class Board:
-    def __init__(self, cells: Optional[Sequence[MutableSequence[Optional[Mark]]]] = None):
+class Board(AbstractBoard):
+    """The default `AbstractBoard` which stores cells as nested lists.
+
+    Supports any `size` up to `const_max_size` and any `win_length` up to `size`,
+    for example `Board(size=15, win_length=5)`.
+    Keeps `EmptyCells`, so `cells` must be modified only via `set` and `clear`.
+    """
+
+    __DIRECTIONS: Sequence[tuple[int, int]] = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+    def __init__(
+            self,
+            cells: Optional[Sequence[MutableSequence[Optional[Mark]]]] = None,
+            *,
+            size: Optional[int] = None,
+            win_length: Optional[int] = None):
+        """`size` defaults to the size of `cells`, if specified, or to `const_size`,
+        `win_length` defaults to `size`."""
+        if size is None:
+            size = Board.const_size() if cells is None else len(cells)
         self.cells: Sequence[MutableSequence[Optional[Mark]]] \
-            = Board.__empty_cells() if cells is None else cells
-        Board.__assert_board(self.cells, self.size())
+            = Board.__empty_cells(size) if cells is None else cells
+        Board.__assert_board(self.cells, size)
+        self.__win_length: int = size if win_length is None else win_length
+        assert 1 <= self.__win_length <= size, f"{self.__win_length}, {size}"
+        self.__empty: EmptyCells = EmptyCells(
+                size, [Cell(x, y) for x in range(size) for y in range(size)
+                       if self.cells[x][y] is not None])
 
     def set(self, cell: Cell, mark: Mark) -> None:
         assert self.cells[cell.x][cell.y] is None
         self.cells[cell.x][cell.y] = mark
+        self.__empty.remove(cell)
+
+    def unset(self, cell: Cell) -> None:
+        assert self.cells[cell.x][cell.y] is not None
+        self.cells[cell.x][cell.y] = None
+        self.__empty.restore(cell)
 
     def get(self, cell: Cell) -> Optional[Mark]:
         return self.cells[cell.x][cell.y]
@@ -75,17 +318,50 @@ class Board:
         for x in range(self.size()):
             for y in range(self.size()):
                 self.cells[x][y] = None
+        self.__empty.reset()
 
     def size(self) -> int:
         return len(self.cells)
 
-    @staticmethod
-    def const_size() -> int:
-        return 3
+    def empty_count(self) -> int:
+        return self.__empty.count()
+
+    def empty_cell(self, i: int) -> Cell:
+        return self.__empty.get(i)
+
+    def empty_cells(self) -> Sequence[Cell]:
+        return self.__empty.cells()
+
+    def win_length(self) -> int:
+        return self.__win_length
+
+    def is_win(self, last_occupied: Cell) -> bool:
+        """Counts equal marks in the runs going through `last_occupied` in each direction,
+        which takes `O(win_length)` time regardless of `size`."""
+        cells = self.cells
+        size = len(cells)
+        win_length = self.__win_length
+        x = last_occupied.x
+        y = last_occupied.y
+        mark = cells[x][y]
+        assert mark is not None
+        for (dx, dy) in Board.__DIRECTIONS:
+            run = 1
+            (i, j) = (x + dx, y + dy)
+            while run < win_length and 0 <= i < size and 0 <= j < size and cells[i][j] is mark:
+                run += 1
+                (i, j) = (i + dx, j + dy)
+            (i, j) = (x - dx, y - dy)
+            while run < win_length and 0 <= i < size and 0 <= j < size and cells[i][j] is mark:
+                run += 1
+                (i, j) = (i - dx, j - dy)
+            if run == win_length:
+                return True
+        return False
 
     @staticmethod
-    def __empty_cells() -> Sequence[MutableSequence[Optional[Mark]]]:
-        return [[None for _ in range(Board.const_size())] for _ in range(Board.const_size())]
+    def __empty_cells(size: int) -> Sequence[MutableSequence[Optional[Mark]]]:
+        return [[None for _ in range(size)] for _ in range(size)]
 
     @staticmethod
     def __assert_board(cells: Sequence[MutableSequence[Optional[Mark]]], expected: int) \
@@ -96,18 +372,23 @@ class Board:
 
     def __repr__(self) -> str:
         return (f"{type(self).__qualname__}("
-                f"cells={self.cells})")
+                f"cells={self.cells},"
+                f"win_length={self.__win_length})")
 
 
 @eq
 class State:
-    """Full game state which is enough to restore a saved game."""
+    """Full game state which is enough to restore a saved game.
+
+    The size of the board and the number of marks in a line required to win
+    are those of `board`, see `AbstractBoard.size` and `AbstractBoard.win_length`.
+    """
 
     def __init__(
             self,
             rounds: int,
             players: Sequence[Player],
-            board: Board,
+            board: AbstractBoard,
             phase: Phase = Phase.BEGINNING,
             round_: int = 0,
             step: int = 0,
@@ -118,7 +399,7 @@ class State:
         for (idx, player) in enumerate(players):
             assert player.id.idx == idx, f"{player.id.idx}, {idx}"
         self.players: Sequence[Player] = players
-        self.board: Board = board
+        self.board: AbstractBoard = board
         self.phase: Phase = phase
         self.round: int = round_
         self.step: int = step
@@ -131,7 +412,7 @@ class State:
 
         `turn` is calculated in such a way as to alternate players order in different rounds.
         """
-        return PlayerID((self.step + self.round) % len(self.players))
+        return self.players[(self.step + self.round) % len(self.players)].id
 
     @staticmethod
     def const_player_count() -> int:
@@ -153,6 +434,10 @@ class State:
 
 
 class Action:
+    """Immutable. Actions created by `new_surrender`, `new_occupy` and `new_ready` are interned."""
+
+    __slots__ = ("__surrender", "__occupy", "__ready")
+
     def __init__(self, surrender: bool, occupy: Optional[Cell], ready: bool):
         assert ((surrender is True and occupy is None and ready is False)
                 or (surrender is False and occupy is not None and ready is False)
@@ -164,15 +449,15 @@ class Action:
 
     @staticmethod
     def new_surrender() -> Action:
-        return Action(True, None, False)
+        return _SURRENDER
 
     @staticmethod
     def new_occupy(cell: Cell) -> Action:
-        return Action(False, cell, False)
+        return cell.occupy
 
     @staticmethod
     def new_ready() -> Action:
-        return Action(False, None, True)
+        return _READY
 
     @property
     def surrender(self) -> bool:
@@ -199,6 +484,10 @@ class Action:
                 f"{action})")
 
 
+_SURRENDER: Action = Action(True, None, False)
+_READY: Action = Action(False, None, True)
+
+
 class ActionQueue(ABC):
     @abstractmethod
     def player_id(self) -> PlayerID:
@@ -208,6 +497,13 @@ class ActionQueue(ABC):
     def pop(self) -> Optional[Action]:
         pass
 
+    def has_actions(self) -> bool:
+        """Returns `False` only if `pop` is known to return `None`.
+
+        The default implementation always returns `True`.
+        """
+        return True
+
 
 class DefaultActionQueue(ActionQueue):
     def __init__(self, player_id: PlayerID) -> None:
@@ -226,12 +522,161 @@ class DefaultActionQueue(ActionQueue):
         else:
             return self.actions.popleft()
 
+    def has_actions(self) -> bool:
+        return len(self.actions) > 0
+
     def __repr__(self) -> str:
         return (f"{type(self).__qualname__}("
                 f"player_id={self.__player_id},"
                 f"actions={self.actions})")
 
 
+class ValidatingActionQueue(DefaultActionQueue):
+    """A `DefaultActionQueue` for actions coming from outside the program, for example
+    from the network, which rejects actions `Logic` may not process in `state`.
+
+    Checks outside the queue are internal invariants made by `assert`s,
+    so a program whose untrusted actions enter only via `ValidatingActionQueue`s
+    may be run in the trusted mode, `python -O`, which strips the `assert`s from the hot path
+    but not the checks of this queue.
+    """
+
+    def __init__(self, player_id: PlayerID, state: State) -> None:
+        super().__init__(player_id)
+        self.__state: State = state
+
+    def add(self, action: Action) -> None:
+        """Raises `ValueError` if the queue already has an action, or if `action` is not valid,
+        see `Logic.is_valid`."""
+        if self.has_actions():
+            raise ValueError(f"{self.player_id()} already has an action queued")
+        if not Logic.is_valid(self.__state, self.player_id(), action):
+            raise ValueError(f"invalid action {action} of {self.player_id()}")
+        super().add(action)
+
+
+class ConcurrentActionQueue(ActionQueue):
+    """An `ActionQueue` to which producer threads, for example network threads of human
+    players, `add` actions while the thread advancing `Logic` consumes them.
+
+    Thread-safety contract:
+
+    * `add` may be called by any number of threads concurrently. Actions of each thread are
+      popped in the order the thread added them, actions of different threads are interleaved.
+    * `pop`, `pop_all`, `has_actions` and `wait` must be called by one consumer thread
+      at a time. `has_actions` and `wait` returning `True` guarantee that `pop` returns an action,
+      as only the consumer removes actions.
+    * `on_add`, if set, is called by the producer thread after each `add`,
+      for example `Scheduler.notify` of the match, which is thread-safe.
+
+    At most `capacity` actions are queued. `add` blocks while the queue is full, which slows
+    producers down to the pace of the consumer. The actions are stored in a `deque`, whose
+    `append` and `popleft` are atomic, so producers only share a lock with each other,
+    and the consumer takes it only to wake up blocked producers or to `wait`.
+    """
+
+    def __init__(self, player_id: PlayerID, capacity: int = 16):
+        assert capacity > 0, f"{capacity}"
+        self.__player_id: PlayerID = player_id
+        self.__capacity: int = capacity
+        self.__actions: deque[Action] = deque()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__not_full: threading.Condition = threading.Condition(self.__lock)
+        self.__not_empty: threading.Condition = threading.Condition(self.__lock)
+        self.__blocked_producers: int = 0
+        self.__consumer_waits: bool = False
+        self.on_add: Optional[Callable[[], None]] = None
+
+    def add(self, action: Action, timeout: Optional[float] = None) -> None:
+        """Adds `action`, waiting while the queue is full at most `timeout` seconds
+        if specified, and raises `queue.Full` if the queue is still full."""
+        with self.__lock:
+            if len(self.__actions) >= self.__capacity:
+                self.__wait_not_full(timeout)
+            self.__actions.append(action)
+            if self.__consumer_waits:
+                self.__not_empty.notify()
+        on_add = self.on_add
+        if on_add is not None:
+            on_add()
+
+    def __wait_not_full(self, timeout: Optional[float]) -> None:
+        # the consumer reads `__blocked_producers` after removing actions, so either it sees
+        # the increment and wakes the producer up, or the producer sees the removal
+        self.__blocked_producers += 1
+        try:
+            if not self.__not_full.wait_for(
+                    lambda: len(self.__actions) < self.__capacity, timeout):
+                raise queue.Full()
+        finally:
+            self.__blocked_producers -= 1
+
+    def player_id(self) -> PlayerID:
+        return self.__player_id
+
+    def pop(self) -> Optional[Action]:
+        if len(self.__actions) == 0:
+            return None
+        action = self.__actions.popleft()
+        if self.__blocked_producers > 0:
+            with self.__lock:
+                self.__not_full.notify()
+        return action
+
+    def pop_all(self) -> Sequence[Action]:
+        """Pops all actions added before the call."""
+        actions = [self.__actions.popleft() for _ in range(len(self.__actions))]
+        if self.__blocked_producers > 0:
+            with self.__lock:
+                self.__not_full.notify(len(actions))
+        return actions
+
+    def has_actions(self) -> bool:
+        return len(self.__actions) > 0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the queue has actions, at most `timeout` seconds if specified,
+        and returns `has_actions`."""
+        if len(self.__actions) > 0:
+            return True
+        with self.__lock:
+            self.__consumer_waits = True
+            try:
+                return self.__not_empty.wait_for(lambda: len(self.__actions) > 0, timeout)
+            finally:
+                self.__consumer_waits = False
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"player_id={self.__player_id},"
+                f"actions={list(self.__actions)})")
+
+
+UndoEntry = tuple[
+        PlayerID, Action, Phase, int, int, tuple[PlayerID, ...], tuple[int, ...],
+        tuple[tuple[Cell, Mark], ...]]
+"""The `PlayerID` and the `Action` made, `State.phase`, `round`, `step`, `required_ready`
+and `Player.wins` before the action, and the cells cleared by the action if it started a round."""
+
+
+class UndoStack:
+    """Changes made by `Logic.make`, which `Logic.unmake` reverts,
+    and actions reverted by `Logic.unmake`, which `Logic.redo` makes again.
+
+    An entry records only the parts of `State` an action may change, so that a searcher
+    may explore any number of positions on one `State` without copying it.
+    """
+
+    def __init__(self) -> None:
+        self.done: list[UndoEntry] = []
+        self.undone: list[tuple[PlayerID, Action]] = []
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"done={self.done},"
+                f"undone={self.undone})")
+
+
 class Logic:
     """Game logic."""
 
@@ -252,6 +697,115 @@ class Logic:
         else:
             assert False
 
+    def has_actions(self, awaited: Sequence[PlayerID]) -> bool:
+        """Returns `False` only if `advance` is known to have no actions to process,
+        given `awaited` returned by `Logic.awaited` for the current `State`."""
+        for player_id in awaited:
+            if self.__action_queues[player_id.idx].has_actions():
+                return True
+        return False
+
+    @staticmethod
+    def is_valid(state: State, player_id: PlayerID, action: Action) -> bool:
+        """Returns `True` iff `advance` may process `action` of the player with `player_id`
+        in `state`, provided that the player has no other unprocessed actions."""
+        if Logic.is_game_over(state):
+            return False
+        elif state.phase is Phase.BEGINNING \
+                or state.phase is Phase.OUTROUND:
+            return action.ready and player_id in state.required_ready
+        elif state.phase is Phase.INROUND:
+            if player_id != state.turn():
+                return False
+            elif action.occupy is not None:
+                return action.occupy.x < state.board.size() \
+                    and action.occupy.y < state.board.size() \
+                    and state.board.get(action.occupy) is None
+            else:
+                return action.surrender
+        else:
+            assert False
+
+    @staticmethod
+    def apply(state: State, player_id: PlayerID, action: Action) -> None:
+        """Processes `action` of the player with `player_id` in `state` like `make` does,
+        without recording the changes. `action` must be valid, see `is_valid`."""
+        Logic.__make(state, player_id, action, None)
+
+    @staticmethod
+    def make(state: State, player_id: PlayerID, action: Action, undo: UndoStack) -> None:
+        """Processes `action` of the player with `player_id` in `state` like `advance` does,
+        and records the changes in `undo`, so that `unmake` can revert them.
+        `action` must be valid, see `is_valid`. Forgets actions that `redo` could make."""
+        undo.undone.clear()
+        Logic.__make(state, player_id, action, undo)
+
+    @staticmethod
+    def unmake(state: State, undo: UndoStack) -> None:
+        """Reverts the last action made by `make` or `redo`."""
+        (player_id, action, phase, round_, step, required_ready, wins, cleared) = undo.done.pop()
+        if action.occupy is not None:
+            state.board.unset(action.occupy)
+        for (cell, mark) in cleared:
+            state.board.set(cell, mark)
+        for (player, player_wins) in zip(state.players, wins):
+            player.wins = player_wins
+        state.phase = phase
+        state.round = round_
+        state.step = step
+        state.required_ready.clear()
+        state.required_ready.update(required_ready)
+        undo.undone.append((player_id, action))
+
+    @staticmethod
+    def redo(state: State, undo: UndoStack) -> None:
+        """Makes the last action reverted by `unmake` again."""
+        (player_id, action) = undo.undone.pop()
+        Logic.__make(state, player_id, action, undo)
+
+    @staticmethod
+    def awaited(state: State) -> Sequence[PlayerID]:
+        """Returns `id`s of the players whose actions `advance` processes in `state`."""
+        if state.phase is Phase.BEGINNING \
+                or state.phase is Phase.OUTROUND:
+            return tuple(state.required_ready)
+        elif state.phase is Phase.INROUND:
+            return (state.turn(),)
+        else:
+            assert False
+
+    @staticmethod
+    def __make(state: State, player_id: PlayerID, action: Action,
+               undo: Optional[UndoStack]) -> None:
+        """Records the changes in `undo` unless it is `None`."""
+        assert Logic.is_valid(state, player_id, action), f"{player_id}, {action}"
+        if undo is not None:
+            cleared: tuple[tuple[Cell, Mark], ...] = ()
+            if action.ready and state.phase is Phase.OUTROUND and len(state.required_ready) == 1:
+                cleared = Logic.__occupied(state.board)
+            undo.done.append((
+                    player_id, action, state.phase, state.round, state.step,
+                    tuple(state.required_ready), tuple(player.wins for player in state.players),
+                    cleared))
+        if action.ready is True:
+            Logic.__ready(state, player_id)
+        elif action.surrender is True:
+            Logic.__surrender(state)
+        elif action.occupy is not None:
+            Logic.__occupy(state, action.occupy, Logic.is_win)
+        else:
+            assert False
+
+    @staticmethod
+    def __occupied(board: AbstractBoard) -> tuple[tuple[Cell, Mark], ...]:
+        occupied = []
+        for x in range(board.size()):
+            for y in range(board.size()):
+                mark = board.get(Cell(x, y))
+                if mark is not None:
+                    occupied.append((Cell(x, y), mark))
+        return tuple(occupied)
+
     def __advance_beginning_outround(self, state: State) -> None:
         for player_id in state.required_ready.copy():
             action = self.__action_queues[player_id.idx].pop()
@@ -274,17 +828,18 @@ class Logic:
                 if action.surrender is True:
                     Logic.__surrender(state)
                 elif action.occupy is not None:
-                    Logic.__occupy(state, action.occupy)
+                    Logic.__occupy(state, action.occupy, self.check_win)
                 else:
                     assert False
             if player_id != state.turn() or state.phase is not Phase.INROUND:
                 break
 
     @staticmethod
-    def __occupy(state: State, cell: Cell) -> None:
+    def __occupy(state: State, cell: Cell,
+                 is_win: Callable[[AbstractBoard, Cell], bool]) -> None:
         assert state.phase is Phase.INROUND
         state.board.set(cell, state.players[state.turn().idx].mark)
-        if Logic.is_win(state.board, cell):
+        if is_win(state.board, cell):
             Logic.__win(state)
         elif Logic.__last_step(state.step, state.board):
             Logic.__draw(state)
@@ -292,29 +847,16 @@ class Logic:
             state.step += 1
 
     @staticmethod
-    def is_win(board: Board, last_occupied: Cell) -> bool:
-        h_match = 0
-        v_match = 0
-        d1_match = 0
-        d2_match = 0
-        x = last_occupied.x
-        y = last_occupied.y
-        mark = board.get(last_occupied)
-        assert mark is not None
-        for i in range(board.size()):
-            if board.get(Cell(i, y)) == mark:
-                h_match += 1
-            if board.get(Cell(x, i)) == mark:
-                v_match += 1
-            if board.get((Cell(i, i))) == mark:
-                d1_match += 1
-            if board.get(Cell(i, board.size() - 1 - i)) == mark:
-                d2_match += 1
-        return (h_match == board.size() or v_match == board.size()
-                or d1_match == board.size() or d2_match == board.size())
+    def is_win(board: AbstractBoard, last_occupied: Cell) -> bool:
+        return board.is_win(last_occupied)
+
+    def check_win(self, board: AbstractBoard, last_occupied: Cell) -> bool:
+        """Returns `is_win(board, last_occupied)`, is called by `advance` for every occupied
+        cell, so that a subclass may observe the checks."""
+        return Logic.is_win(board, last_occupied)
 
     @staticmethod
-    def __last_step(step: int, board: Board) -> bool:
+    def __last_step(step: int, board: AbstractBoard) -> bool:
         return step == board.size() ** 2 - 1
 
     @staticmethod
@@ -381,7 +923,59 @@ class World:
             ai.act(self.__state)
         self.__logic.advance(self.__state)
 
+    @property
+    def state(self) -> State:
+        return self.__state
+
+    def run(self, max_logic_calls: Optional[int] = None) -> RunStats:
+        """Advances the game until it is over, until no action arrives,
+        or until `Logic` is advanced `max_logic_calls` times if specified.
+
+        Unlike calling `advance` in a loop, only the `AI`s of the players that `Logic` awaits
+        actions from are called, and `Logic` is advanced only if an action arrived.
+        Indexes in `ais` must correspond to indexes in `State.players`.
+        """
+        assert len(self.__ais) == len(self.__state.players), \
+            f"{len(self.__ais)}, {len(self.__state.players)}"
+        stats = RunStats(self.__state, len(self.__ais))
+        while not Logic.is_game_over(self.__state) \
+                and (max_logic_calls is None or stats.logic_calls < max_logic_calls):
+            awaited = Logic.awaited(self.__state)
+            for player_id in awaited:
+                self.__ais[player_id.idx].act(self.__state)
+            stats.ai_calls += len(awaited)
+            if not self.__logic.has_actions(awaited):
+                break
+            self.__logic.advance(self.__state)
+            stats.logic_calls += 1
+        return stats
+
     def __repr__(self) -> str:
         return (f"{type(self).__qualname__}("
                 f"state={self.__state},"
                 f"logic={self.__logic})")
+
+
+@eq
+class RunStats:
+    """Counts calls made by `World.run`.
+
+    `budget` is the number of calls made by the loop calling `World.advance`
+    `(board.size() ** 2 + 1) * rounds` times, which is enough to finish any game.
+    """
+
+    def __init__(self, state: State, ai_count: int):
+        self.ai_calls: int = 0
+        self.logic_calls: int = 0
+        self.budget: int = (state.board.size() ** 2 + 1) * state.rounds * (ai_count + 1)
+
+    def avoided_calls(self) -> int:
+        """Returns the number of `AI.act` and `Logic.advance` calls avoided compared with `budget`,
+        all of which are idle polls."""
+        return self.budget - self.ai_calls - self.logic_calls
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"ai_calls={self.ai_calls},"
+                f"logic_calls={self.logic_calls},"
+                f"budget={self.budget})")
@@ -0,0 +1,230 @@
+"""Opt-in instrumentation of a game: timings of hot-path calls and counters of empty polls.
+
+Instrumentation wraps the parts of a `World` instead of adding checks to them,
+so a game which is not instrumented runs exactly the same code as before.
+Wrappers only time and count calls and delegate them, so they do not change game results.
+Use `instrumented_world` to instrument all parts at once.
+
+| timing                            | what is timed                                     |
+|-----------------------------------|---------------------------------------------------|
+| `World.advance`, `World.run`      | the calls                                         |
+| `AI.act`                          | calls of every `AI`                               |
+| `ActionQueue.pop`                 | calls of every `ActionQueue` given to `Logic`     |
+| `Logic.advance_inround`           | `Logic.advance` in `INROUND`                      |
+| `Logic.advance_beginning_outround`| `Logic.advance` in `BEGINNING` and `OUTROUND`     |
+| `Logic.is_win`                    | `Logic.check_win`, which `Logic.advance` calls    |
+
+The counter `ActionQueue.pop empty` counts `pop`s which returned `None`, and the counter
+`AI.act idle` counts `act`s after which the `ActionQueue` of the player has no actions.
+"""
+from __future__ import annotations
+import copy
+import os
+import sys
+from collections.abc import Mapping, Sequence
+from time import perf_counter_ns
+from typing import Optional, TextIO
+from yo1k.tic_tac_toe.game import (
+    AI, AbstractBoard, Action, ActionQueue, Cell, Logic, Phase, PlayerID, RunStats, State,
+    World)
+from yo1k.tic_tac_toe.util import eq
+
+
+@eq
+class Timing:
+    """Durations of calls of one kind in nanoseconds."""
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+
+    def add(self, ns: int) -> None:
+        self.calls += 1
+        self.total_ns += ns
+        self.max_ns = max(self.max_ns, ns)
+
+    def mean_ns(self) -> float:
+        return self.total_ns / self.calls if self.calls > 0 else 0
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"calls={self.calls},"
+                f"total_ns={self.total_ns},"
+                f"max_ns={self.max_ns})")
+
+
+@eq
+class Snapshot:
+    """Copies of `Metrics.timings` and `Metrics.counters` at a moment."""
+
+    def __init__(self, timings: Mapping[str, Timing], counters: Mapping[str, int]):
+        self.timings: Mapping[str, Timing] = timings
+        self.counters: Mapping[str, int] = counters
+
+    def summary(self) -> str:
+        lines = [f"{name:<34} {timing.calls:>12,} calls {timing.mean_ns():>12,.0f} ns/call "
+                 f"{timing.max_ns:>12,} ns max {timing.total_ns / 1e9:>10,.3f} s"
+                 for (name, timing) in sorted(self.timings.items())]
+        lines.extend(f"{name:<34} {count:>12,}" for (name, count) in sorted(self.counters.items()))
+        return os.linesep.join(lines)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"timings={self.timings},"
+                f"counters={self.counters})")
+
+
+class Metrics:
+    """Timings and counters recorded by the instrumented parts of games.
+
+    If `dump_interval_ns` is specified, `tick`, which `InstrumentedWorld` calls after every
+    `advance`, writes `Snapshot.summary` to `file` whenever the interval has elapsed.
+    Is not thread-safe.
+    """
+
+    def __init__(self, dump_interval_ns: Optional[int] = None, file: TextIO = sys.stderr):
+        self.timings: dict[str, Timing] = {}
+        self.counters: dict[str, int] = {}
+        self.__dump_interval_ns: Optional[int] = dump_interval_ns
+        self.__file: TextIO = file
+        self.__last_dump_ns: int = perf_counter_ns()
+
+    def time(self, name: str, ns: int) -> None:
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = Timing()
+            self.timings[name] = timing
+        timing.add(ns)
+
+    def count(self, name: str) -> None:
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    def snapshot(self) -> Snapshot:
+        return Snapshot(
+                dict((name, copy.copy(timing)) for (name, timing) in self.timings.items()),
+                dict(self.counters))
+
+    def tick(self) -> None:
+        if self.__dump_interval_ns is None:
+            return
+        now = perf_counter_ns()
+        if now - self.__last_dump_ns >= self.__dump_interval_ns:
+            self.__last_dump_ns = now
+            self.dump()
+
+    def dump(self) -> None:
+        print(self.snapshot().summary(), end=os.linesep + os.linesep, file=self.__file)
+
+    def reset(self) -> None:
+        self.timings.clear()
+        self.counters.clear()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"timings={self.timings},"
+                f"counters={self.counters},"
+                f"dump_interval_ns={self.__dump_interval_ns})")
+
+
+class InstrumentedActionQueue(ActionQueue):
+    def __init__(self, action_queue: ActionQueue, metrics: Metrics):
+        self.__action_queue: ActionQueue = action_queue
+        self.__metrics: Metrics = metrics
+
+    def player_id(self) -> PlayerID:
+        return self.__action_queue.player_id()
+
+    def pop(self) -> Optional[Action]:
+        start = perf_counter_ns()
+        action = self.__action_queue.pop()
+        self.__metrics.time("ActionQueue.pop", perf_counter_ns() - start)
+        if action is None:
+            self.__metrics.count("ActionQueue.pop empty")
+        return action
+
+    def has_actions(self) -> bool:
+        return self.__action_queue.has_actions()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"action_queue={self.__action_queue})")
+
+
+class InstrumentedAI(AI):
+    """Times `act` of `ai`, which adds actions of its player to `action_queue`."""
+
+    def __init__(self, ai: AI, action_queue: ActionQueue, metrics: Metrics):
+        self.__ai: AI = ai
+        self.__action_queue: ActionQueue = action_queue
+        self.__metrics: Metrics = metrics
+
+    def act(self, state: State) -> None:
+        start = perf_counter_ns()
+        self.__ai.act(state)
+        self.__metrics.time("AI.act", perf_counter_ns() - start)
+        if not self.__action_queue.has_actions():
+            self.__metrics.count("AI.act idle")
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"ai={self.__ai},"
+                f"action_queue={self.__action_queue})")
+
+
+class InstrumentedLogic(Logic):
+    """Times `advance` by the phase it processes and `check_win`."""
+
+    def __init__(self, action_queues: Sequence[ActionQueue], metrics: Metrics):
+        super().__init__(action_queues)
+        self.__metrics: Metrics = metrics
+
+    def advance(self, state: State) -> None:
+        name = "Logic.advance_inround" if state.phase is Phase.INROUND \
+            else "Logic.advance_beginning_outround"
+        start = perf_counter_ns()
+        super().advance(state)
+        self.__metrics.time(name, perf_counter_ns() - start)
+
+    def check_win(self, board: AbstractBoard, last_occupied: Cell) -> bool:
+        start = perf_counter_ns()
+        win = super().check_win(board, last_occupied)
+        self.__metrics.time("Logic.is_win", perf_counter_ns() - start)
+        return win
+
+
+class InstrumentedWorld(World):
+    def __init__(self, state: State, logic: Logic, ais: Sequence[AI], metrics: Metrics):
+        super().__init__(state, logic, ais)
+        self.__metrics: Metrics = metrics
+
+    def advance(self) -> None:
+        start = perf_counter_ns()
+        super().advance()
+        self.__metrics.time("World.advance", perf_counter_ns() - start)
+        self.__metrics.tick()
+
+    def run(self, max_logic_calls: Optional[int] = None) -> RunStats:
+        start = perf_counter_ns()
+        stats = super().run(max_logic_calls)
+        self.__metrics.time("World.run", perf_counter_ns() - start)
+        self.__metrics.tick()
+        return stats
+
+
+def instrumented_world(
+        state: State,
+        action_queues: Sequence[ActionQueue],
+        ais: Sequence[AI],
+        metrics: Metrics) -> World:
+    """Returns a `World` like `World(state, Logic(action_queues), ais)` with all parts
+    instrumented. Indexes in `ais` must correspond to indexes in `action_queues`."""
+    assert len(ais) <= len(action_queues), f"{len(ais)}, {len(action_queues)}"
+    return InstrumentedWorld(
+            state,
+            InstrumentedLogic(
+                    tuple(InstrumentedActionQueue(action_queue, metrics)
+                          for action_queue in action_queues),
+                    metrics),
+            tuple(InstrumentedAI(ai, action_queues[idx], metrics) for (idx, ai) in enumerate(ais)),
+            metrics)
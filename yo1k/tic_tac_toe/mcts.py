@@ -0,0 +1,211 @@
+"""Monte Carlo tree search for boards of any size, where exhaustive search is infeasible.
+
+Playouts are made on a flat list of cell values indexed by `x * size + y`,
+where `0` is an empty cell and other values are as returned by `position.value`,
+which is copied from the `State.board` once per search.
+"""
+from __future__ import annotations
+from collections.abc import Hashable, MutableSequence, Sequence
+from concurrent.futures import Executor
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+from typing import Optional
+from yo1k.tic_tac_toe import position
+from yo1k.tic_tac_toe.ai import OccupyingAI
+from yo1k.tic_tac_toe.game import AI, AbstractBoard, Cell, DefaultActionQueue, PlayerID, State
+
+_EXPLORATION: float = sqrt(2)
+
+
+class _Node:
+    """A node of the search tree reached by `mark` occupying the cell `idx`.
+
+    `score` is the sum of playout outcomes from the point of view of `mark`:
+    `1` for a win, `0.5` for a draw and `0` for a loss.
+    `outcome` is the outcome of the move if it ends the round.
+    """
+
+    __slots__ = ("parent", "idx", "mark", "children", "untried", "visits", "score", "outcome")
+
+    def __init__(
+            self,
+            parent: Optional[_Node],
+            idx: int,
+            mark: int,
+            untried: MutableSequence[int],
+            outcome: Optional[float]):
+        self.parent: Optional[_Node] = parent
+        self.idx: int = idx
+        self.mark: int = mark
+        self.children: list[_Node] = []
+        self.untried: MutableSequence[int] = untried
+        self.visits: int = 0
+        self.score: float = 0
+        self.outcome: Optional[float] = outcome
+
+    def select(self) -> _Node:
+        """Returns the child with the maximal UCT value."""
+        log_visits = log(self.visits)
+        best_child = self.children[0]
+        best_uct = -1.0
+        for child in self.children:
+            uct = child.score / child.visits + _EXPLORATION * sqrt(log_visits / child.visits)
+            if uct > best_uct:
+                best_child = child
+                best_uct = uct
+        return best_child
+
+
+def search(
+        cells: Sequence[int],
+        size: int,
+        win_length: int,
+        mark: int,
+        seed: int,
+        playouts: Optional[int] = None,
+        seconds: Optional[float] = None) -> tuple[dict[int, int], int]:
+    """Searches for a move of the player with the `mark` in the non-terminal position `cells`
+    using UCT until `playouts` are made or `seconds` elapse, whichever comes first.
+
+    Returns the number of visits of each move by its cell index, and the number of playouts made.
+    Is a module-level function so that it may be run in a process pool.
+    """
+    assert playouts is not None or seconds is not None
+    rng = Random(seed)
+    empty = [idx for (idx, v) in enumerate(cells) if v == 0]
+    assert len(empty) > 0
+    root = _Node(None, -1, position.other(mark), empty, None)
+    deadline = None if seconds is None else perf_counter() + seconds
+    made = 0
+    while (playouts is None or made < playouts) \
+            and (deadline is None or made == 0 or perf_counter() < deadline):
+        board = list(cells)
+        node = root
+        while len(node.untried) == 0 and node.outcome is None:
+            node = node.select()
+            board[node.idx] = node.mark
+        if node.outcome is None:
+            node = _expand(node, board, size, win_length, rng)
+        outcome = node.outcome if node.outcome is not None \
+            else _playout(board, size, win_length, position.other(node.mark), node.mark, rng)
+        visited: Optional[_Node] = node
+        while visited is not None:
+            visited.visits += 1
+            visited.score += outcome
+            outcome = 1 - outcome
+            visited = visited.parent
+        made += 1
+    return dict((child.idx, child.visits) for child in root.children), made
+
+
+def _expand(node: _Node, board: list[int], size: int, win_length: int, rng: Random) -> _Node:
+    untried = node.untried
+    pick = rng.randrange(len(untried))
+    (untried[pick], untried[-1]) = (untried[-1], untried[pick])
+    idx = untried.pop()
+    mark = position.other(node.mark)
+    board[idx] = mark
+    empty = [i for (i, v) in enumerate(board) if v == 0]
+    if position.is_win_run(board, size, win_length, idx):
+        outcome: Optional[float] = 1
+    elif len(empty) == 0:
+        outcome = 0.5
+    else:
+        outcome = None
+    child = _Node(node, idx, mark, empty if outcome is None else [], outcome)
+    node.children.append(child)
+    return child
+
+
+def _playout(board: list[int], size: int, win_length: int, mark: int, last_mark: int,
+             rng: Random) -> float:
+    """Plays random moves starting with the player with the `mark` to the end of the round,
+    and returns its outcome for the player with the `last_mark`."""
+    empty = [idx for (idx, v) in enumerate(board) if v == 0]
+    rng.shuffle(empty)
+    for idx in empty:
+        board[idx] = mark
+        if position.is_win_run(board, size, win_length, idx):
+            return 1 if mark == last_mark else 0
+        mark = position.other(mark)
+    return 0.5
+
+
+class MctsAI(OccupyingAI):
+    """Chooses the most visited move found by `search` within a budget of `playouts` per move,
+    `seconds` per move, or both.
+
+    Given an `executor`, runs `workers` independent searches with different seeds in it
+    and sums up visits of their root moves (root parallelism). Each search makes
+    `playouts // workers` playouts and is limited to `seconds`.
+    A `ProcessPoolExecutor` scales with CPUs, a `ThreadPoolExecutor` does not because of the GIL.
+    """
+
+    def __init__(
+            self,
+            player_id: PlayerID,
+            seed: int,
+            action_queue: DefaultActionQueue,
+            playouts: Optional[int] = 1_000,
+            seconds: Optional[float] = None,
+            executor: Optional[Executor] = None,
+            workers: int = 1):
+        super().__init__(player_id, action_queue)
+        assert playouts is not None or seconds is not None
+        assert executor is not None or workers == 1, f"{workers}"
+        assert playouts is None or playouts >= workers, f"{playouts}, {workers}"
+        self.__rng: Random = Random(seed)
+        self.__playouts: Optional[int] = playouts
+        self.__seconds: Optional[float] = seconds
+        self.__executor: Optional[Executor] = executor
+        self.__workers: int = workers
+        self.playouts: int = 0
+        self.search_seconds: float = 0
+
+    def choose(self, state: State) -> Cell:
+        board = state.board
+        size = board.size()
+        cells = [position.value(board.get(Cell(x, y))) for x in range(size) for y in range(size)]
+        mark = position.value(state.players[self.player_id.idx].mark)
+        start = perf_counter()
+        visits = self.__search(cells, board, mark)
+        self.search_seconds += perf_counter() - start
+        best_idx = max(sorted(visits), key=visits.__getitem__)
+        return Cell(best_idx // size, best_idx % size)
+
+    def settings(self) -> Hashable:
+        return self.__playouts, self.__seconds, self.__workers
+
+    def playouts_per_sec(self) -> float:
+        """Returns the number of playouts per second of search time so far."""
+        return self.playouts / self.search_seconds if self.search_seconds > 0 else 0
+
+    def __search(self, cells: Sequence[int], board: AbstractBoard, mark: int) -> dict[int, int]:
+        playouts = None if self.__playouts is None else self.__playouts // self.__workers
+        seeds = [self.__rng.getrandbits(64) for _ in range(self.__workers)]
+        if self.__executor is None:
+            results = [search(cells, board.size(), board.win_length(), mark, seeds[0],
+                              playouts, self.__seconds)]
+        else:
+            futures = [self.__executor.submit(search, cells, board.size(), board.win_length(),
+                                              mark, seed, playouts, self.__seconds)
+                       for seed in seeds]
+            results = [future.result() for future in futures]
+        visits: dict[int, int] = {}
+        for (result_visits, made) in results:
+            self.playouts += made
+            for (idx, count) in result_visits.items():
+                visits[idx] = visits.get(idx, 0) + count
+        return visits
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"player_id={self.player_id},"
+                f"action_queue={self.action_queue},"
+                f"playouts={self.playouts},"
+                f"search_seconds={self.search_seconds})")
+
+
+def new_mcts_ai(player_id: PlayerID, seed: int, action_queue: DefaultActionQueue) -> AI:
+    return MctsAI(player_id, seed, action_queue)
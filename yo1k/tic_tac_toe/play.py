@@ -0,0 +1,73 @@
+"""Plays a game between two `AI`s and prints the board at the end of each round.
+
+Run `python -m yo1k.tic_tac_toe play --help` for the command-line usage.
+"""
+from __future__ import annotations
+import argparse
+import os
+from collections.abc import Sequence
+from typing import Optional
+from yo1k.tic_tac_toe.game import (
+    AbstractBoard, Board, Cell, DefaultActionQueue, Logic, Mark, Phase, Player, PlayerID, State,
+    World)
+from yo1k.tic_tac_toe.registry import AIS
+
+
+def render(board: AbstractBoard) -> str:
+    """Returns rows of `board`, one per `x`, where empty cells are `.`."""
+    size = board.size()
+    rows = []
+    for x in range(size):
+        marks = (board.get(Cell(x, y)) for y in range(size))
+        rows.append(" ".join("." if mark is None else mark.name for mark in marks))
+    return os.linesep.join(rows)
+
+
+def play(
+        ai_names: Sequence[str],
+        rounds: int = State.default_rounds(),
+        seed: int = 0,
+        size: int = AbstractBoard.const_size(),
+        win_length: Optional[int] = None) -> Sequence[str]:
+    """Plays a game between `AI`s named `ai_names` in `AIS` and returns the outcome
+    and the final board of each round."""
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+    state = State(rounds=rounds, players=players, board=Board(size=size, win_length=win_length))
+    world = World(
+            state,
+            Logic(action_queues),
+            tuple(AIS[name](player.id, seed + player.id.idx, action_queue)
+                  for (name, player, action_queue) in zip(ai_names, players, action_queues)))
+    rounds_played: list[str] = []
+    wins = [0] * len(players)
+    while not Logic.is_game_over(state):
+        world.run(1)
+        if state.phase is Phase.OUTROUND and len(rounds_played) == state.round:
+            winners = [player for player in players if player.wins > wins[player.id.idx]]
+            wins = [player.wins for player in players]
+            outcome = "draw" if len(winners) == 0 \
+                else f"{ai_names[winners[0].id.idx]} ({winners[0].mark.name}) wins"
+            rounds_played.append(
+                    f"round {state.round + 1}: {outcome}{os.linesep}{render(state.board)}")
+    return rounds_played
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+            prog="python -m yo1k.tic_tac_toe play",
+            description="Plays a game between two AIs and prints the board after each round.")
+    parser.add_argument(
+            "ai_x", nargs="?", default="random", choices=AIS.keys(),
+            help="the AI playing for X, defaults to random")
+    parser.add_argument(
+            "ai_o", nargs="?", default="random", choices=AIS.keys(),
+            help="the AI playing for O, defaults to random")
+    parser.add_argument("--rounds", type=int, default=State.default_rounds())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=AbstractBoard.const_size())
+    parser.add_argument("--win-length", type=int, default=None, help="defaults to SIZE")
+    args = parser.parse_args(argv)
+    for round_played in play(
+            (args.ai_x, args.ai_o), args.rounds, args.seed, args.size, args.win_length):
+        print(round_played, end=os.linesep + os.linesep)
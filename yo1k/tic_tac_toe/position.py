@@ -0,0 +1,138 @@
+"""A compact representation of a board position for searching `AI`s.
+
+A position is a mutable sequence of `size ** 2` cell values indexed by `idx_of(cell)`,
+where `0` is an empty cell, `1` is `Mark.X` and `2` is `Mark.O`.
+"""
+from __future__ import annotations
+from collections.abc import MutableSequence, Sequence
+from functools import cache
+from typing import Optional
+from yo1k.tic_tac_toe.game import AbstractBoard, Cell, Mark
+
+Position = MutableSequence[int]
+
+_SIZE: int = AbstractBoard.const_size()
+_POWERS: Sequence[int] = tuple(3 ** i for i in range(_SIZE ** 2))
+
+
+@cache
+def symmetries(size: int) -> Sequence[Sequence[int]]:
+    """Returns the 8 rotations and reflections of a board of `size`, each as a permutation
+    of cell indexes `x * size + y`, see `SYMMETRIES`."""
+    symmetries_ = []
+    for reflections in range(2):
+        for rotations in range(4):
+            permutation = []
+            for x in range(size):
+                for y in range(size):
+                    (tx, ty) = (y, x) if reflections == 1 else (x, y)
+                    for _ in range(rotations):
+                        (tx, ty) = (ty, size - 1 - tx)
+                    permutation.append(tx * size + ty)
+            symmetries_.append(tuple(permutation))
+    return tuple(symmetries_)
+
+
+def _lines_by_idx() -> Sequence[Sequence[Sequence[int]]]:
+    """Returns cell indexes of all lines going through a cell, indexed by `idx_of(cell)`."""
+    lines = [[x * _SIZE + y for y in range(_SIZE)] for x in range(_SIZE)]
+    lines += [[x * _SIZE + y for x in range(_SIZE)] for y in range(_SIZE)]
+    lines.append([i * _SIZE + i for i in range(_SIZE)])
+    lines.append([i * _SIZE + _SIZE - 1 - i for i in range(_SIZE)])
+    return tuple(
+            tuple(tuple(line) for line in lines if idx in line) for idx in range(_SIZE ** 2))
+
+
+SYMMETRIES: Sequence[Sequence[int]] = symmetries(_SIZE)
+"""Permutations of cell indexes: the cell `i` is moved to `SYMMETRIES[k][i]` by the `k`-th
+transformation. `SYMMETRIES[0]` is the identity."""
+_LINES_BY_IDX: Sequence[Sequence[Sequence[int]]] = _lines_by_idx()
+_DIRECTIONS: Sequence[tuple[int, int]] = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+def idx_of(cell: Cell) -> int:
+    return cell.x * _SIZE + cell.y
+
+
+def cell_at(idx: int) -> Cell:
+    return Cell(idx // _SIZE, idx % _SIZE)
+
+
+def value(mark: Optional[Mark]) -> int:
+    if mark is None:
+        return 0
+    elif mark is Mark.X:
+        return 1
+    elif mark is Mark.O:
+        return 2
+    else:
+        assert False
+
+
+def other(value_: int) -> int:
+    """Returns the value of the mark of the opponent of the player with the mark `value_`."""
+    assert value_ in (1, 2), f"{value_}"
+    return 3 - value_
+
+
+def from_board(board: AbstractBoard) -> Position:
+    assert board.size() == _SIZE, f"{board.size()}, {_SIZE}"
+    assert board.win_length() == _SIZE, f"{board.win_length()}, {_SIZE}"
+    return [value(board.get(Cell(x, y))) for x in range(_SIZE) for y in range(_SIZE)]
+
+
+def key(position: Sequence[int]) -> int:
+    """Returns the base-3 number whose `i`-th digit is `position[i]`."""
+    return sum(v * p for (v, p) in zip(position, _POWERS))
+
+
+def canonical_key(position: Sequence[int]) -> int:
+    """Returns the minimal `key` among all `SYMMETRIES` of `position`,
+    which is the same for positions that are rotations or reflections of each other."""
+    return min(
+            sum(position[i] * _POWERS[permutation[i]] for i in range(len(position)))
+            for permutation in SYMMETRIES)
+
+
+def canonical(position: Sequence[int]) -> tuple[Position, int]:
+    """Returns the least image of `position` under `SYMMETRIES`, which is the same for positions
+    that are rotations or reflections of each other, and the least index `k` of `SYMMETRIES`
+    which maps `position` to it, like `position_cache.canonical` does."""
+    least: Optional[list[int]] = None
+    least_k = 0
+    for (k, permutation) in enumerate(SYMMETRIES):
+        image = [0] * len(position)
+        for (idx, value_) in enumerate(position):
+            image[permutation[idx]] = value_
+        if least is None or image < least:
+            (least, least_k) = (image, k)
+    assert least is not None
+    return least, least_k
+
+
+def is_win(position: Sequence[int], last_occupied: int) -> bool:
+    """Returns `True` iff the cell `last_occupied` completes a line of equal marks."""
+    mark = position[last_occupied]
+    assert mark != 0
+    for line in _LINES_BY_IDX[last_occupied]:
+        if all(position[i] == mark for i in line):
+            return True
+    return False
+
+
+def is_win_run(cells: Sequence[int], size: int, win_length: int, idx: int) -> bool:
+    """Like `is_win`, but for cell values of a board of any `size` indexed by `x * size + y`:
+    returns `True` iff the occupied cell `idx` completes a line of `win_length` equal values."""
+    value_ = cells[idx]
+    (x, y) = divmod(idx, size)
+    for (dx, dy) in _DIRECTIONS:
+        run = 1
+        for sign in (1, -1):
+            (i, j) = (x + sign * dx, y + sign * dy)
+            while run < win_length and 0 <= i < size and 0 <= j < size \
+                    and cells[i * size + j] == value_:
+                run += 1
+                (i, j) = (i + sign * dx, j + sign * dy)
+        if run == win_length:
+            return True
+    return False
@@ -0,0 +1,192 @@
+"""A cache of results of evaluating board positions, shared by positions which are rotations
+or reflections of each other.
+
+`canonical` maps a board to the least of its 8 images under `position.symmetries`,
+gathering cells with `operator.itemgetter`s precomputed for each size of boards,
+and returns the symmetry which maps the board to its canonical image. A result which refers
+to cells, such as a move, is stored for the canonical image by `cached_cell` and mapped back
+through the symmetry of each board it is looked up for. `PositionCache` evicts the least
+recently used results and counts hits and misses.
+
+`CachedAI` caches the choices of any `OccupyingAI`, which must choose equivalent cells
+for symmetric boards to choose the same cells as the `OccupyingAI` does. `MinimaxAI` does so
+by choosing in the coordinates of `position.canonical`, which maps a board by the same symmetry
+as `canonical` does. Choices of randomized `AI`s such as `MctsAI`
+would be reused rather than drawn again, and a cache which outlives a game would make
+the moves of seeded games depend on the games played before, so each game of a tournament
+must have its own cache.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
+from functools import cache
+from operator import itemgetter
+from typing import Generic, Optional, TypeVar
+from yo1k.tic_tac_toe import position
+from yo1k.tic_tac_toe.ai import OccupyingAI
+from yo1k.tic_tac_toe.game import AbstractBoard, Cell, State
+
+V = TypeVar("V")
+
+_Gather = Callable[[Sequence[int]], tuple[int, ...]]
+
+
+@cache
+def _gathers(size: int) -> Sequence[_Gather]:
+    """Returns a function for each of `position.symmetries(size)`, which returns
+    the image of a position under the symmetry."""
+    gathers: list[_Gather] = []
+    for permutation in position.symmetries(size):
+        inverse = [0] * len(permutation)
+        for (idx, image_idx) in enumerate(permutation):
+            inverse[image_idx] = idx
+        if len(inverse) == 1:
+            gathers.append(lambda cells: (cells[0],))
+        else:
+            gathers.append(itemgetter(*inverse))
+    return tuple(gathers)
+
+
+def cells_of(board: AbstractBoard) -> list[int]:
+    """Returns the `position.value`s of the cells of `board` indexed by `x * size + y`."""
+    size = board.size()
+    return [position.value(board.get(Cell(x, y))) for x in range(size) for y in range(size)]
+
+
+def canonical(cells: Sequence[int], size: int, symmetric: bool = True) -> tuple[bytes, int]:
+    """Returns the least image of the position `cells` of a board of `size`, which is the same
+    for positions that are rotations or reflections of each other, and the index `k` of
+    `position.symmetries(size)` which maps `cells` to it.
+
+    Returns `cells` themselves and `0` if not `symmetric`.
+    """
+    if not symmetric:
+        return bytes(cells), 0
+    least: Optional[tuple[int, ...]] = None
+    least_k = 0
+    for (k, gather) in enumerate(_gathers(size)):
+        image = gather(cells)
+        if least is None or image < least:
+            (least, least_k) = (image, k)
+    assert least is not None
+    return bytes(least), least_k
+
+
+class PositionCache(Generic[V]):
+    """Maps keys of positions to values, evicting the least recently used value
+    once there are `capacity` values. Is not thread-safe."""
+
+    def __init__(self, capacity: int = 100_000, symmetric: bool = True):
+        """Keys made by `key` are `canonical` iff `symmetric`."""
+        assert capacity > 0, f"{capacity}"
+        self.__capacity: int = capacity
+        self.__symmetric: bool = symmetric
+        self.__values: OrderedDict[Hashable, V] = OrderedDict()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+
+    def key(self, evaluator: Hashable, board: AbstractBoard, mark: int) \
+            -> tuple[Hashable, int]:
+        """Returns the key of the result of `evaluator` for `board` and the player with
+        the `position.value` `mark`, and the index of the symmetry used by `canonical`."""
+        size = board.size()
+        (image, k) = canonical(cells_of(board), size, self.__symmetric)
+        return (evaluator, size, board.win_length(), mark, image), k
+
+    def get(self, key: Hashable) -> Optional[V]:
+        value = self.__values.get(key)
+        if value is None:
+            self.__misses += 1
+        else:
+            self.__hits += 1
+            self.__values.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        self.__values[key] = value
+        self.__values.move_to_end(key)
+        if len(self.__values) > self.__capacity:
+            self.__values.popitem(last=False)
+            self.__evictions += 1
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
+
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
+
+    def hit_rate(self) -> float:
+        return self.__hits / max(self.__hits + self.__misses, 1)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"capacity={self.__capacity},"
+                f"symmetric={self.__symmetric},"
+                f"size={len(self.__values)},"
+                f"hits={self.__hits},"
+                f"misses={self.__misses},"
+                f"evictions={self.__evictions})")
+
+
+def cached_value(cache_: PositionCache[V], evaluator: Hashable, board: AbstractBoard, mark: int,
+                 evaluate: Callable[[], V]) -> V:
+    """Returns the cached result of `evaluate` for `board` and the player with the
+    `position.value` `mark`, which must be the same for symmetric boards, such as a score."""
+    (key, _) = cache_.key(evaluator, board, mark)
+    value = cache_.get(key)
+    if value is None:
+        value = evaluate()
+        cache_.put(key, value)
+    return value
+
+
+def cached_cell(cache_: PositionCache[int], evaluator: Hashable, board: AbstractBoard, mark: int,
+                choose: Callable[[], Cell]) -> Cell:
+    """Returns the cell chosen by `choose` for `board` and the player with the
+    `position.value` `mark`, or the image of the cell cached for a symmetric board."""
+    (key, k) = cache_.key(evaluator, board, mark)
+    size = board.size()
+    permutation = position.symmetries(size)[k]
+    image_idx = cache_.get(key)
+    if image_idx is None:
+        cell = choose()
+        cache_.put(key, permutation[cell.x * size + cell.y])
+        return cell
+    idx = permutation.index(image_idx)
+    return Cell(idx // size, idx % size)
+
+
+class CachedAI(OccupyingAI):
+    """Occupies the cells chosen by `ai`, which are cached in `cache_` for the positions
+    `ai` was asked about and the positions symmetric to them."""
+
+    def __init__(self, ai: OccupyingAI, cache_: PositionCache[int]):
+        super().__init__(ai.player_id, ai.action_queue)
+        self.__ai: OccupyingAI = ai
+        self.__cache: PositionCache[int] = cache_
+        self.__evaluator: Hashable = (type(ai).__qualname__, ai.settings())
+
+    def choose(self, state: State) -> Cell:
+        mark = position.value(state.players[self.player_id.idx].mark)
+        return cached_cell(
+                self.__cache, self.__evaluator, state.board, mark,
+                lambda: self.__ai.choose(state))
+
+    @property
+    def cache(self) -> PositionCache[int]:
+        return self.__cache
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"ai={self.__ai},"
+                f"cache={self.__cache})")
@@ -0,0 +1,118 @@
+"""The network protocol of `server` and `client`.
+
+Messages are JSON objects, one per line encoded in UTF-8.
+A client sends actions:
+`{"action": "ready"}`, `{"action": "surrender"}`, `{"action": "occupy", "x": 1, "y": 2}`.
+The server sends `{"type": "state", "player": IDX, "state": STATE}` to every player of a match
+whenever the `State` of the match changes, where `IDX` is the index of the receiving player
+in `State.players`, and `{"type": "error", "reason": REASON}` when it rejects an action.
+"""
+from __future__ import annotations
+import json
+from collections.abc import Mapping
+from typing import Any, Optional
+from yo1k.tic_tac_toe.game import (
+    Action,
+    AbstractBoard,
+    Board,
+    Cell,
+    Mark,
+    Phase,
+    Player,
+    PlayerID,
+    State)
+
+
+def encode_state(state: State, player_id: PlayerID) -> bytes:
+    size = state.board.size()
+    return _encode({
+            "type": "state",
+            "player": player_id.idx,
+            "state": {
+                    "rounds": state.rounds,
+                    "players": [{"mark": player.mark.name, "wins": player.wins}
+                                for player in state.players],
+                    "board": [[_encode_mark(state.board.get(Cell(x, y))) for y in range(size)]
+                              for x in range(size)],
+                    "win_length": state.board.win_length(),
+                    "phase": state.phase.name,
+                    "round": state.round,
+                    "step": state.step,
+                    "required_ready": sorted(player_id.idx for player_id in state.required_ready)}})
+
+
+def encode_error(reason: str) -> bytes:
+    return _encode({"type": "error", "reason": reason})
+
+
+def decode_state(message: Mapping[str, Any]) -> State:
+    """Decodes `message["state"]` of a message of the `"state"` type,
+    which must have been encoded by `encode_state`."""
+    encoded = message["state"]
+    players = []
+    for (idx, encoded_player) in enumerate(encoded["players"]):
+        player = Player(PlayerID(idx), Mark[encoded_player["mark"]])
+        player.wins = encoded_player["wins"]
+        players.append(player)
+    return State(
+            rounds=encoded["rounds"],
+            players=tuple(players),
+            board=Board([[None if mark is None else Mark[mark] for mark in row]
+                         for row in encoded["board"]],
+                        win_length=encoded["win_length"]),
+            phase=Phase[encoded["phase"]],
+            round_=encoded["round"],
+            step=encoded["step"],
+            required_ready=set(PlayerID(idx) for idx in encoded["required_ready"]))
+
+
+def encode_action(action: Action) -> bytes:
+    if action.ready:
+        return _encode({"action": "ready"})
+    elif action.surrender:
+        return _encode({"action": "surrender"})
+    elif action.occupy is not None:
+        return _encode({"action": "occupy", "x": action.occupy.x, "y": action.occupy.y})
+    else:
+        assert False
+
+
+def decode_action(line: bytes) -> Optional[Action]:
+    """Returns `None` if `line` is not a well-formed action message.
+    Unlike other functions in this module, may be given untrusted input."""
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(message, dict):
+        return None
+    kind = message.get("action")
+    if kind == "ready":
+        return Action.new_ready()
+    elif kind == "surrender":
+        return Action.new_surrender()
+    elif kind == "occupy":
+        x: Any = message.get("x")
+        y: Any = message.get("y")
+        if _is_coordinate(x) and _is_coordinate(y):
+            return Action.new_occupy(Cell(x, y))
+    return None
+
+
+def decode(line: bytes) -> Mapping[str, Any]:
+    """Decodes a message sent by a server."""
+    message: Mapping[str, Any] = json.loads(line)
+    return message
+
+
+def _is_coordinate(value: Any) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool) \
+        and 0 <= value < AbstractBoard.const_max_size()
+
+
+def _encode_mark(mark: Optional[Mark]) -> Optional[str]:
+    return None if mark is None else mark.name
+
+
+def _encode(message: Mapping[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
@@ -0,0 +1,263 @@
+"""Ratings of players across games, and matchmaking of players with close ratings for a ladder.
+
+A `Ladder` numbers its players, updates their `Rating`s from games that are over
+using a `RatingSystem`, either `Elo` or `Glicko`, and pairs each player who `join`s it
+with the queued player whose rating is the nearest.
+"""
+from __future__ import annotations
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections.abc import Iterator, Sequence
+from typing import Optional
+from yo1k.tic_tac_toe.game import Logic, PlayerID, State
+from yo1k.tic_tac_toe.util import eq
+
+_Q: float = math.log(10) / 400
+
+
+@eq
+class Rating:
+    """Immutable. A rating `value`, its `deviation` used by `Glicko`, and the number of games."""
+
+    __slots__ = ("__value", "__deviation", "__games")
+
+    def __init__(self, value: float = 1500, deviation: float = 350, games: int = 0):
+        assert deviation > 0, f"{deviation}"
+        self.__value: float = value
+        self.__deviation: float = deviation
+        self.__games: int = games
+
+    @property
+    def value(self) -> float:
+        return self.__value
+
+    @property
+    def deviation(self) -> float:
+        return self.__deviation
+
+    @property
+    def games(self) -> int:
+        return self.__games
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"value={self.__value},"
+                f"deviation={self.__deviation},"
+                f"games={self.__games})")
+
+
+def score(state: State, player_id: PlayerID) -> float:
+    """Returns the score of `player_id` in a game that is over, which is the share of rounds
+    the player won, where a drawn round counts as half won."""
+    assert Logic.is_game_over(state)
+    wins = [player.wins for player in state.players]
+    draws = state.rounds - sum(wins)
+    return (wins[player_id.idx] + draws / 2) / state.rounds
+
+
+class RatingSystem(ABC):
+    @abstractmethod
+    def update(self, rating: Rating, opponent: Rating, score_: float) -> Rating:
+        """Returns the `rating` of a player after a game with the `opponent` rated `opponent`,
+        in which the player scored `score_` between 0 and 1."""
+
+
+class Elo(RatingSystem):
+    def __init__(self, k: float = 32):
+        self.__k: float = k
+
+    def update(self, rating: Rating, opponent: Rating, score_: float) -> Rating:
+        expected = 1 / (1 + 10 ** ((opponent.value - rating.value) / 400))
+        return Rating(
+                rating.value + self.__k * (score_ - expected), rating.deviation, rating.games + 1)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"k={self.__k})")
+
+
+class Glicko(RatingSystem):
+    """The Glicko rating system, where each game is a rating period.
+
+    The `deviation` of a player grows by `growth` before each game, as Glicko's `c`,
+    and stays between `min_deviation` and `max_deviation`, so that ratings keep following
+    players whose strength changes.
+    """
+
+    def __init__(self, growth: float = 0, min_deviation: float = 30, max_deviation: float = 350):
+        assert 0 < min_deviation <= max_deviation, f"{min_deviation}, {max_deviation}"
+        self.__growth: float = growth
+        self.__min_deviation: float = min_deviation
+        self.__max_deviation: float = max_deviation
+
+    def update(self, rating: Rating, opponent: Rating, score_: float) -> Rating:
+        deviation = min(math.sqrt(rating.deviation ** 2 + self.__growth ** 2),
+                        self.__max_deviation)
+        g = 1 / math.sqrt(1 + 3 * _Q ** 2 * opponent.deviation ** 2 / math.pi ** 2)
+        expected = 1 / (1 + 10 ** (-g * (rating.value - opponent.value) / 400))
+        inverse_d_squared = _Q ** 2 * g ** 2 * expected * (1 - expected)
+        precision = 1 / deviation ** 2 + inverse_d_squared
+        return Rating(
+                rating.value + _Q / precision * g * (score_ - expected),
+                max(math.sqrt(1 / precision), self.__min_deviation),
+                rating.games + 1)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"growth={self.__growth},"
+                f"min_deviation={self.__min_deviation},"
+                f"max_deviation={self.__max_deviation})")
+
+
+_Key = tuple[float, int]
+"""A rating value and a player number."""
+
+
+class _SortedKeys:
+    """Sorted `_Key`s split into sorted blocks of at most `2 * load` keys.
+
+    Finding a key bisects the greatest keys of blocks and then a block, which is O(log n).
+    Adding and removing a key moves at most a block and the list of blocks,
+    instead of all keys as in a single sorted list, which is slow for millions of keys.
+    """
+
+    def __init__(self, load: int = 512):
+        assert load > 0, f"{load}"
+        self.__load: int = load
+        self.__blocks: list[list[_Key]] = []
+        self.__maxes: list[_Key] = []
+        self.__len: int = 0
+
+    def __len__(self) -> int:
+        return self.__len
+
+    def add(self, key: _Key) -> None:
+        self.__len += 1
+        if len(self.__blocks) == 0:
+            self.__blocks.append([key])
+            self.__maxes.append(key)
+            return
+        idx = min(bisect_left(self.__maxes, key), len(self.__maxes) - 1)
+        block = self.__blocks[idx]
+        insort(block, key)
+        self.__maxes[idx] = block[-1]
+        if len(block) > 2 * self.__load:
+            self.__blocks.insert(idx + 1, block[self.__load:])
+            del block[self.__load:]
+            self.__maxes.insert(idx, block[-1])
+
+    def remove(self, key: _Key) -> None:
+        idx = bisect_left(self.__maxes, key)
+        assert idx < len(self.__maxes), f"{key}"
+        block = self.__blocks[idx]
+        key_idx = bisect_left(block, key)
+        assert block[key_idx] == key, f"{key}"
+        del block[key_idx]
+        self.__len -= 1
+        if len(block) == 0:
+            del self.__blocks[idx]
+            del self.__maxes[idx]
+        else:
+            self.__maxes[idx] = block[-1]
+
+    def neighbours(self, key: _Key) -> tuple[Optional[_Key], Optional[_Key]]:
+        """Returns the greatest key less than `key` and the least key not less than `key`."""
+        idx = bisect_left(self.__maxes, key)
+        if idx == len(self.__maxes):
+            return (self.__blocks[-1][-1] if idx > 0 else None), None
+        block = self.__blocks[idx]
+        key_idx = bisect_left(block, key)
+        if key_idx > 0:
+            below: Optional[_Key] = block[key_idx - 1]
+        else:
+            below = self.__blocks[idx - 1][-1] if idx > 0 else None
+        return below, block[key_idx]
+
+    def __iter__(self) -> Iterator[_Key]:
+        for block in self.__blocks:
+            yield from block
+
+
+class Ladder:
+    """`Rating`s of players, who are numbered in the order they are added,
+    and a queue of players awaiting an opponent sorted by rating value.
+
+    Pairing a player with the nearest-rated queued player, queueing and leaving the queue
+    are O(log n) in the number n of queued players, see `_SortedKeys`.
+    Is not thread-safe.
+    """
+
+    def __init__(self, system: Optional[RatingSystem] = None,
+                 max_difference: Optional[float] = None):
+        """`join` does not pair players whose rating values differ by more than
+        `max_difference`, if specified."""
+        self.__system: RatingSystem = Glicko() if system is None else system
+        self.__max_difference: Optional[float] = max_difference
+        self.__ratings: list[Rating] = []
+        self.__queue: _SortedKeys = _SortedKeys()
+        self.__queued: set[int] = set()
+
+    def add(self, rating: Optional[Rating] = None) -> int:
+        """Adds a player rated `rating`, by default a new `Rating`, and returns their number."""
+        self.__ratings.append(Rating() if rating is None else rating)
+        return len(self.__ratings) - 1
+
+    def rating(self, player: int) -> Rating:
+        return self.__ratings[player]
+
+    def player_count(self) -> int:
+        return len(self.__ratings)
+
+    def queued_count(self) -> int:
+        return len(self.__queue)
+
+    def is_queued(self, player: int) -> bool:
+        return player in self.__queued
+
+    def join(self, player: int) -> Optional[int]:
+        """Removes the queued player whose rating value is the nearest to that of `player`
+        from the queue and returns them, or queues `player` and returns `None` if there is
+        no such player within `max_difference`."""
+        assert not self.is_queued(player), f"{player}"
+        key = (self.__ratings[player].value, player)
+        (below, above) = self.__queue.neighbours(key)
+        nearest = min((opponent for opponent in (below, above) if opponent is not None),
+                      key=lambda opponent: abs(opponent[0] - key[0]), default=None)
+        if nearest is None or (self.__max_difference is not None
+                               and abs(nearest[0] - key[0]) > self.__max_difference):
+            self.queue(player)
+            return None
+        self.__queue.remove(nearest)
+        self.__queued.remove(nearest[1])
+        return nearest[1]
+
+    def queue(self, player: int) -> None:
+        """Queues `player` without pairing them."""
+        assert not self.is_queued(player), f"{player}"
+        self.__queue.add((self.__ratings[player].value, player))
+        self.__queued.add(player)
+
+    def leave(self, player: int) -> None:
+        """Removes `player` from the queue."""
+        self.__queued.remove(player)
+        self.__queue.remove((self.__ratings[player].value, player))
+
+    def record(self, players: Sequence[int], state: State) -> None:
+        """Updates the ratings of `players` from a game that is over, where `players[i]`
+        played for `state.players[i]`. Queued players must not be rated."""
+        assert len(players) == len(state.players) == 2, f"{players}, {state.players}"
+        for player in players:
+            assert not self.is_queued(player), f"{player}"
+        (rating, opponent) = (self.__ratings[players[0]], self.__ratings[players[1]])
+        self.__ratings[players[0]] = self.__system.update(
+                rating, opponent, score(state, state.players[0].id))
+        self.__ratings[players[1]] = self.__system.update(
+                opponent, rating, score(state, state.players[1].id))
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"system={self.__system},"
+                f"max_difference={self.__max_difference},"
+                f"players={len(self.__ratings)},"
+                f"queued={len(self.__queue)})")
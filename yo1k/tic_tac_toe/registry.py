@@ -0,0 +1,49 @@
+"""`AI`s by name, whose modules are imported only when an `AI` is first requested,
+so that a process imports only the `AI`s it plays with."""
+from __future__ import annotations
+import importlib
+from collections.abc import Callable, Iterator, Mapping
+from yo1k.tic_tac_toe.game import AI, DefaultActionQueue, PlayerID
+
+AIFactory = Callable[[PlayerID, int, DefaultActionQueue], AI]
+"""Creates an `AI` from the `PlayerID` it plays for, an RNG seed, and its action queue."""
+
+
+class Registry(Mapping[str, AIFactory]):
+    """`AIFactory`s by name, each given as the name of a module and of a factory in it."""
+
+    def __init__(self, paths: Mapping[str, tuple[str, str]]):
+        self.__paths: dict[str, tuple[str, str]] = dict(paths)
+        self.__factories: dict[str, AIFactory] = {}
+
+    def register(self, name: str, module: str, factory: str) -> None:
+        self.__paths[name] = (module, factory)
+        self.__factories.pop(name, None)
+
+    def __getitem__(self, name: str) -> AIFactory:
+        factory = self.__factories.get(name)
+        if factory is None:
+            (module, attribute) = self.__paths[name]
+            factory = getattr(importlib.import_module(module), attribute)
+            self.__factories[name] = factory
+        return factory
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__paths)
+
+    def __len__(self) -> int:
+        return len(self.__paths)
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"paths={self.__paths})")
+
+
+AIS: Registry = Registry({
+        "random": ("yo1k.tic_tac_toe.ai", "new_random_ai"),
+        "fast_random": ("yo1k.tic_tac_toe.fast_random", "new_fast_random_ai"),
+        "minimax": ("yo1k.tic_tac_toe.ai", "new_minimax_ai"),
+        "book": ("yo1k.tic_tac_toe.book", "new_book_ai"),
+        "mcts": ("yo1k.tic_tac_toe.mcts", "new_mcts_ai")})
+"""`AI`s which may take part in games started from the command line and in tournaments.
+Names rather than factories are sent to worker processes, so that they need not be picklable."""
@@ -0,0 +1,263 @@
+"""An append-only binary log of the actions delivered to `Logic`, and replay of it.
+
+A log starts with `MAGIC` followed by frames. Frames of different matches may be interleaved,
+each frame starts with its kind and the number of its match. All numbers are little-endian.
+
+| frame       | layout                                    | content                           |
+|-------------|-------------------------------------------|-----------------------------------|
+| `START`     | kind u8, match u32, rounds u16, size u8,  | a match starts with a new `State` |
+|             | win_length u8, marks u8                   | in `BEGINNING`, bit `idx` of marks|
+|             |                                           | is set iff `PlayerID(idx)` is `O` |
+| `READY`     | kind u8, match u32, player u8             | an action popped from the queue   |
+| `SURRENDER` | kind u8, match u32, player u8             | of the player with `PlayerID.idx` |
+| `OCCUPY`    | kind u8, match u32, player u8, x u8, y u8 |                                   |
+| `END`       | kind u8, match u32                        | the match is over                 |
+"""
+from __future__ import annotations
+import copy
+import struct
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+from yo1k.tic_tac_toe.game import (
+    AbstractBoard, Action, ActionQueue, Board, Cell, Logic, Mark, Phase, Player, PlayerID, State)
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+MAGIC: bytes = b"TTTLOG\x00\x01"
+START: int = 0
+READY: int = 1
+SURRENDER: int = 2
+OCCUPY: int = 3
+END: int = 4
+_FRAMES: Sequence[struct.Struct] = (
+        struct.Struct("<BIHBBB"),
+        struct.Struct("<BIB"),
+        struct.Struct("<BIB"),
+        struct.Struct("<BIBBB"),
+        struct.Struct("<BI"))
+_NEXT_MATCH: struct.Struct = struct.Struct("<I")
+
+
+class LogWriter:
+    """Appends frames to the log file at `path`, creating it if it does not exist.
+
+    Matches are numbered after the ones already in the file. The number of the next match is
+    kept in the file `path` with the suffix `.next`, so that it is not looked for in the log,
+    which is only done if that file does not exist. Numbers are reserved in blocks of
+    `const_reserved_matches` until `close`, so numbers reserved but not used by a writer
+    which is not closed are skipped. Only one `LogWriter` may write to a log file at a time,
+    otherwise matches of different writers get the same numbers.
+    Frames are buffered until `flush` or `close`.
+    """
+
+    def __init__(self, path: Path):
+        self.__next_path: Path = path.with_name(path.name + ".next")
+        self.__next_match: int = 0
+        if path.exists():
+            if self.__next_path.exists():
+                (self.__next_match,) = _NEXT_MATCH.unpack(self.__next_path.read_bytes())
+            else:
+                self.__next_match = max(matches(path.read_bytes()), default=-1) + 1
+        self.__reserved: int = self.__next_match
+        self.__file: BinaryIO = open(path, "ab")  # pylint: disable=R1732
+        if self.__file.tell() == 0:
+            self.__file.write(MAGIC)
+
+    @staticmethod
+    def const_reserved_matches() -> int:
+        return 1024
+
+    def start(self, state: State) -> int:
+        """Writes the `START` frame of a match played from the new `state`
+        and returns the number of the match."""
+        assert state.phase is Phase.BEGINNING and state.round == 0 and state.step == 0, f"{state}"
+        assert state.board.empty_count() == state.board.size() ** 2, f"{state}"
+        match = self.__next_match
+        if match == self.__reserved:
+            self.__reserve(match + LogWriter.const_reserved_matches())
+        self.__next_match += 1
+        marks = 0
+        for player in state.players:
+            if player.mark is Mark.O:
+                marks |= 1 << player.id.idx
+        self.__file.write(_FRAMES[START].pack(
+                START, match, state.rounds, state.board.size(), state.board.win_length(), marks))
+        return match
+
+    def record(self, match: int, player_id: PlayerID, action: Action) -> None:
+        if action.occupy is not None:
+            self.__file.write(_FRAMES[OCCUPY].pack(
+                    OCCUPY, match, player_id.idx, action.occupy.x, action.occupy.y))
+        elif action.ready:
+            self.__file.write(_FRAMES[READY].pack(READY, match, player_id.idx))
+        elif action.surrender:
+            self.__file.write(_FRAMES[SURRENDER].pack(SURRENDER, match, player_id.idx))
+        else:
+            assert False
+
+    def end(self, match: int) -> None:
+        self.__file.write(_FRAMES[END].pack(END, match))
+
+    def flush(self) -> None:
+        self.__file.flush()
+
+    def close(self) -> None:
+        self.__file.close()
+        self.__reserve(self.__next_match)
+
+    def __reserve(self, next_match: int) -> None:
+        """Writes `next_match` to the `.next` file, replacing it at once."""
+        tmp_path = self.__next_path.with_name(self.__next_path.name + ".tmp")
+        tmp_path.write_bytes(_NEXT_MATCH.pack(next_match))
+        tmp_path.replace(self.__next_path)
+        self.__reserved = next_match
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"file={self.__file},"
+                f"next_match={self.__next_match},"
+                f"reserved={self.__reserved})")
+
+
+class RecordingActionQueue(ActionQueue):
+    """Wraps `action_queue` and records every action popped from it to `log`."""
+
+    def __init__(self, action_queue: ActionQueue, log: LogWriter, match: int):
+        self.__action_queue: ActionQueue = action_queue
+        self.__log: LogWriter = log
+        self.__match: int = match
+
+    def player_id(self) -> PlayerID:
+        return self.__action_queue.player_id()
+
+    def pop(self) -> Optional[Action]:
+        action = self.__action_queue.pop()
+        if action is not None:
+            self.__log.record(self.__match, self.__action_queue.player_id(), action)
+        return action
+
+    def has_actions(self) -> bool:
+        return self.__action_queue.has_actions()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"action_queue={self.__action_queue},"
+                f"match={self.__match})")
+
+
+def _frames(log: Buffer) -> Sequence[tuple[int, ...]]:
+    """Returns all frames of `log`.
+
+    Raises `ValueError` if `log` is not a valid log, which includes a truncated last frame."""
+    if bytes(log[:len(MAGIC)]) != MAGIC:
+        raise ValueError("not a log")
+    frames = []
+    offset = len(MAGIC)
+    while offset < len(log):
+        kind = log[offset]
+        if kind >= len(_FRAMES):
+            raise ValueError(f"invalid frame kind {kind} at {offset}")
+        frame = _FRAMES[kind]
+        if offset + frame.size > len(log):
+            raise ValueError(f"truncated frame at {offset}")
+        frames.append(frame.unpack_from(log, offset))
+        offset += frame.size
+    return frames
+
+
+def matches(log: Buffer) -> Sequence[int]:
+    """Returns the numbers of the matches started in `log`."""
+    return [frame[1] for frame in _frames(log) if frame[0] == START]
+
+
+def load(log: Buffer, checkpoint_interval: int = 64) -> Mapping[int, Replay]:
+    """Replays all matches in `log` and returns them by number."""
+    frames_by_match: dict[int, list[tuple[int, ...]]] = {}
+    for frame in _frames(log):
+        frames_by_match.setdefault(frame[1], []).append(frame)
+    return dict((match, Replay(frames, checkpoint_interval))
+                for (match, frames) in frames_by_match.items())
+
+
+class Replay:
+    """Replays a match from its `frames`, see `load`, without `AI`s.
+
+    Copies of `State` are kept every `checkpoint_interval` actions, so that `state(actions)`
+    replays at most `checkpoint_interval - 1` actions.
+    Raises `ValueError` if the frames are not a valid match.
+    """
+
+    def __init__(self, frames: Sequence[tuple[int, ...]], checkpoint_interval: int = 64):
+        assert checkpoint_interval > 0, f"{checkpoint_interval}"
+        self.__checkpoint_interval: int = checkpoint_interval
+        start: Optional[tuple[int, ...]] = None
+        self.__actions: list[tuple[PlayerID, Action]] = []
+        self.__ended: bool = False
+        for frame in frames:
+            kind = frame[0]
+            if kind == START:
+                start = frame
+            elif kind == END:
+                self.__ended = True
+            elif kind == READY:
+                self.__actions.append((PlayerID(frame[2]), Action.new_ready()))
+            elif kind == SURRENDER:
+                self.__actions.append((PlayerID(frame[2]), Action.new_surrender()))
+            elif kind == OCCUPY:
+                if max(frame[3], frame[4]) >= AbstractBoard.const_max_size():
+                    raise ValueError(f"invalid frame {frame}")
+                self.__actions.append(
+                        (PlayerID(frame[2]), Action.new_occupy(Cell(frame[3], frame[4]))))
+        if start is None:
+            raise ValueError("the match has not started")
+        (_, _, rounds, size, win_length, _) = start
+        if rounds == 0 or not 1 <= win_length <= size <= AbstractBoard.const_max_size():
+            raise ValueError(f"invalid frame {start}")
+        self.__start: tuple[int, ...] = start
+        self.__checkpoints: list[State] = []
+        self.__final: State = self.__replay(self.__new_state(), 0, len(self.__actions), False)
+
+    def actions(self) -> Sequence[tuple[PlayerID, Action]]:
+        """Returns the recorded actions and the `PlayerID`s of the players who made them."""
+        return self.__actions
+
+    def is_ended(self) -> bool:
+        """Returns `True` iff the `END` frame of the match was recorded."""
+        return self.__ended
+
+    def state(self, actions: Optional[int] = None) -> State:
+        """Returns a new `State` after the first `actions` recorded actions, all by default."""
+        if actions is None or actions == len(self.__actions):
+            return copy.deepcopy(self.__final)
+        assert 0 <= actions < len(self.__actions), f"{actions}, {len(self.__actions)}"
+        if len(self.__checkpoints) == 0:
+            # checkpoints are made once needed, so that replaying to the end does not copy
+            self.__replay(self.__new_state(), 0, len(self.__actions), True)
+        checkpoint = actions // self.__checkpoint_interval
+        state = copy.deepcopy(self.__checkpoints[checkpoint])
+        return self.__replay(state, checkpoint * self.__checkpoint_interval, actions, False)
+
+    def __new_state(self) -> State:
+        (_, _, rounds, size, win_length, marks) = self.__start
+        return State(
+                rounds=rounds,
+                players=tuple(Player(PlayerID(idx), Mark.O if marks >> idx & 1 else Mark.X)
+                              for idx in range(State.const_player_count())),
+                board=Board(size=size, win_length=win_length))
+
+    def __replay(self, state: State, begin: int, end: int, checkpoint: bool) -> State:
+        for idx in range(begin, end):
+            if checkpoint and idx % self.__checkpoint_interval == 0:
+                self.__checkpoints.append(copy.deepcopy(state))
+            (player_id, action) = self.__actions[idx]
+            if not Logic.is_valid(state, player_id, action):
+                raise ValueError(f"invalid action {action} of {player_id} in {state}")
+            Logic.apply(state, player_id, action)
+        return state
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"actions={len(self.__actions)},"
+                f"ended={self.__ended},"
+                f"checkpoints={len(self.__checkpoints)})")
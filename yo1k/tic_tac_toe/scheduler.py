@@ -0,0 +1,138 @@
+"""Advancing many `World`s in one thread, for example the matches hosted by a process."""
+from __future__ import annotations
+import threading
+from collections import deque
+from collections.abc import Sequence
+from time import perf_counter
+from typing import Optional
+from yo1k.tic_tac_toe.game import Logic, World
+
+
+class Scheduler:
+    """Owns `World`s and advances only the ready ones, round-robin.
+
+    A match is ready when it is added and when `notify` is called for it. A match stays ready
+    while `Logic` has actions to process, which is the case for matches of `AI`s only, and stops
+    being ready once `World.run` returns because no action arrives, for example while awaiting
+    a human player. Whoever adds an action to an `ActionQueue` of an idle match must call
+    `notify`, so idle matches cost nothing until then.
+
+    Each turn of a ready match is a time slice of at most `quantum` `Logic.advance` calls,
+    so that no match delays the others for long. Matches are removed once their games are over.
+
+    `notify` and `stop` may be called from any thread, for example by `on_add` of
+    a `ConcurrentActionQueue` on a network thread. Other methods must be called
+    from the thread running the matches, which `serve` puts to sleep while no match is ready.
+    """
+
+    def __init__(self, quantum: int = 16):
+        assert quantum > 0, f"{quantum}"
+        self.__quantum: int = quantum
+        self.__worlds: dict[int, World] = {}
+        self.__ready: deque[int] = deque()
+        self.__is_ready: set[int] = set()
+        self.__next_match: int = 0
+        self.__condition: threading.Condition = threading.Condition()
+        self.__notified: list[int] = []
+        self.__stopped: bool = False
+
+    def add(self, world: World) -> int:
+        """Adds `world`, whose game is not over, as a ready match and returns its number."""
+        assert not Logic.is_game_over(world.state), f"{world}"
+        match = self.__next_match
+        self.__next_match += 1
+        self.__worlds[match] = world
+        self.notify(match)
+        return match
+
+    def notify(self, match: int) -> None:
+        """Makes `match` ready, if it has not been removed, and wakes up `wait`."""
+        with self.__condition:
+            self.__notified.append(match)
+            self.__condition.notify()
+
+    def __collect(self) -> None:
+        """Makes the matches notified since the last call ready."""
+        if len(self.__notified) == 0:
+            return
+        with self.__condition:
+            (notified, self.__notified) = (self.__notified, [])
+        for match in notified:
+            if match in self.__worlds and match not in self.__is_ready:
+                self.__is_ready.add(match)
+                self.__ready.append(match)
+
+    def world(self, match: int) -> Optional[World]:
+        """Returns the `World` of `match`, or `None` if it has been removed."""
+        return self.__worlds.get(match)
+
+    def match_count(self) -> int:
+        return len(self.__worlds)
+
+    def ready_count(self) -> int:
+        self.__collect()
+        return len(self.__ready)
+
+    def run_round(self) -> Sequence[int]:
+        """Gives a time slice to each match ready when the round starts,
+        in the order they became ready, and returns the matches whose games are over."""
+        self.__collect()
+        over = []
+        for _ in range(len(self.__ready)):
+            match = self.__ready.popleft()
+            world = self.__worlds[match]
+            stats = world.run(self.__quantum)
+            if Logic.is_game_over(world.state):
+                self.__is_ready.remove(match)
+                del self.__worlds[match]
+                over.append(match)
+            elif stats.logic_calls == self.__quantum:
+                # the time slice is over, but actions may remain
+                self.__ready.append(match)
+            else:
+                self.__is_ready.remove(match)
+        return over
+
+    def run(self, seconds: Optional[float] = None) -> Sequence[int]:
+        """Runs rounds until no match is ready, or until `seconds` elapse if specified,
+        and returns the matches whose games are over."""
+        deadline = None if seconds is None else perf_counter() + seconds
+        over: list[int] = []
+        while self.ready_count() > 0 and (deadline is None or perf_counter() < deadline):
+            over.extend(self.run_round())
+        return over
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleeps until a match is ready or `stop` is called, at most `timeout` seconds
+        if specified, and returns whether a match is ready."""
+        with self.__condition:
+            if len(self.__ready) == 0 and len(self.__notified) == 0 and not self.__stopped:
+                self.__condition.wait(timeout)
+        return self.ready_count() > 0
+
+    def serve(self) -> Sequence[int]:
+        """Runs ready matches and sleeps while no match is ready until `stop` is called,
+        and returns the matches whose games are over."""
+        over: list[int] = []
+        while True:
+            with self.__condition:
+                if self.__stopped:
+                    self.__stopped = False
+                    return over
+            if self.ready_count() > 0:
+                over.extend(self.run_round())
+            else:
+                self.wait()
+
+    def stop(self) -> None:
+        """Makes `serve` return once the current round is over."""
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"quantum={self.__quantum},"
+                f"matches={len(self.__worlds)},"
+                f"ready={len(self.__ready)},"
+                f"notified={len(self.__notified)})")
@@ -0,0 +1,219 @@
+"""A multiplayer server hosting concurrent matches in one asyncio event loop.
+
+Run `python -m yo1k.tic_tac_toe.server --help` for the command-line usage.
+Connections are paired into matches in the order they arrive, see `protocol` for the messages.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Optional
+from yo1k.tic_tac_toe import protocol
+from yo1k.tic_tac_toe.game import (
+    Action,
+    Board,
+    Logic,
+    Mark,
+    Player,
+    PlayerID,
+    State,
+    ValidatingActionQueue)
+from yo1k.tic_tac_toe.replay import LogWriter, RecordingActionQueue
+
+
+class AsyncActionQueue(ValidatingActionQueue):
+    """A `ValidatingActionQueue` which sets `arrived` whenever an action is added,
+    so that a coroutine may await actions instead of polling.
+
+    Must be used only by the thread running the event loop of `arrived`.
+    """
+
+    def __init__(self, player_id: PlayerID, state: State, arrived: asyncio.Event):
+        super().__init__(player_id, state)
+        self.__arrived: asyncio.Event = arrived
+
+    def add(self, action: Action) -> None:
+        super().add(action)
+        self.__arrived.set()
+
+
+class Match:
+    """A game played by two connections."""
+
+    def __init__(
+            self,
+            rounds: int,
+            writers: Sequence[asyncio.StreamWriter],
+            log: Optional[LogWriter] = None):
+        """Records actions processed by `Logic` to `log` if specified."""
+        assert len(writers) == State.const_player_count(), \
+            f"{len(writers)}, {State.const_player_count()}"
+        players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+        self.state: State = State(rounds=rounds, players=players, board=Board())
+        self.__arrived: asyncio.Event = asyncio.Event()
+        self.__action_queues: Sequence[AsyncActionQueue] = tuple(
+                AsyncActionQueue(player.id, self.state, self.__arrived) for player in players)
+        self.__writers: Sequence[asyncio.StreamWriter] = writers
+        self.__log: Optional[LogWriter] = log
+        self.__match: int = -1 if log is None else log.start(self.state)
+        self.__logic: Logic = Logic(self.__action_queues) if log is None else Logic(tuple(
+                RecordingActionQueue(action_queue, log, self.__match)
+                for action_queue in self.__action_queues))
+        self.__aborted: bool = False
+
+    def submit(self, player_id: PlayerID, action: Action) -> bool:
+        """Queues `action` of the player with `player_id` if it is valid.
+        Returns `False` and does not queue `action` otherwise."""
+        try:
+            self.__action_queues[player_id.idx].add(action)
+        except ValueError:
+            return False
+        return True
+
+    def abort(self) -> None:
+        """Makes `run` return and closes connections of all players."""
+        self.__aborted = True
+        self.__arrived.set()
+        for writer in self.__writers:
+            writer.close()
+
+    def is_over(self) -> bool:
+        return self.__aborted or Logic.is_game_over(self.state)
+
+    async def run(self) -> None:
+        """Advances the game as actions arrive and broadcasts each new `State`
+        until the game is over or `abort` is called."""
+        try:
+            await self.__broadcast()
+            while not Logic.is_game_over(self.state):
+                await self.__arrived.wait()
+                self.__arrived.clear()
+                if self.__aborted:
+                    break
+                while not Logic.is_game_over(self.state) \
+                        and self.__logic.has_actions(Logic.awaited(self.state)):
+                    self.__logic.advance(self.state)
+                await self.__broadcast()
+        finally:
+            if self.__log is not None:
+                if Logic.is_game_over(self.state):
+                    self.__log.end(self.__match)
+                self.__log.flush()
+
+    async def __broadcast(self) -> None:
+        for (idx, writer) in enumerate(self.__writers):
+            writer.write(protocol.encode_state(self.state, PlayerID(idx)))
+        for writer in self.__writers:
+            await writer.drain()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"state={self.state})")
+
+
+class Server:
+    def __init__(self, rounds: int = State.default_rounds(), log: Optional[LogWriter] = None):
+        """Records actions of all matches to `log` if specified."""
+        self.__rounds: int = rounds
+        self.__log: Optional[LogWriter] = log
+        self.__waiting: Optional[tuple[asyncio.StreamWriter, asyncio.Future[Match]]] = None
+        self.matches_started: int = 0
+        self.matches_finished: int = 0
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """Starts accepting connections, `port` `0` means any free port."""
+        return await asyncio.start_server(self.handle, host, port, backlog=4096)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Pairs the connection with the next one into a `Match`
+        and submits actions read from it until the match is over or the connection is closed."""
+        if self.__waiting is None:
+            match_future: asyncio.Future[Match] = asyncio.get_running_loop().create_future()
+            self.__waiting = (writer, match_future)
+            player_id = PlayerID(0)
+            try:
+                match = await match_future
+            finally:
+                if self.__waiting is not None and self.__waiting[0] is writer:
+                    self.__waiting = None
+        else:
+            (other_writer, match_future) = self.__waiting
+            self.__waiting = None
+            player_id = PlayerID(1)
+            match = Match(self.__rounds, (other_writer, writer), self.__log)
+            match_future.set_result(match)
+            asyncio.get_running_loop().create_task(self.__run(match))
+        try:
+            await self.__read_actions(match, player_id, reader, writer)
+        except (ConnectionError, ValueError):
+            # `ValueError` is raised by `readline` for lines longer than the stream limit
+            pass
+        finally:
+            if not match.is_over():
+                # the player has left
+                match.abort()
+            writer.close()
+
+    async def __run(self, match: Match) -> None:
+        self.matches_started += 1
+        try:
+            await match.run()
+        except ConnectionError:
+            match.abort()
+        if Logic.is_game_over(match.state):
+            self.matches_finished += 1
+
+    @staticmethod
+    async def __read_actions(
+            match: Match,
+            player_id: PlayerID,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter) -> None:
+        while not match.is_over():
+            line = await reader.readline()
+            if len(line) == 0:
+                break
+            action = protocol.decode_action(line)
+            if action is None:
+                writer.write(protocol.encode_error("malformed action"))
+            elif not match.submit(player_id, action):
+                writer.write(protocol.encode_error("invalid action"))
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"rounds={self.__rounds},"
+                f"matches_started={self.matches_started},"
+                f"matches_finished={self.matches_finished})")
+
+
+async def serve(host: str, port: int, rounds: int, log: Optional[LogWriter]) -> None:
+    server = await Server(rounds, log).start(host, port)
+    for socket in server.sockets:
+        print(f"Listening on {socket.getsockname()}", end=os.linesep)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+            prog="python -m yo1k.tic_tac_toe.server",
+            description="Hosts matches between players connecting over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7878)
+    parser.add_argument("--rounds", type=int, default=State.default_rounds())
+    parser.add_argument(
+            "--log", type=Path, default=None,
+            help="append actions of all matches to the replay log LOG, see `replay`")
+    args = parser.parse_args(argv)
+    log = None if args.log is None else LogWriter(args.log)
+    try:
+        asyncio.run(serve(args.host, args.port, args.rounds, log))
+    finally:
+        if log is not None:
+            log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""`State`s of many matches in one block of shared memory, which processes read and write
+without copying or pickling.
+
+A `SharedStore` is a NumPy structured array of slots of the type returned by `dtype`,
+whose memory is a `multiprocessing.shared_memory.SharedMemory` block.
+A worker process `put`s the `State` of a match to a slot and plays the match on the
+`SharedState` view returned, which is a `State` whose fields, `Player.wins` and board
+are stored in the slot. Other processes attach to the block by its `name`
+and read game status from the array, or from `SharedState`s over its slots.
+
+Only one process may write to a slot. `SharedState` views are not synchronized.
+"""
+from __future__ import annotations
+from collections.abc import Iterable, Mapping, Sequence
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+import numpy as np
+from yo1k.tic_tac_toe import position
+from yo1k.tic_tac_toe.game import (
+    AbstractBoard, Board, Cell, EmptyCells, Mark, Phase, Player, PlayerID, State)
+
+_PHASES: tuple[Phase, ...] = tuple(Phase)
+_MARKS: tuple[Optional[Mark], ...] = (None, Mark.X, Mark.O)
+
+
+def dtype(size: int) -> np.dtype[Any]:
+    """Returns the type of a slot for a board of `size`.
+
+    | field            | content                                                      |
+    |------------------|--------------------------------------------------------------|
+    | `rounds`         | `State.rounds`                                               |
+    | `round`          | `State.round`                                                |
+    | `step`           | `State.step`                                                 |
+    | `phase`          | index in `Phase`                                             |
+    | `required_ready` | `State.required_ready`, bit `idx` per `PlayerID.idx`         |
+    | `marks`          | bit `idx` is set iff `PlayerID(idx)` is `O`                  |
+    | `win_length`     | `AbstractBoard.win_length`                                   |
+    | `wins`           | `Player.wins` per `PlayerID.idx`                             |
+    | `board`          | cells `[x, y]`, see `position.value`                         |
+    """
+    return np.dtype([
+            ("rounds", "<u2"),
+            ("round", "<u2"),
+            ("step", "<u2"),
+            ("phase", "u1"),
+            ("required_ready", "u1"),
+            ("marks", "u1"),
+            ("win_length", "u1"),
+            ("wins", "<u2", (State.const_player_count(),)),
+            ("board", "u1", (size, size))])
+
+
+class SharedStore:
+    """`capacity` slots for `State`s with boards of `size`, see the module docstring.
+
+    Creates a new shared memory block if `name` is `None`, and attaches to the block
+    named `name` created by another `SharedStore` otherwise.
+    The process which created the block must `unlink` it once all processes `close` it.
+    """
+
+    def __init__(self, capacity: int, size: int = AbstractBoard.const_size(),
+                 name: Optional[str] = None):
+        assert 1 <= size <= AbstractBoard.const_max_size(), f"{size}"
+        slot_type = dtype(size)
+        self.__memory: SharedMemory = SharedMemory(
+                name=name, create=name is None, size=capacity * slot_type.itemsize)
+        self.slots: np.ndarray[Any, np.dtype[Any]] = np.ndarray(
+                (capacity,), dtype=slot_type, buffer=self.__memory.buf)
+        if name is None:
+            self.slots.fill(0)
+
+    @property
+    def name(self) -> str:
+        return self.__memory.name
+
+    def capacity(self) -> int:
+        return len(self.slots)
+
+    def size(self) -> int:
+        return int(self.slots["board"].shape[1])
+
+    def put(self, slot: int, state: State) -> SharedState:
+        """Writes `state` to `slot` and returns a view of it."""
+        record = self.slots[slot]
+        assert state.board.size() == self.size(), f"{state.board.size()}, {self.size()}"
+        record["rounds"] = state.rounds
+        record["win_length"] = state.board.win_length()
+        record["marks"] = _mask(player.id for player in state.players if player.mark is Mark.O)
+        size = self.size()
+        for x in range(size):
+            for y in range(size):
+                record["board"][x, y] = position.value(state.board.get(Cell(x, y)))
+        shared = self.state(slot)
+        shared.phase = state.phase
+        shared.round = state.round
+        shared.step = state.step
+        shared.required_ready = state.required_ready
+        for (shared_player, player) in zip(shared.players, state.players):
+            shared_player.wins = player.wins
+        return shared
+
+    def state(self, slot: int) -> SharedState:
+        """Returns a view of `slot` written by `put`, possibly in another process."""
+        return SharedState(self.slots[slot])
+
+    def close(self) -> None:
+        """Closes the shared memory block in this process.
+        The store and views of its slots must not be used afterwards."""
+        del self.slots
+        self.__memory.close()
+
+    def unlink(self) -> None:
+        self.__memory.unlink()
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"name={self.__memory.name},"
+                f"capacity={self.capacity()},"
+                f"size={self.size()})")
+
+
+def _mask(player_ids: Iterable[PlayerID]) -> int:
+    mask = 0
+    for player_id in player_ids:
+        mask |= 1 << player_id.idx
+    return mask
+
+
+class SharedBoard(AbstractBoard):
+    """An `AbstractBoard` over the `board` field of a slot of a `SharedStore`.
+
+    Keeps `EmptyCells` built on the first call of `empty_count`, `empty_cell` or `empty_cells`,
+    so the slot must not be modified by other views afterwards.
+    """
+
+    __DIRECTIONS: Sequence[tuple[int, int]] = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+    def __init__(self, record: Any):
+        self.__cells: np.ndarray[Any, np.dtype[np.uint8]] = record["board"]
+        self.__win_length: int = int(record["win_length"])
+        self.__empty: Optional[EmptyCells] = None
+
+    def set(self, cell: Cell, mark: Mark) -> None:
+        assert self.__cells[cell.x, cell.y] == 0
+        self.__cells[cell.x, cell.y] = position.value(mark)
+        if self.__empty is not None:
+            self.__empty.remove(cell)
+
+    def unset(self, cell: Cell) -> None:
+        assert self.__cells[cell.x, cell.y] != 0
+        self.__cells[cell.x, cell.y] = 0
+        if self.__empty is not None:
+            self.__empty.restore(cell)
+
+    def get(self, cell: Cell) -> Optional[Mark]:
+        return _MARKS[int(self.__cells[cell.x, cell.y])]
+
+    def clear(self) -> None:
+        self.__cells.fill(0)
+        if self.__empty is not None:
+            self.__empty.reset()
+
+    def size(self) -> int:
+        return len(self.__cells)
+
+    def is_win(self, last_occupied: Cell) -> bool:
+        """Scans the runs going through `last_occupied` in the array,
+        which takes `O(win_length)` time regardless of `size`."""
+        cells = self.__cells
+        size = len(cells)
+        win_length = self.__win_length
+        (x, y) = (last_occupied.x, last_occupied.y)
+        value_ = int(cells[x, y])
+        assert value_ != 0
+        for (dx, dy) in SharedBoard.__DIRECTIONS:
+            run = 1
+            for sign in (1, -1):
+                (i, j) = (x + sign * dx, y + sign * dy)
+                while run < win_length and 0 <= i < size and 0 <= j < size \
+                        and cells[i, j] == value_:
+                    run += 1
+                    (i, j) = (i + sign * dx, j + sign * dy)
+            if run == win_length:
+                return True
+        return False
+
+    def empty_count(self) -> int:
+        return self.__empty_cells().count()
+
+    def empty_cell(self, i: int) -> Cell:
+        return self.__empty_cells().get(i)
+
+    def empty_cells(self) -> Sequence[Cell]:
+        return self.__empty_cells().cells()
+
+    def __empty_cells(self) -> EmptyCells:
+        if self.__empty is None:
+            self.__empty = EmptyCells(
+                    self.size(), [Cell(int(x), int(y)) for (x, y) in np.argwhere(self.__cells)])
+        return self.__empty
+
+    def win_length(self) -> int:
+        return self.__win_length
+
+    def __eq__(self, other: object) -> bool:
+        """Compares cells, regardless of the type of `other`."""
+        if not isinstance(other, AbstractBoard) or other.size() != self.size() \
+                or other.win_length() != self.__win_length:
+            return False
+        size = self.size()
+        return all(self.get(Cell(x, y)) == other.get(Cell(x, y))
+                   for x in range(size) for y in range(size))
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"cells={self.__cells.tolist()},"
+                f"win_length={self.__win_length})")
+
+
+class SharedPlayer(Player):
+    """A `Player` whose `wins` are stored in the `wins` field of a slot of a `SharedStore`."""
+
+    __slots__ = ("__wins",)
+
+    def __init__(self, id_: PlayerID, mark: Mark, wins: np.ndarray[Any, np.dtype[np.uint16]]):
+        self.__wins: Optional[np.ndarray[Any, np.dtype[np.uint16]]] = None
+        # the setter ignores `wins` assigned by `Player` until the view is bound to `wins`
+        super().__init__(id_, mark)
+        self.__wins = wins
+
+    @property
+    def wins(self) -> int:
+        assert self.__wins is not None
+        return int(self.__wins[self.id.idx])
+
+    @wins.setter
+    def wins(self, value: int) -> None:
+        if self.__wins is not None:
+            self.__wins[self.id.idx] = value
+
+
+class _RequiredReady(set[PlayerID]):
+    """`State.required_ready` of a `SharedState`, which writes the changes made by
+    `add`, `discard`, `remove`, `clear` and `update` through to the slot."""
+
+    def __init__(self, record: Any):
+        mask = int(record["required_ready"])
+        super().__init__(PlayerID(idx) for idx in range(State.const_player_count())
+                         if mask >> idx & 1)
+        self.__record: Any = record
+
+    def add(self, element: PlayerID) -> None:
+        super().add(element)
+        self.__write()
+
+    def discard(self, element: object) -> None:
+        super().discard(element)
+        self.__write()
+
+    def remove(self, element: PlayerID) -> None:
+        super().remove(element)
+        self.__write()
+
+    def clear(self) -> None:
+        super().clear()
+        self.__write()
+
+    def update(self, *others: Iterable[PlayerID]) -> None:
+        super().update(*others)
+        self.__write()
+
+    def __write(self) -> None:
+        self.__record["required_ready"] = _mask(self)
+
+
+class SharedState(State):
+    """A `State` over a slot of a `SharedStore`, see `SharedStore.put`.
+
+    `required_ready` returns a new set on each access, which writes changes through to the slot.
+    `copy.deepcopy` returns a `State` which is not stored in shared memory.
+    """
+
+    def __init__(self, record: Any):
+        self.__record: Optional[Any] = None
+        marks = int(record["marks"])
+        # setters ignore values assigned by `State` until the view is bound to `record`
+        super().__init__(
+                rounds=int(record["rounds"]),
+                players=tuple(
+                        SharedPlayer(PlayerID(idx), Mark.O if marks >> idx & 1 else Mark.X,
+                                     record["wins"])
+                        for idx in range(State.const_player_count())),
+                board=SharedBoard(record))
+        self.__record = record
+
+    @property
+    def rounds(self) -> int:
+        return int(self.__bound()["rounds"])
+
+    @rounds.setter
+    def rounds(self, value: int) -> None:
+        if self.__record is not None:
+            self.__record["rounds"] = value
+
+    @property
+    def phase(self) -> Phase:
+        return _PHASES[int(self.__bound()["phase"])]
+
+    @phase.setter
+    def phase(self, value: Phase) -> None:
+        if self.__record is not None:
+            self.__record["phase"] = _PHASES.index(value)
+
+    @property
+    def round(self) -> int:
+        return int(self.__bound()["round"])
+
+    @round.setter
+    def round(self, value: int) -> None:
+        if self.__record is not None:
+            self.__record["round"] = value
+
+    @property
+    def step(self) -> int:
+        return int(self.__bound()["step"])
+
+    @step.setter
+    def step(self, value: int) -> None:
+        if self.__record is not None:
+            self.__record["step"] = value
+
+    @property
+    def required_ready(self) -> set[PlayerID]:
+        return _RequiredReady(self.__bound())
+
+    @required_ready.setter
+    def required_ready(self, value: set[PlayerID]) -> None:
+        if self.__record is not None:
+            self.__record["required_ready"] = _mask(value)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> State:
+        """Returns a `State` with a `Board`, which is not stored in shared memory."""
+        players = []
+        for player in self.players:
+            players.append(Player(player.id, player.mark))
+            players[-1].wins = player.wins
+        size = self.board.size()
+        return State(
+                rounds=self.rounds,
+                players=tuple(players),
+                board=Board([[self.board.get(Cell(x, y)) for y in range(size)]
+                             for x in range(size)], win_length=self.board.win_length()),
+                phase=self.phase,
+                round_=self.round,
+                step=self.step,
+                required_ready=set(self.required_ready))
+
+    def __bound(self) -> Any:
+        assert self.__record is not None
+        return self.__record
+
+    def __eq__(self, other: object) -> bool:
+        """Compares fields, regardless of whether `other` is a `SharedState`."""
+        if not isinstance(other, State):
+            return False
+        return (self.rounds, self.phase, self.round, self.step, self.required_ready) \
+            == (other.rounds, other.phase, other.round, other.step, other.required_ready) \
+            and tuple((player.id, player.mark, player.wins) for player in self.players) \
+            == tuple((player.id, player.mark, player.wins) for player in other.players) \
+            and self.board == other.board
+
+
+def status(store: SharedStore) -> Mapping[str, np.ndarray[Any, np.dtype[Any]]]:
+    """Returns views of the fields of all slots, which are read without copying."""
+    return dict((field, store.slots[field]) for field in store.slots.dtype.names or ())
@@ -1,9 +1,28 @@
 import unittest
 import sys
+from collections.abc import Callable
 from random import randrange
 from yo1k.tic_tac_toe.game import (
-    State, Player, Board, PlayerID, Mark, Logic, World, DefaultActionQueue)
-from yo1k.tic_tac_toe.ai import RandomAI
+    State, Player, Board, PlayerID, Mark, Logic, World, DefaultActionQueue, AI)
+from yo1k.tic_tac_toe.ai import RandomAI, MinimaxAI, Minimax
+
+
+def _play(
+        new_ai_px: Callable[[PlayerID, DefaultActionQueue], AI],
+        new_ai_po: Callable[[PlayerID, DefaultActionQueue], AI]) -> State:
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+    state = State(rounds=State.default_rounds(), board=Board(), players=players)
+    world = World(
+            state,
+            Logic(action_queues),
+            (
+                    new_ai_px(players[0].id, action_queues[0]),
+                    new_ai_po(players[1].id, action_queues[1])
+            ))
+    while not Logic.is_game_over(state):
+        world.advance()
+    return state
 
 
 class RandomAITest(unittest.TestCase):
@@ -34,5 +53,82 @@ class RandomAITest(unittest.TestCase):
                 self.assertIs(True, logic.is_game_over(state))
 
 
+class WorldTest(unittest.TestCase):
+    def test_run_same_as_advance(self) -> None:
+        for _ in range(100):
+            ai_rng_seed_px = randrange(sys.maxsize)
+            ai_rng_seed_po = randrange(sys.maxsize)
+            states = []
+            for run in (False, True):
+                players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+                action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+                state = State(rounds=State.default_rounds(), board=Board(), players=players)
+                world = World(
+                        state,
+                        Logic(action_queues),
+                        (
+                                RandomAI(players[0].id, ai_rng_seed_px, action_queues[0]),
+                                RandomAI(players[1].id, ai_rng_seed_po, action_queues[1])
+                        ))
+                if run:
+                    stats = world.run()
+                    self.assertLess(0, stats.avoided_calls())
+                    self.assertEqual(stats.budget, stats.avoided_calls() + stats.ai_calls
+                                     + stats.logic_calls)
+                else:
+                    for _ in range((state.board.size() ** 2 + 1) * state.rounds):
+                        world.advance()
+                states.append(state)
+            with self.subTest(ai_rng_seed_px=ai_rng_seed_px, ai_rng_seed_po=ai_rng_seed_po):
+                self.assertIs(True, Logic.is_game_over(states[1]))
+                self.assertEqual(states[0], states[1])
+
+    def test_run_no_actions(self) -> None:
+        players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+        action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+        state = State(rounds=State.default_rounds(), board=Board(), players=players)
+        stats = World(state, Logic(action_queues), (AI(), AI())).run()
+        self.assertIs(False, Logic.is_game_over(state))
+        self.assertEqual(2, stats.ai_calls)
+        self.assertEqual(0, stats.logic_calls)
+
+
+class MinimaxAITest(unittest.TestCase):
+    def test_best_move(self) -> None:
+        ai = Minimax()
+        args_and_expect_list = [
+                # win instead of blocking
+                ([1, 1, 0, 2, 2, 0, 0, 0, 0], 1, 2),
+                ([1, 1, 0, 2, 2, 0, 1, 0, 0], 2, 5),
+                # block
+                ([1, 1, 0, 0, 2, 0, 0, 0, 0], 2, 2),
+                # fork
+                ([1, 0, 0, 0, 2, 0, 0, 0, 1], 2, 1)]
+        for pos, mark, expect in args_and_expect_list:
+            with self.subTest(pos=pos, mark=mark):
+                self.assertEqual(expect, ai.best_move(pos, mark))
+
+    def test_score(self) -> None:
+        ai = Minimax()
+        self.assertEqual(0, ai.score([0] * 9, 1))
+        self.assertEqual(5, ai.score([1, 1, 0, 2, 2, 0, 0, 0, 0], 1))
+        self.assertEqual(-3, ai.score([1, 1, 0, 1, 2, 0, 0, 0, 2], 2))
+        self.assertLess(0, ai.table_size())
+
+    def test_play_against_itself(self) -> None:
+        state = _play(MinimaxAI, MinimaxAI)
+        self.assertEqual([0, 0], [player.wins for player in state.players])
+
+    def test_play_against_random(self) -> None:
+        for _ in range(20):
+            ai_rng_seed = randrange(sys.maxsize)
+            state = _play(
+                    MinimaxAI,
+                    lambda player_id, action_queue, seed=ai_rng_seed:  # type: ignore
+                    RandomAI(player_id, seed, action_queue))
+            with self.subTest(ai_rng_seed=ai_rng_seed):
+                self.assertEqual(0, state.players[1].wins)
+
+
 if __name__ == '__main__':
     unittest.main()
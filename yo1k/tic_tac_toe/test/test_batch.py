@@ -0,0 +1,52 @@
+import unittest
+from yo1k.tic_tac_toe.game import (
+    State, Player, PlayerID, Mark, Board, Cell, Phase, Logic, Action, DefaultActionQueue)
+from yo1k.tic_tac_toe.batch import BatchSimulator
+
+
+class BatchSimulatorTest(unittest.TestCase):
+    def test_same_as_logic(self) -> None:
+        simulator = BatchSimulator(games=500, rounds=State.default_rounds(), seed=7)
+        simulator.run()
+        self.assertIs(True, simulator.is_game_over())
+        for game in range(len(simulator.boards)):
+            player_x = Player(PlayerID(0), Mark.X)
+            player_o = Player(PlayerID(1), Mark.O)
+            action_queues = (DefaultActionQueue(player_x.id), DefaultActionQueue(player_o.id))
+            state = State(rounds=simulator.rounds, board=Board(), players=(player_x, player_o))
+            logic = Logic(action_queues)
+            for round_ in range(simulator.rounds):
+                for action_queue in action_queues:
+                    action_queue.add(Action.new_ready())
+                logic.advance(state)
+                for move in simulator.moves[game, round_]:
+                    action_queues[state.turn().idx].add(
+                            Action.new_occupy(Cell(*divmod(int(move), state.board.size()))))
+                    logic.advance(state)
+                    if state.phase is not Phase.INROUND:
+                        break
+                with self.subTest(game=game, round=round_):
+                    self.assertEqual(simulator.steps[game, round_], state.step)
+            with self.subTest(game=game):
+                self.assertIs(True, Logic.is_game_over(state))
+                self.assertEqual([player_x.wins, player_o.wins], list(simulator.wins[game]))
+                self.assertEqual(
+                        [[None if value == 0 else BatchSimulator.mark(value) for value in row]
+                         for row in simulator.boards[game]],
+                        state.board.cells)  # type: ignore
+
+    def test_outcomes(self) -> None:
+        simulator = BatchSimulator(games=1000, rounds=3, seed=1)
+        simulator.run()
+        for player_idx in range(State.const_player_count()):
+            self.assertEqual(
+                    list((simulator.outcomes == player_idx).sum(axis=1)),
+                    list(simulator.wins[:, player_idx]))
+        draws = (simulator.outcomes == BatchSimulator.const_draw()).sum(axis=1)
+        self.assertEqual(
+                [simulator.rounds] * len(simulator.boards),
+                list(simulator.wins.sum(axis=1) + draws))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from yo1k.tic_tac_toe import bench
+
+
+class BenchTest(unittest.TestCase):
+    def test_core(self) -> None:
+        results = bench.core(scale=0.01)
+        for name in ("Board.set", "Board.get", "Board.clear", "Logic.is_win",
+                     "Logic.advance BEGINNING", "Logic.advance INROUND",
+                     "Logic.advance OUTROUND", "RandomAI.act",
+                     "World.run 1 rounds", "World.run 5 rounds", "World.run 25 rounds"):
+            self.assertIn(name, results)
+        for (name, (value, _)) in results.items():
+            self.assertGreater(value, 0, name)
+
+    def test_core_imports(self) -> None:
+        """`core` imports neither the other areas of the package nor their dependencies."""
+        script = ("import sys\n"
+                  "from yo1k.tic_tac_toe import bench\n"
+                  "bench.core(scale=0.001)\n"
+                  "print(*sys.modules)")
+        modules = subprocess.run(
+                [sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                env=dict(os.environ, PYTHONPATH=str(Path(__file__).parents[3]))).stdout.split()
+        self.assertIn("yo1k.tic_tac_toe.ai", modules)
+        for module in ("numpy", "asyncio", "yo1k.tic_tac_toe.bench_simulation",
+                       "yo1k.tic_tac_toe.bench_search", "yo1k.tic_tac_toe.bench_hosting",
+                       "yo1k.tic_tac_toe.mcts", "yo1k.tic_tac_toe.replay",
+                       "yo1k.tic_tac_toe.server"):
+            self.assertNotIn(module, modules)
+
+    def test_regressions(self) -> None:
+        baseline = {
+                "fast": (100.0, "ns/op"),
+                "throughput": (100.0, "games/s"),
+                "memory": (100.0, "bytes/game"),
+                "count": (100.0, "calls"),
+                "unit changed": (100.0, "ns/op")}
+        self.assertEqual(bench.regressions(baseline, baseline, 0.1), {})
+        results = {
+                "fast": (111.0, "ns/op"),
+                "throughput": (89.0, "games/s"),
+                "memory": (109.0, "bytes/game"),
+                "count": (1.0, "calls"),
+                "unit changed": (1_000.0, "us/op"),
+                "new": (1.0, "ns/op")}
+        worse = bench.regressions(results, baseline, 0.1)
+        self.assertEqual(set(worse), {"fast", "throughput"})
+        self.assertAlmostEqual(worse["fast"], 0.11)
+        self.assertAlmostEqual(worse["throughput"], -0.11)
+        better = {"fast": (50.0, "ns/op"), "throughput": (200.0, "games/s")}
+        self.assertEqual(bench.regressions(better, baseline, 0.1), {})
+
+    def test_json(self) -> None:
+        results = {"Board.get": (120.5, "ns/op"), "World.run 1 rounds": (10_000.0, "games/s")}
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "bench.json"
+            bench.write_json(results, path)
+            self.assertEqual(bench.read_json(path), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
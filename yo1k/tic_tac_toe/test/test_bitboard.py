@@ -0,0 +1,136 @@
+import unittest
+import sys
+from unittest import mock
+from collections.abc import Sequence
+from random import randrange
+from typing import Optional
+from yo1k.tic_tac_toe.game import (
+    AbstractBoard,
+    Board,
+    Cell,
+    DefaultActionQueue,
+    Logic,
+    Mark,
+    Player,
+    PlayerID,
+    State,
+    World)
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.bitboard import BitBoard
+from yo1k.tic_tac_toe.test import test_game
+
+_new_state = test_game._new_state  # pylint: disable=W0212
+
+
+def _bit_board(cells: Sequence[Sequence[Optional[Mark]]]) -> BitBoard:
+    board = BitBoard()
+    for (x, row) in enumerate(cells):
+        for (y, mark) in enumerate(row):
+            if mark is not None:
+                board.set(Cell(x, y), mark)
+    return board
+
+
+def _cells(board: AbstractBoard) -> Sequence[Sequence[Optional[Mark]]]:
+    return [[board.get(Cell(x, y)) for y in range(board.size())] for x in range(board.size())]
+
+
+def _play(board: AbstractBoard, ai_rng_seed_px: int, ai_rng_seed_po: int) -> State:
+    player_x = Player(PlayerID(0), Mark.X)
+    player_o = Player(PlayerID(1), Mark.O)
+    act_queue_px = DefaultActionQueue(player_x.id)
+    act_queue_po = DefaultActionQueue(player_o.id)
+    state = State(rounds=State.default_rounds(), board=board, players=(player_x, player_o))
+    world = World(
+            state,
+            Logic((act_queue_px, act_queue_po)),
+            (
+                    RandomAI(player_x.id, ai_rng_seed_px, act_queue_px),
+                    RandomAI(player_o.id, ai_rng_seed_po, act_queue_po)
+            ))
+    for _ in range((state.board.size() ** 2 + 1) * state.rounds):
+        world.advance()
+    return state
+
+
+def _new_bit_state(*args: object, board: Optional[AbstractBoard] = None,
+                   **kwargs: object) -> State:
+    """Returns the `State` made by `test_game._new_state` with a `BitBoard` with the cells
+    of `board`, if it is of the size and the `win_length` supported by `BitBoard`."""
+    if board is None or (board.size() == AbstractBoard.const_size()
+                         and board.win_length() == AbstractBoard.const_size()):
+        board = _bit_board(_cells(board if board is not None else Board()))
+    return _new_state(*args, board=board, **kwargs)  # type: ignore
+
+
+class BitBoardLogicTest(unittest.TestCase):
+    """Runs the tests of the base class on `State`s made by `_new_bit_state`."""
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(test_game, "_new_state", _new_bit_state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class BitBoardLogicSingleActionTest(BitBoardLogicTest, test_game.LogicSingleActionTest):
+    pass
+
+
+class BitBoardLogicMultipleActionsTest(BitBoardLogicTest, test_game.LogicMultipleActionsTest):
+    pass
+
+
+class BitBoardMakeUnmakeTest(BitBoardLogicTest, test_game.MakeUnmakeTest):
+    pass
+
+
+class BitBoardTest(unittest.TestCase):
+    def test_set_get_clear(self) -> None:
+        board = BitBoard()
+        board.set(Cell(0, 2), Mark.X)
+        board.set(Cell(2, 0), Mark.O)
+        self.assertEqual(
+                [[None, None, Mark.X], [None, None, None], [Mark.O, None, None]],
+                _cells(board))
+        board.clear()
+        self.assertEqual(BitBoard(), board)
+
+    def test_win_condition(self) -> None:
+        args_and_expect_list = [
+                ([[Mark.X, Mark.X, Mark.X], [None, None, None], [None, None, None]],
+                 Cell(0, 0), True),
+                ([[None, None, None], [Mark.O, Mark.O, Mark.O], [None, None, None]],
+                 Cell(1, 0), True),
+                ([[Mark.X, None, None], [Mark.X, None, None], [Mark.X, None, None]],
+                 Cell(1, 0), True),
+                ([[None, None, Mark.O], [None, None, Mark.O], [None, None, Mark.O]],
+                 Cell(1, 2), True),
+                ([[Mark.X, None, None], [None, Mark.X, None], [None, None, Mark.X]],
+                 Cell(2, 2), True),
+                ([[None, None, Mark.X], [None, Mark.X, None], [Mark.X, None, None]],
+                 Cell(1, 1), True),
+                ([[Mark.X, Mark.X, None], [Mark.X, None, None], [None, None, None]],
+                 Cell(1, 0), False),
+                ([[None, Mark.X, None], [None, None, Mark.X], [None, Mark.X, None]],
+                 Cell(0, 1), False),
+                ([[Mark.X, Mark.O, Mark.X], [None, None, None], [None, None, None]],
+                 Cell(0, 2), False)]
+        for cells, cell, expect in args_and_expect_list:
+            with self.subTest(expect=expect, cell=cell, cells=cells):
+                self.assertEqual(expect, Logic.is_win(_bit_board(cells), cell))  # type: ignore
+                self.assertEqual(expect, Logic.is_win(Board(cells), cell))  # type: ignore
+
+    def test_play_same_as_board(self) -> None:
+        for _ in range(100):
+            ai_rng_seed_px = randrange(sys.maxsize)
+            ai_rng_seed_po = randrange(sys.maxsize)
+            expected_state = _play(Board(), ai_rng_seed_px, ai_rng_seed_po)
+            state = _play(BitBoard(), ai_rng_seed_px, ai_rng_seed_po)
+            with self.subTest(ai_rng_seed_px=ai_rng_seed_px, ai_rng_seed_po=ai_rng_seed_po):
+                self.assertIs(True, Logic.is_game_over(state))
+                self.assertEqual(expected_state.players, state.players)
+                self.assertEqual(_cells(expected_state.board), _cells(state.board))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import io
+import unittest
+import sys
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from contextlib import redirect_stdout
+from random import randrange
+from yo1k.tic_tac_toe import book, position
+from yo1k.tic_tac_toe.ai import Minimax, RandomAI
+from yo1k.tic_tac_toe.book import Book, BookAI, Outcome
+from yo1k.tic_tac_toe.game import (
+    State, Player, Board, PlayerID, Mark, Logic, World, DefaultActionQueue)
+
+
+def _reachable(pos: position.Position, mark: int) -> Iterator[tuple[position.Position, int]]:
+    """Yields non-terminal positions reachable from the non-terminal `pos`
+    with the player with the `mark` to move."""
+    yield pos, mark
+    for (idx, v) in enumerate(pos):
+        if v == 0:
+            child = list(pos)
+            child[idx] = mark
+            if not position.is_win(child, idx) and child.count(0) > 0:
+                yield from _reachable(child, position.other(mark))
+
+
+class BookTest(unittest.TestCase):
+    book: Book
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.book = Book()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.book.close()
+
+    def test_generate_same_as_shipped(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "book.bin"
+            self.assertEqual(2 * 5478, Book.generate(path))
+            self.assertEqual(Book.default_path().read_bytes(), path.read_bytes())
+
+    def test_main(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "book.bin"
+            output = io.StringIO()
+            with redirect_stdout(output):
+                book.main([str(path)])
+            self.assertIn(f"written to {path}", output.getvalue())
+            self.assertEqual(Book.const_file_size(), path.stat().st_size)
+        output = io.StringIO()
+        with redirect_stdout(output), self.assertRaises(SystemExit):
+            book.main(["--help"])
+        self.assertIn("usage: python -m yo1k.tic_tac_toe book", output.getvalue())
+
+    def test_same_as_minimax(self) -> None:
+        minimax = Minimax()
+        for first in (position.value(Mark.X), position.value(Mark.O)):
+            positions = dict(
+                    (position.key(pos), (pos, mark)) for (pos, mark) in _reachable([0] * 9, first))
+            for (pos, mark) in positions.values():
+                score = minimax.score(pos, mark)
+                expected_outcome = Outcome.WIN if score > 0 \
+                    else Outcome.LOSS if score < 0 \
+                    else Outcome.DRAW
+                self.assertEqual(
+                        (minimax.best_move(pos, mark), expected_outcome),
+                        BookTest.book.lookup(pos, mark),
+                        f"{pos}, {mark}")
+
+    def test_terminal_and_unreachable(self) -> None:
+        x = position.value(Mark.X)
+        o = position.value(Mark.O)
+        self.assertEqual(
+                (Book.const_no_move(), Outcome.LOSS),
+                BookTest.book.lookup([1, 1, 1, 2, 2, 0, 0, 0, 0], o))
+        self.assertEqual(
+                (Book.const_no_move(), Outcome.DRAW),
+                BookTest.book.lookup([1, 2, 1, 1, 2, 2, 2, 1, 1], o))
+        self.assertIsNone(BookTest.book.lookup([1, 1, 1, 0, 0, 0, 0, 0, 0], o))
+        self.assertIsNone(BookTest.book.lookup([1, 1, 1, 2, 2, 0, 0, 0, 0], x))
+
+    def test_play_against_random(self) -> None:
+        for _ in range(20):
+            ai_rng_seed = randrange(sys.maxsize)
+            players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+            action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+            state = State(rounds=State.default_rounds(), board=Board(), players=players)
+            world = World(
+                    state,
+                    Logic(action_queues),
+                    (
+                            BookAI(players[0].id, action_queues[0], BookTest.book),
+                            RandomAI(players[1].id, ai_rng_seed, action_queues[1])
+                    ))
+            while not Logic.is_game_over(state):
+                world.advance()
+            with self.subTest(ai_rng_seed=ai_rng_seed):
+                self.assertEqual(0, players[1].wins)
+
+
+if __name__ == "__main__":
+    unittest.main()
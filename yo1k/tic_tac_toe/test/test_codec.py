@@ -0,0 +1,70 @@
+import unittest
+import sys
+from random import Random, randrange
+from yo1k.tic_tac_toe import codec
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.game import (
+    State, Player, Board, PlayerID, Mark, Phase, Logic, World, DefaultActionQueue)
+
+
+def _random_state(seed: int) -> State:
+    """Returns a `State` reached by playing a random number of steps of a game between
+    `RandomAI`s with random marks, rounds and wins."""
+    rng = Random(seed)
+    marks = rng.choice(((Mark.X, Mark.O), (Mark.O, Mark.X)))
+    players = (Player(PlayerID(0), marks[0]), Player(PlayerID(1), marks[1]))
+    action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+    rounds = rng.randrange(1, 0xFFFF)
+    state = State(rounds=rounds, players=players, board=Board())
+    world = World(
+            state,
+            Logic(action_queues),
+            tuple(RandomAI(player.id, rng.randrange(sys.maxsize), action_queue)
+                  for (player, action_queue) in zip(players, action_queues)))
+    for _ in range(rng.randrange(3 * (state.board.size() ** 2 + 1))):
+        world.advance()
+    state.round = rng.randrange(rounds)
+    for player in players:
+        player.wins = rng.randrange(rounds)
+    return state
+
+
+class CodecTest(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        phases = set()
+        for _ in range(1000):
+            seed = randrange(sys.maxsize)
+            state = _random_state(seed)
+            phases.add(state.phase)
+            encoded = codec.encode(state)
+            with self.subTest(seed=seed):
+                self.assertEqual(codec.RECORD.size, len(encoded))
+                self.assertEqual(state, codec.decode(encoded))
+        self.assertEqual(set(Phase), phases)
+
+    def test_round_trip_in_place(self) -> None:
+        states = [_random_state(seed) for seed in range(100)]
+        buffer = bytearray(codec.RECORD.size * len(states))
+        view = memoryview(buffer)
+        for (idx, state) in enumerate(states):
+            codec.encode_into(state, view, idx * codec.RECORD.size)
+        self.assertEqual(
+                states,
+                [codec.decode(view, idx * codec.RECORD.size) for idx in range(len(states))])
+
+    def test_decode_invalid(self) -> None:
+        encoded = codec.encode(_random_state(0))
+        for (idx, value) in ((0, 0), (0, 2), (1, 0b11), (1, 0b1000000)):
+            invalid = bytearray(encoded)
+            invalid[idx] = value
+            with self.subTest(idx=idx, value=value):
+                with self.assertRaises(ValueError):
+                    codec.decode(invalid)
+        invalid = bytearray(encoded)
+        invalid[-4:] = (0b11).to_bytes(4, "little")
+        with self.assertRaises(ValueError):
+            codec.decode(invalid)
+
+
+if __name__ == "__main__":
+    unittest.main()
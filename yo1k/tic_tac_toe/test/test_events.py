@@ -0,0 +1,103 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+from yo1k.tic_tac_toe import events
+from yo1k.tic_tac_toe.events import (
+    Draw, FirstMoverStats, GameOver, Move, OpeningStats, RoundWon, Surrender, aggregate,
+    game_events)
+from yo1k.tic_tac_toe.game import (
+    AI, Action, Board, Cell, DefaultActionQueue, Mark, Player, PlayerID, State)
+from yo1k.tic_tac_toe.registry import AIS
+from yo1k.tic_tac_toe.tournament import game_seeds, play_game
+
+
+def _new_game(rounds: int) -> tuple[State, tuple[DefaultActionQueue, ...]]:
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    return (State(rounds=rounds, players=players, board=Board()),
+            tuple(DefaultActionQueue(player.id) for player in players))
+
+
+class EventsTest(unittest.TestCase):
+    def test_games(self) -> None:
+        random_ais = (AIS["random"], AIS["random"])
+        stream = iter(game_events(random_ais, games=20, rounds=3, seed=5))
+        for game in range(20):
+            expected = play_game(random_ais, 3, game_seeds(5, game))
+            moves = 0
+            for event in stream:
+                with self.subTest(game=game, event=event):
+                    if isinstance(event, Move):
+                        self.assertEqual(moves, event.step)
+                        moves += 1
+                    elif isinstance(event, (RoundWon, Draw)):
+                        moves = 0
+                    elif isinstance(event, GameOver):
+                        self.assertEqual(2, event.round)
+                        self.assertEqual(
+                                tuple(player.wins for player in expected.players), event.wins)
+                        break
+                    else:
+                        self.fail()
+        self.assertIsNone(next(stream, None))
+
+    def test_lazy(self) -> None:
+        stream = game_events((AIS["random"], AIS["random"]), games=10 ** 12)
+        self.assertIsInstance(next(stream), Move)
+
+    def test_human(self) -> None:
+        (state, action_queues) = _new_game(2)
+        stream = events.events(state, action_queues, (AI(), AI()))
+        self.assertIsNone(next(stream, None))
+        for action_queue in action_queues:
+            action_queue.add(Action.new_ready())
+        action_queues[0].add(Cell(1, 1).occupy)
+        stream = events.events(state, action_queues, (AI(), AI()))
+        self.assertEqual(Move(0, 0, PlayerID(0), Cell(1, 1)), next(stream))
+        self.assertIsNone(next(stream, None))
+        action_queues[1].add(Action.new_surrender())
+        for action_queue in action_queues:
+            action_queue.add(Action.new_ready())
+        action_queues[1].add(Action.new_surrender())
+        self.assertEqual(
+                [Surrender(0, 1, PlayerID(1)), RoundWon(0, PlayerID(0)),
+                 Surrender(1, 0, PlayerID(1)), RoundWon(1, PlayerID(0)), GameOver(1, (2, 0))],
+                list(events.events(state, action_queues, (AI(), AI()))))
+
+
+class AggregatorTest(unittest.TestCase):
+    def test_first_mover(self) -> None:
+        stats = FirstMoverStats()
+        aggregate((Move(0, 0, PlayerID(0), Cell(0, 0)), Move(0, 1, PlayerID(1), Cell(1, 1)),
+                   RoundWon(0, PlayerID(0)),
+                   Move(1, 0, PlayerID(1), Cell(2, 2)), Surrender(1, 1, PlayerID(0)),
+                   RoundWon(1, PlayerID(1)),
+                   Surrender(2, 0, PlayerID(0)), RoundWon(2, PlayerID(1)),
+                   Move(3, 0, PlayerID(1), Cell(0, 0)), Draw(3), GameOver(3, (1, 2))),
+                  (stats,))
+        self.assertEqual((2, 1, 1), (stats.first_mover_wins, stats.second_mover_wins, stats.draws))
+        self.assertEqual((0.5, 0.25, 0.25), stats.win_rates())
+        self.assertEqual((0, 0, 0), FirstMoverStats().win_rates())
+
+    def test_games(self) -> None:
+        first_mover = FirstMoverStats()
+        openings = OpeningStats()
+        count = aggregate(game_events((AIS["minimax"], AIS["random"]), 200, rounds=2),
+                          (first_mover, openings))
+        self.assertGreater(count, 200 * 2 * 5)
+        self.assertEqual(400, first_mover.rounds)
+        self.assertEqual(400, sum(openings.counts.values()))
+        self.assertAlmostEqual(1, sum(openings.frequencies().values()))
+        # minimax always opens in the same cell, in every other round
+        self.assertGreaterEqual(max(openings.counts.values()), 200)
+        self.assertGreater(first_mover.first_mover_wins, first_mover.second_mover_wins)
+
+    def test_main(self) -> None:
+        output = io.StringIO()
+        with redirect_stdout(output):
+            events.main(["random", "random", "--games", "50"])
+        self.assertIn("first mover wins", output.getvalue())
+        self.assertIn("opening (1, 1)", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
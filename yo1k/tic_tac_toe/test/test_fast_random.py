@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import unittest
+from collections import Counter
+from pathlib import Path
+from yo1k.tic_tac_toe.events import Move, game_events
+from yo1k.tic_tac_toe.fast_random import FastRandomAI, new_rng
+from yo1k.tic_tac_toe.game import (
+    Board, Cell, DefaultActionQueue, Mark, Phase, Player, PlayerID, State)
+from yo1k.tic_tac_toe.registry import AIS
+
+_MOVES = [(0, 0), (2, 1), (0, 2), (2, 2), (1, 0), (1, 2), (2, 0),
+          (2, 2), (0, 0), (1, 2), (0, 2), (1, 0), (2, 0), (1, 1)]
+"""Moves of the game seeded with `7` in `_moves`, which must be the same on all platforms."""
+
+
+def _moves(seed: int) -> list[tuple[int, int]]:
+    return [(event.cell.x, event.cell.y)
+            for event in game_events((AIS["fast_random"], AIS["fast_random"]), 1, 2, seed)
+            if isinstance(event, Move)]
+
+
+def _new_state(board: Board) -> State:
+    return State(rounds=1, players=(Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O)),
+                 board=board, phase=Phase.INROUND, required_ready=set())
+
+
+class FastRandomAITest(unittest.TestCase):
+    def test_reproducible(self) -> None:
+        self.assertEqual(_MOVES, _moves(7))
+        self.assertNotEqual(_MOVES, _moves(8))
+        result = subprocess.run(
+                [sys.executable, "-c",
+                 "from yo1k.tic_tac_toe.test.test_fast_random import _moves; print(_moves(7))"],
+                capture_output=True, text=True, check=True,
+                env=dict(os.environ, PYTHONPATH=str(Path(__file__).parents[3]),
+                         PYTHONHASHSEED="1"))
+        self.assertEqual(str(_MOVES), result.stdout.strip())
+
+    def test_batch(self) -> None:
+        """Choices do not depend on the size of batches."""
+        choices = []
+        for batch in (1, 7, 256):
+            board = Board(size=5)
+            state = _new_state(board)
+            ai = FastRandomAI(PlayerID(0), new_rng(3), DefaultActionQueue(PlayerID(0)), batch)
+            for step in range(25):
+                cell = ai.choose(state)
+                board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+            choices.append(board.cells)
+        self.assertEqual(choices[0], choices[1])
+        self.assertEqual(choices[0], choices[2])
+
+    def test_uniform(self) -> None:
+        state = _new_state(Board())
+        state.board.set(Cell(1, 1), Mark.X)
+        ai = FastRandomAI(PlayerID(0), new_rng(0), DefaultActionQueue(PlayerID(0)))
+        counts = Counter(ai.choose(state) for _ in range(80_000))
+        self.assertEqual(8, len(counts))
+        self.assertNotIn(Cell(1, 1), counts)
+        for count in counts.values():
+            self.assertAlmostEqual(10_000, count, delta=500)
+
+
+if __name__ == "__main__":
+    unittest.main()
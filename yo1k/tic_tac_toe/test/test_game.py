@@ -1,9 +1,22 @@
+import copy
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
 import unittest
+from pathlib import Path
+from random import Random
 from collections.abc import MutableSequence, Sequence
 from typing import Optional
 from yo1k.tic_tac_toe.game import (
+    AbstractBoard,
     ActionQueue,
     Action,
+    ConcurrentActionQueue,
+    DefaultActionQueue,
+    UndoStack,
     Phase,
     Player,
     State,
@@ -11,7 +24,9 @@ from yo1k.tic_tac_toe.game import (
     Board,
     Cell,
     Mark,
-    PlayerID)
+    PlayerID,
+    ValidatingActionQueue)
+from yo1k.tic_tac_toe.bitboard import BitBoard
 
 
 class ListActionQueue(ActionQueue):
@@ -39,7 +54,7 @@ def _new_state(
         rounds: int = State.default_rounds(),
         player_x: Optional[Player] = None,
         player_o: Optional[Player] = None,
-        board: Optional[Board] = None,
+        board: Optional[AbstractBoard] = None,
         phase: Phase = Phase.INROUND,
         round_: int = 0,
         step: int = 0,
@@ -293,5 +308,276 @@ class LogicMultipleActionsTest(unittest.TestCase):
         self.assertEqual(expected_state, state)
 
 
+def _is_win_brute_force(board: Board, last_occupied: Cell) -> bool:
+    size = board.size()
+    mark = board.get(last_occupied)
+    for (dx, dy) in ((1, 0), (0, 1), (1, 1), (1, -1)):
+        for start in range(-board.win_length() + 1, 1):
+            line = [(last_occupied.x + (start + i) * dx, last_occupied.y + (start + i) * dy)
+                    for i in range(board.win_length())]
+            if all(0 <= x < size and 0 <= y < size and board.get(Cell(x, y)) is mark
+                   for (x, y) in line):
+                return True
+    return False
+
+
+class BoardTest(unittest.TestCase):
+    def test_is_win__win_length(self) -> None:
+        board = Board(size=15, win_length=5)
+        for (x, y) in ((3, 3), (4, 4), (5, 5), (7, 7)):
+            board.set(Cell(x, y), Mark.X)
+        self.assertFalse(board.is_win(Cell(7, 7)))
+        board.set(Cell(6, 6), Mark.X)
+        self.assertTrue(board.is_win(Cell(6, 6)))
+        self.assertTrue(board.is_win(Cell(3, 3)))
+        board.set(Cell(2, 2), Mark.O)
+        self.assertFalse(board.is_win(Cell(2, 2)))
+
+    def test_is_win__edges(self) -> None:
+        board = Board(size=19, win_length=5)
+        for i in range(5):
+            board.set(Cell(18 - i, i), Mark.O)
+        self.assertTrue(board.is_win(Cell(16, 2)))
+        for x in range(14, 18):
+            board.set(Cell(x, 18), Mark.X)
+        self.assertFalse(board.is_win(Cell(17, 18)))
+        board.set(Cell(18, 18), Mark.X)
+        self.assertTrue(board.is_win(Cell(18, 18)))
+
+    def test_is_win__same_as_brute_force(self) -> None:
+        rng = Random(0)
+        for (size, win_length) in ((3, 3), (4, 3), (7, 4), (15, 5)):
+            cells = [Cell(x, y) for x in range(size) for y in range(size)]
+            for _ in range(50):
+                rng.shuffle(cells)
+                board = Board(size=size, win_length=win_length)
+                for (step, cell) in enumerate(cells):
+                    board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+                    with self.subTest(size=size, win_length=win_length, board=board, cell=cell):
+                        self.assertEqual(_is_win_brute_force(board, cell), board.is_win(cell))
+
+    def test_empty_cells(self) -> None:
+        rng = Random(0)
+        for size in (1, 3, 15):
+            board = Board(size=size)
+            for _ in range(3):
+                cells = [Cell(x, y) for x in range(size) for y in range(size)]
+                rng.shuffle(cells)
+                for (step, cell) in enumerate(cells):
+                    with self.subTest(size=size, board=board):
+                        self.assertEqual(len(cells) - step, board.empty_count())
+                        self.assertEqual(
+                                set(cells[step:]),
+                                set(board.empty_cell(i) for i in range(board.empty_count())))
+                        self.assertEqual(set(cells[step:]), set(board.empty_cells()))
+                        self.assertEqual(board, Board([list(row) for row in board.cells]))
+                    board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+                self.assertEqual(0, board.empty_count())
+                board.clear()
+                self.assertEqual(Board(size=size), board)
+
+    def test_logic__large_board(self) -> None:
+        state = _new_state(rounds=1, board=Board(size=15, win_length=5))
+        self.assertFalse(Logic.is_valid(state, PlayerID(0), Action.new_occupy(Cell(15, 0))))
+        actions: tuple[list[Optional[Action]], list[Optional[Action]]] = ([], [])
+        for i in range(5):
+            actions[0].append(Action.new_occupy(Cell(i, 14)))
+            actions[1].append(Action.new_occupy(Cell(i, 0)))
+        logic = Logic((ListActionQueue(PlayerID(0), actions[0]),
+                       ListActionQueue(PlayerID(1), actions[1])))
+        while not Logic.is_game_over(state):
+            logic.advance(state)
+        self.assertEqual((1, 0), (state.players[0].wins, state.players[1].wins))
+        self.assertEqual(8, state.step)
+
+
+def _random_valid_action(state: State, rng: Random) -> tuple[PlayerID, Action]:
+    player_id = rng.choice(sorted(Logic.awaited(state), key=lambda player_id: player_id.idx))
+    if state.phase is not Phase.INROUND:
+        return player_id, Action.new_ready()
+    elif rng.random() < 0.05:
+        return player_id, Action.new_surrender()
+    else:
+        board = state.board
+        return player_id, Action.new_occupy(board.empty_cell(rng.randrange(board.empty_count())))
+
+
+class MakeUnmakeTest(unittest.TestCase):
+    def test_unmake_reverts_make(self) -> None:
+        rng = Random(0)
+        for (rounds, board) in ((3, Board()), (2, Board(size=5, win_length=3)), (1, BitBoard())):
+            for _ in range(50):
+                state = _new_state(
+                        rounds=rounds, board=board, phase=Phase.BEGINNING,
+                        required_ready={PlayerID(0), PlayerID(1)})
+                undo = UndoStack()
+                snapshots = []
+                while not Logic.is_game_over(state):
+                    snapshots.append(copy.deepcopy(state))
+                    (player_id, action) = _random_valid_action(state, rng)
+                    Logic.make(state, player_id, action, undo)
+                    if rng.random() < 0.3:
+                        made = copy.deepcopy(state)
+                        Logic.unmake(state, undo)
+                        self.assertEqual(snapshots[-1], state)
+                        Logic.redo(state, undo)
+                        self.assertEqual(made, state)
+                final = copy.deepcopy(state)
+                while len(snapshots) > 0:
+                    Logic.unmake(state, undo)
+                    with self.subTest(rounds=rounds, board=board, state=state):
+                        self.assertEqual(snapshots.pop(), state)
+                while len(undo.undone) > 0:
+                    Logic.redo(state, undo)
+                self.assertEqual(final, state)
+                board.clear()
+
+    def test_make_same_as_advance(self) -> None:
+        rng = Random(1)
+        for _ in range(50):
+            state = _new_state(
+                    rounds=3, phase=Phase.BEGINNING, required_ready={PlayerID(0), PlayerID(1)})
+            advanced = copy.deepcopy(state)
+            applied = copy.deepcopy(state)
+            action_queues = (DefaultActionQueue(PlayerID(0)), DefaultActionQueue(PlayerID(1)))
+            logic = Logic(action_queues)
+            undo = UndoStack()
+            while not Logic.is_game_over(state):
+                (player_id, action) = _random_valid_action(state, rng)
+                Logic.make(state, player_id, action, undo)
+                Logic.apply(applied, player_id, action)
+                action_queues[player_id.idx].add(action)
+                logic.advance(advanced)
+                self.assertEqual(advanced, state)
+                self.assertEqual(advanced, applied)
+
+
+class ValueTypesTest(unittest.TestCase):
+    def test_interned(self) -> None:
+        self.assertIs(Cell(1, 2), Cell(1, 2))
+        self.assertIsNot(Cell(1, 2), Cell(2, 1))
+        self.assertIs(PlayerID(1), PlayerID(1))
+        self.assertIs(Action.new_ready(), Action.new_ready())
+        self.assertIs(Action.new_surrender(), Action.new_surrender())
+        self.assertIs(Action.new_occupy(Cell(0, 1)), Action.new_occupy(Cell(0, 1)))
+        self.assertIs(Cell(0, 1), Action.new_occupy(Cell(0, 1)).occupy)
+
+    def test_pickle(self) -> None:
+        self.assertIs(Cell(2, 0), pickle.loads(pickle.dumps(Cell(2, 0))))
+        self.assertIs(PlayerID(0), pickle.loads(pickle.dumps(PlayerID(0))))
+        player = Player(PlayerID(1), Mark.O)
+        player.wins = 3
+        self.assertEqual(player, pickle.loads(pickle.dumps(player)))
+
+    def test_immutable(self) -> None:
+        for (obj, attr) in ((Cell(0, 0), "x"), (PlayerID(0), "idx"),
+                            (Action.new_ready(), "ready"), (Player(PlayerID(0), Mark.X), "mark")):
+            with self.subTest(obj=obj, attr=attr):
+                with self.assertRaises(AttributeError):
+                    setattr(obj, attr, None)
+
+    def test_eq(self) -> None:
+        self.assertEqual(Player(PlayerID(0), Mark.X), Player(PlayerID(0), Mark.X))
+        self.assertNotEqual(Player(PlayerID(0), Mark.X), Player(PlayerID(0), Mark.O))
+        self.assertNotEqual(Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.X))
+        player = Player(PlayerID(0), Mark.X)
+        player.wins = 1
+        self.assertNotEqual(Player(PlayerID(0), Mark.X), player)
+        self.assertEqual({PlayerID(0)}, {PlayerID(0)})
+
+
+class ConcurrentActionQueueTest(unittest.TestCase):
+    def test_single_thread(self) -> None:
+        added = []
+        action_queue = ConcurrentActionQueue(PlayerID(0), capacity=3)
+        action_queue.on_add = lambda: added.append(True)
+        self.assertIsNone(action_queue.pop())
+        self.assertFalse(action_queue.wait(0))
+        actions = [Cell(0, y).occupy for y in range(3)]
+        for action in actions:
+            action_queue.add(action)
+        self.assertEqual(3, len(added))
+        with self.assertRaises(queue.Full):
+            action_queue.add(Action.new_ready(), timeout=0.01)
+        self.assertTrue(action_queue.wait(0))
+        self.assertIs(actions[0], action_queue.pop())
+        action_queue.add(Action.new_ready(), timeout=0)
+        self.assertEqual([*actions[1:], Action.new_ready()], action_queue.pop_all())
+        self.assertEqual([], action_queue.pop_all())
+        self.assertFalse(action_queue.has_actions())
+        for action in actions:
+            action_queue.add(action, timeout=0)
+
+    def test_wait(self) -> None:
+        action_queue = ConcurrentActionQueue(PlayerID(0))
+        producer = threading.Timer(0.05, action_queue.add, (Action.new_ready(),))
+        producer.start()
+        self.assertTrue(action_queue.wait(10))
+        self.assertIs(Action.new_ready(), action_queue.pop())
+        producer.join()
+
+    def test_producers(self) -> None:
+        """Producers add more actions than fit in the queue while the consumer drains it."""
+        (producers, actions, capacity) = (8, 3_000, 5)
+        action_queue = ConcurrentActionQueue(PlayerID(0), capacity)
+
+        def produce(x: int) -> None:
+            for y in range(actions):
+                action_queue.add(Cell(x, y % 10).occupy)
+        threads = [threading.Thread(target=produce, args=(x,)) for x in range(producers)]
+        for thread in threads:
+            thread.start()
+        popped: list[list[int]] = [[] for _ in range(producers)]
+        while sum(len(ys) for ys in popped) < producers * actions:
+            self.assertTrue(action_queue.wait(10))
+            batch = action_queue.pop_all()
+            self.assertLessEqual(len(batch), capacity)
+            for action in batch:
+                assert action.occupy is not None
+                popped[action.occupy.x].append(action.occupy.y)
+        for thread in threads:
+            thread.join()
+        self.assertFalse(action_queue.has_actions())
+        for ys in popped:
+            self.assertEqual([y % 10 for y in range(actions)], ys)
+
+
+class ValidatingActionQueueTest(unittest.TestCase):
+    def test_reject(self) -> None:
+        state = _new_state(board=Board([[Mark.X, None, None], [None] * 3, [None] * 3]), step=1)
+        queue_x = ValidatingActionQueue(PlayerID(0), state)
+        queue_o = ValidatingActionQueue(PlayerID(1), state)
+        for (action_queue, action) in (
+                (queue_x, Action.new_occupy(Cell(1, 1))),
+                (queue_o, Action.new_occupy(Cell(0, 0))),
+                (queue_o, Action.new_occupy(Cell(3, 0))),
+                (queue_o, Action.new_ready())):
+            with self.subTest(player_id=action_queue.player_id(), action=action):
+                with self.assertRaises(ValueError):
+                    action_queue.add(action)
+                self.assertFalse(action_queue.has_actions())
+        queue_o.add(Action.new_occupy(Cell(1, 1)))
+        with self.assertRaises(ValueError):
+            queue_o.add(Action.new_surrender())
+        Logic((queue_x, queue_o)).advance(state)
+        self.assertIs(Mark.O, state.board.get(Cell(1, 1)))
+        state.phase = Phase.OUTROUND
+        state.round = state.rounds - 1
+        with self.assertRaises(ValueError):
+            queue_x.add(Action.new_ready())
+
+    @unittest.skipUnless(__debug__, "runs itself in the trusted mode")
+    def test_reject_trusted(self) -> None:
+        """Runs tests of untrusted input in the trusted mode, `python -O`."""
+        result = subprocess.run(
+                [sys.executable, "-O", "-m", "unittest",
+                 "yo1k.tic_tac_toe.test.test_game.ValidatingActionQueueTest.test_reject",
+                 "yo1k.tic_tac_toe.test.test_server.ServerTest.test_reject_actions",
+                 "yo1k.tic_tac_toe.test.test_protocol"],
+                capture_output=True, text=True, check=False,
+                env=dict(os.environ, PYTHONPATH=str(Path(__file__).parents[3])))
+        self.assertEqual(0, result.returncode, result.stderr)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,90 @@
+import io
+import unittest
+from typing import Optional
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.game import (
+    AI, Action, Board, DefaultActionQueue, Logic, Mark, Player, PlayerID, State, World)
+from yo1k.tic_tac_toe.instrument import Metrics, instrumented_world
+
+
+def _new_world(seed: int, metrics: Optional[Metrics] = None) -> tuple[State, World]:
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    state = State(rounds=5, players=players, board=Board(size=4, win_length=3))
+    action_queues = (DefaultActionQueue(players[0].id), DefaultActionQueue(players[1].id))
+    ais = (RandomAI(players[0].id, seed, action_queues[0]),
+           RandomAI(players[1].id, seed + 1, action_queues[1]))
+    if metrics is None:
+        return (state, World(state, Logic(action_queues), ais))
+    else:
+        return (state, instrumented_world(state, action_queues, ais, metrics))
+
+
+class InstrumentTest(unittest.TestCase):
+    def test_same_results(self) -> None:
+        metrics = Metrics()
+        for seed in range(0, 100, 2):
+            (state, world) = _new_world(seed)
+            (instrumented_state, instrumented) = _new_world(seed, metrics)
+            self.assertEqual(world.run(), instrumented.run())
+            self.assertEqual(state, instrumented_state)
+        snapshot = metrics.snapshot()
+        self.assertEqual(
+                set(snapshot.timings),
+                {"World.run", "AI.act", "ActionQueue.pop", "Logic.advance_inround",
+                 "Logic.advance_beginning_outround", "Logic.is_win"})
+        self.assertEqual(snapshot.timings["World.run"].calls, 50)
+        for timing in snapshot.timings.values():
+            self.assertLessEqual(timing.max_ns, timing.total_ns)
+
+    def test_empty_polls(self) -> None:
+        metrics = Metrics()
+        players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+        state = State(rounds=1, players=players, board=Board())
+        action_queues = (DefaultActionQueue(players[0].id), DefaultActionQueue(players[1].id))
+        world = instrumented_world(state, action_queues, (), metrics)
+        for _ in range(3):
+            world.advance()
+        action_queues[0].add(Action.new_ready())
+        world.advance()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot.timings["World.advance"].calls, 4)
+        self.assertEqual(snapshot.timings["ActionQueue.pop"].calls, 8)
+        self.assertEqual(snapshot.counters["ActionQueue.pop empty"], 7)
+        self.assertNotIn(PlayerID(0), state.required_ready)
+
+    def test_idle_acts(self) -> None:
+        metrics = Metrics()
+        players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+        state = State(rounds=1, players=players, board=Board())
+        action_queues = (DefaultActionQueue(players[0].id), DefaultActionQueue(players[1].id))
+        ais = (RandomAI(players[0].id, 0, action_queues[0]), AI())
+        stats = instrumented_world(state, action_queues, ais, metrics).run()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot.timings["AI.act"].calls, stats.ai_calls)
+        self.assertEqual(snapshot.counters["AI.act idle"], 2)
+
+    def test_snapshot_is_copy(self) -> None:
+        metrics = Metrics()
+        metrics.time("a", 10)
+        metrics.count("b")
+        snapshot = metrics.snapshot()
+        metrics.time("a", 20)
+        metrics.count("b")
+        self.assertEqual(snapshot.timings["a"].calls, 1)
+        self.assertEqual(snapshot.timings["a"].max_ns, 10)
+        self.assertEqual(snapshot.counters["b"], 1)
+        self.assertEqual(metrics.timings["a"].mean_ns(), 15)
+        metrics.reset()
+        self.assertEqual(metrics.snapshot().timings, {})
+
+    def test_dump(self) -> None:
+        file = io.StringIO()
+        metrics = Metrics(dump_interval_ns=0, file=file)
+        (_, world) = _new_world(0, metrics)
+        world.advance()
+        self.assertIn("World.advance", file.getvalue())
+        self.assertIn("AI.act", file.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
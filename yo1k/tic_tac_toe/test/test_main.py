@@ -0,0 +1,106 @@
+import io
+import os
+import subprocess
+import sys
+import unittest
+from collections.abc import Mapping, Sequence
+from contextlib import redirect_stdout
+from pathlib import Path
+from yo1k.tic_tac_toe import play, registry
+from yo1k.tic_tac_toe.__main__ import main
+
+
+_MODULES = "modules:"
+
+
+def _import_times(args: Sequence[str]) -> tuple[set[str], Mapping[str, int]]:
+    """Runs the command-line interface with `args` in a new process and returns the modules
+    imported and the cumulative import time in microseconds of those reported by
+    `python -X importtime`.
+
+    `python -X importtime` reports the modules imported by `import` statements, including
+    those in modules which `registry` imports lazily, but not a module which
+    `importlib.import_module` imports itself, so the modules imported are read from `sys.modules`.
+    """
+    script = ("import sys\n"
+              "from yo1k.tic_tac_toe.__main__ import main\n"
+              "main(sys.argv[1:])\n"
+              f"print({_MODULES!r}, *sys.modules, file=sys.stderr)")
+    result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script, *args],
+            capture_output=True, text=True, check=True,
+            env=dict(os.environ, PYTHONPATH=str(Path(__file__).parents[3])))
+    modules: set[str] = set()
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith(_MODULES):
+            modules.update(line.split()[1:])
+        elif line.startswith("import time:") and "|" in line:
+            (_, cumulative, module) = line[len("import time:"):].split("|")
+            if cumulative.strip().isdigit():
+                times[module.strip()] = int(cumulative)
+    return (modules, times)
+
+
+def _report(times: Mapping[str, int]) -> str:
+    slowest = sorted(times.items(), key=lambda item: -item[1])[:10]
+    return os.linesep.join(f"{time:>10} us {module}" for (module, time) in slowest)
+
+
+class MainTest(unittest.TestCase):
+    def test_imports(self) -> None:
+        for (args, imported, not_imported) in (
+                (("--help",), (), ("yo1k.tic_tac_toe.game",)),
+                (("--rounds", "1"), ("yo1k.tic_tac_toe.ai",),
+                 ("yo1k.tic_tac_toe.book", "yo1k.tic_tac_toe.mcts")),
+                (("play", "book", "mcts", "--rounds", "1"),
+                 ("yo1k.tic_tac_toe.book", "yo1k.tic_tac_toe.mcts"), ())):
+            with self.subTest(args=args):
+                (modules, times) = _import_times(args)
+                for module in imported:
+                    self.assertIn(module, modules, _report(times))
+                for module in ("numpy", "asyncio", "yo1k.tic_tac_toe.tournament",
+                               "yo1k.tic_tac_toe.server", "yo1k.tic_tac_toe.bench",
+                               *not_imported):
+                    self.assertNotIn(module, modules, _report(times))
+                    self.assertNotIn(module, times, _report(times))
+                if "yo1k.tic_tac_toe.ai" in imported:
+                    # imported by `ai`, which is imported lazily
+                    self.assertIn("yo1k.tic_tac_toe.position", times, _report(times))
+
+    def test_play(self) -> None:
+        rounds = play.play(("book", "book"), rounds=3)
+        self.assertEqual(3, len(rounds))
+        for round_played in rounds:
+            self.assertIn("draw", round_played)
+            self.assertNotIn(".", round_played.splitlines()[-1])
+        rounds = play.play(("random", "random"), rounds=2, seed=3, size=5, win_length=4)
+        self.assertEqual(2, len(rounds))
+        self.assertEqual(5, len(rounds[0].splitlines()[-1].split()))
+        self.assertEqual(rounds, play.play(("random", "random"), 2, 3, 5, 4))
+
+    def test_main(self) -> None:
+        for argv in (["--seed", "2"], ["play", "random", "random", "--seed", "2"]):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(argv)
+            self.assertIn("round 5:", output.getvalue())
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--help"])
+        self.assertIn("tournament", output.getvalue())
+
+    def test_registry(self) -> None:
+        ais = registry.Registry({"random": ("yo1k.tic_tac_toe.ai", "new_random_ai")})
+        self.assertEqual(["random"], list(ais))
+        ais.register("minimax", "yo1k.tic_tac_toe.ai", "new_minimax_ai")
+        self.assertIs(registry.AIS["minimax"], ais["minimax"])
+        ais.register("missing", "yo1k.tic_tac_toe.missing", "new_ai")
+        with self.assertRaises(ImportError):
+            ais["missing"]  # pylint: disable=W0104
+        with self.assertRaises(KeyError):
+            ais["unknown"]  # pylint: disable=W0104
+
+
+if __name__ == "__main__":
+    unittest.main()
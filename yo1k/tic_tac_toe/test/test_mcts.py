@@ -0,0 +1,84 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from yo1k.tic_tac_toe import mcts
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.game import (
+    State, Player, Board, PlayerID, Mark, Phase, Logic, World, Cell, DefaultActionQueue)
+from yo1k.tic_tac_toe.mcts import MctsAI
+
+
+def _choose(ai: MctsAI, board: Board, step: int) -> Cell:
+    state = State(
+            rounds=1,
+            players=(Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O)),
+            board=board,
+            phase=Phase.INROUND,
+            step=step,
+            required_ready=set())
+    assert state.turn() == ai.player_id
+    return ai.choose(state)
+
+
+class MctsAITest(unittest.TestCase):
+    def test_win(self) -> None:
+        board = Board(size=15, win_length=5)
+        for i in range(4):
+            board.set(Cell(7, 3 + i), Mark.X)
+            board.set(Cell(9, 3 + i * 2), Mark.O)
+        ai = MctsAI(PlayerID(0), 0, DefaultActionQueue(PlayerID(0)), playouts=2_000)
+        self.assertIn(_choose(ai, board, 8), (Cell(7, 2), Cell(7, 7)))
+        self.assertEqual(8, sum(board.get(Cell(x, y)) is not None
+                                for x in range(15) for y in range(15)))
+
+    def test_block(self) -> None:
+        cells: list[list[Optional[Mark]]] \
+            = [[Mark.X, Mark.X, None], [None, Mark.O, None], [None, None, None]]
+        ai = MctsAI(PlayerID(1), 0, DefaultActionQueue(PlayerID(1)), playouts=2_000)
+        self.assertEqual(Cell(0, 2), _choose(ai, Board(cells), 3))
+
+    def test_parallel(self) -> None:
+        cells: list[list[Optional[Mark]]] \
+            = [[Mark.X, Mark.X, None], [None, Mark.O, None], [None, None, None]]
+        for new_executor in (ThreadPoolExecutor, ProcessPoolExecutor):
+            with new_executor(max_workers=2) as executor:
+                ai = MctsAI(PlayerID(1), 0, DefaultActionQueue(PlayerID(1)),
+                            playouts=2_000, executor=executor, workers=2)
+                with self.subTest(executor=executor):
+                    self.assertEqual(Cell(0, 2), _choose(ai, Board(cells), 3))
+                    self.assertEqual(2_000, ai.playouts)
+                    self.assertGreater(ai.playouts_per_sec(), 0)
+
+    def test_seconds(self) -> None:
+        """The search stops at its deadline long before making `playouts`."""
+        playouts = 1_000_000
+        ai = MctsAI(PlayerID(0), 0, DefaultActionQueue(PlayerID(0)),
+                    playouts=playouts, seconds=0.05)
+        _choose(ai, Board(size=19, win_length=5), 0)
+        self.assertGreater(ai.playouts, 0)
+        self.assertLess(ai.playouts, playouts)
+
+    def test_play_against_random(self) -> None:
+        for seed in range(5):
+            players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+            action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+            state = State(rounds=State.default_rounds(), board=Board(), players=players)
+            World(
+                    state,
+                    Logic(action_queues),
+                    (
+                            MctsAI(players[0].id, seed, action_queues[0]),
+                            RandomAI(players[1].id, seed, action_queues[1])
+                    )).run()
+            with self.subTest(seed=seed):
+                self.assertTrue(Logic.is_game_over(state))
+                self.assertEqual(0, players[1].wins)
+
+    def test_search_terminal_moves(self) -> None:
+        (visits, made) = mcts.search([1, 1, 0, 2, 2, 0, 0, 0, 0], 3, 3, 1, 0, playouts=500)
+        self.assertEqual(500, made)
+        self.assertEqual(2, max(visits, key=visits.__getitem__))
+
+
+if __name__ == "__main__":
+    unittest.main()
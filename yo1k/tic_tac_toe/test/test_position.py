@@ -0,0 +1,44 @@
+import unittest
+from yo1k.tic_tac_toe import position
+from yo1k.tic_tac_toe.game import Board, Cell, Mark
+
+
+class PositionTest(unittest.TestCase):
+    def test_from_board(self) -> None:
+        board = Board([[Mark.X, None, None], [None, Mark.O, None], [None, None, Mark.X]])
+        self.assertEqual([1, 0, 0, 0, 2, 0, 0, 0, 1], position.from_board(board))
+        self.assertEqual(7, position.idx_of(Cell(2, 1)))
+        self.assertEqual(7, position.idx_of(position.cell_at(7)))
+
+    def test_key(self) -> None:
+        self.assertEqual(0, position.key([0] * 9))
+        self.assertEqual(1 + 2 * 3 ** 8, position.key([1, 0, 0, 0, 0, 0, 0, 0, 2]))
+
+    def test_canonical_key(self) -> None:
+        pos = [1, 2, 0, 0, 1, 0, 0, 0, 0]
+        expected = position.canonical_key(pos)
+        for permutation in position.SYMMETRIES:
+            transformed = [0] * len(pos)
+            for (i, v) in enumerate(pos):
+                transformed[permutation[i]] = v
+            with self.subTest(permutation=permutation):
+                self.assertEqual(expected, position.canonical_key(transformed))
+        self.assertNotEqual(expected, position.canonical_key([1, 0, 2, 0, 1, 0, 0, 0, 0]))
+
+    def test_symmetries(self) -> None:
+        self.assertIs(position.SYMMETRIES, position.symmetries(3))
+        for size in (1, 2, 4):
+            symmetries = position.symmetries(size)
+            self.assertEqual(tuple(range(size ** 2)), symmetries[0])
+            for permutation in symmetries:
+                self.assertEqual(list(range(size ** 2)), sorted(permutation))
+        self.assertEqual(8, len(set(position.symmetries(4))))
+
+    def test_is_win(self) -> None:
+        self.assertIs(True, position.is_win([1, 2, 2, 0, 1, 0, 0, 0, 1], 4))
+        self.assertIs(True, position.is_win([0, 2, 1, 0, 1, 0, 1, 0, 2], 6))
+        self.assertIs(False, position.is_win([1, 2, 1, 0, 1, 0, 2, 0, 0], 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
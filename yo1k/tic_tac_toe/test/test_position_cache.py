@@ -0,0 +1,140 @@
+import unittest
+from collections.abc import Sequence
+from functools import partial
+from random import Random
+from yo1k.tic_tac_toe import position
+from yo1k.tic_tac_toe.ai import Minimax, MinimaxAI
+from yo1k.tic_tac_toe.game import Board, Cell, DefaultActionQueue, Mark, Player, PlayerID, State
+from yo1k.tic_tac_toe.mcts import MctsAI
+from yo1k.tic_tac_toe.position_cache import (
+    CachedAI, PositionCache, canonical, cached_cell, cached_value, cells_of)
+
+
+def _image(cells: list[int], permutation: Sequence[int]) -> list[int]:
+    image = [0] * len(cells)
+    for (idx, value) in enumerate(cells):
+        image[permutation[idx]] = value
+    return image
+
+
+def _board(cells: list[int], size: int) -> Board:
+    board = Board(size=size)
+    for (idx, value) in enumerate(cells):
+        if value != 0:
+            board.set(Cell(idx // size, idx % size), Mark.X if value == 1 else Mark.O)
+    return board
+
+
+class CanonicalTest(unittest.TestCase):
+    def test_symmetric(self) -> None:
+        rng = Random(0)
+        for size in (1, 2, 3, 4, 7):
+            for _ in range(20):
+                cells = [rng.randrange(3) for _ in range(size ** 2)]
+                (expected, k) = canonical(cells, size)
+                self.assertEqual(
+                        expected, bytes(_image(cells, position.symmetries(size)[k])))
+                for permutation in position.symmetries(size):
+                    with self.subTest(size=size, cells=cells, permutation=permutation):
+                        self.assertEqual(
+                                expected, canonical(_image(cells, permutation), size)[0])
+
+    def test_raw(self) -> None:
+        cells = [0, 0, 1, 0, 0, 0, 0, 0, 0]
+        self.assertEqual((bytes(cells), 0), canonical(cells, 3, symmetric=False))
+        self.assertEqual(bytes([0, 0, 0, 0, 0, 0, 0, 0, 1]), canonical(cells, 3)[0])
+
+
+class PositionCacheTest(unittest.TestCase):
+    def test_lru(self) -> None:
+        cache_: PositionCache[str] = PositionCache(capacity=2)
+        cache_.put("a", "A")
+        cache_.put("b", "B")
+        self.assertEqual("A", cache_.get("a"))
+        cache_.put("c", "C")
+        self.assertIsNone(cache_.get("b"))
+        self.assertEqual("A", cache_.get("a"))
+        self.assertEqual("C", cache_.get("c"))
+        self.assertEqual((3, 1, 1, 2), (cache_.hits, cache_.misses, cache_.evictions, len(cache_)))
+        self.assertEqual(0.75, cache_.hit_rate())
+        self.assertEqual(0, PositionCache().hit_rate())
+
+    def test_cached_value(self) -> None:
+        cache_: PositionCache[int] = PositionCache()
+        minimax = Minimax()
+        cells = [1, 2, 0, 0, 1, 0, 0, 0, 0]
+        for permutation in position.SYMMETRIES:
+            board = _board(_image(cells, permutation), 3)
+            self.assertEqual(minimax.score(cells_of(board), 2), cached_value(
+                    cache_, "score", board, 2, partial(minimax.score, cells_of(board), 2)))
+        self.assertEqual((7, 1), (cache_.hits, cache_.misses))
+        cached_value(cache_, "score", _board(cells, 3), 1, lambda: 0)
+        cached_value(cache_, "other", _board(cells, 3), 2, lambda: 0)
+        self.assertEqual(3, cache_.misses)
+
+    def test_cached_cell(self) -> None:
+        """The cell cached for a board is mapped to an equivalent cell of each symmetric board,
+        where occupying it gives a board symmetric to the one given by occupying the cell."""
+        cache_: PositionCache[int] = PositionCache()
+        cells = [1, 0, 0, 0, 2, 0, 0, 0, 0]
+        self.assertEqual(
+                Cell(0, 1), cached_cell(cache_, "ai", _board(cells, 3), 1, lambda: Cell(0, 1)))
+        cells[1] = 1
+        for permutation in position.SYMMETRIES:
+            board = _board(_image(cells, permutation), 3)
+            board.unset(position.cell_at(permutation[1]))
+            board.set(cached_cell(cache_, "ai", board, 1, self.fail), Mark.X)
+            self.assertEqual(canonical(cells, 3)[0], canonical(cells_of(board), 3)[0])
+        self.assertEqual((8, 1), (cache_.hits, cache_.misses))
+
+
+class CachedAITest(unittest.TestCase):
+    def test_minimax(self) -> None:
+        """`CachedAI` chooses the same cells as the `MinimaxAI` it wraps."""
+        minimax = Minimax()
+        minimax_ai = MinimaxAI(PlayerID(0), DefaultActionQueue(PlayerID(0)), minimax)
+        ai = CachedAI(MinimaxAI(PlayerID(0), DefaultActionQueue(PlayerID(0)), minimax),
+                      PositionCache())
+        rng = Random(1)
+        for _ in range(300):
+            board = Board()
+            state = State(rounds=1, players=(Player(PlayerID(0), Mark.X),
+                                             Player(PlayerID(1), Mark.O)), board=board)
+            over = False
+            for step in range(2 * rng.randrange(4)):
+                cell = board.empty_cell(rng.randrange(board.empty_count()))
+                board.set(cell, Mark.X if step % 2 == 0 else Mark.O)
+                over = over or board.is_win(cell)
+            if over:
+                continue
+            with self.subTest(cells=cells_of(board)):
+                self.assertEqual(minimax_ai.choose(state), ai.choose(state))
+        self.assertGreater(ai.cache.hits, ai.cache.misses)
+
+    def test_minimax_symmetric(self) -> None:
+        """`MinimaxAI` chooses equivalent cells for symmetric boards, which is required
+        for `CachedAI` to choose the same cells, even if some of them are equally good."""
+        ai = MinimaxAI(PlayerID(0), DefaultActionQueue(PlayerID(0)))
+        cells = [1, 0, 0, 0, 2, 0, 0, 0, 0]
+        images = set()
+        for permutation in position.SYMMETRIES:
+            board = _board(_image(cells, permutation), 3)
+            state = State(rounds=1, players=(Player(PlayerID(0), Mark.X),
+                                             Player(PlayerID(1), Mark.O)), board=board)
+            board.set(ai.choose(state), Mark.X)
+            images.add(canonical(cells_of(board), 3)[0])
+        self.assertEqual(1, len(images))
+
+    def test_settings(self) -> None:
+        """Choices of `AI`s with different settings are cached apart."""
+        cache_: PositionCache[int] = PositionCache()
+        state = State(rounds=1, players=(Player(PlayerID(0), Mark.X),
+                                         Player(PlayerID(1), Mark.O)), board=Board())
+        for (seed, playouts) in ((0, 10), (1, 10), (0, 20)):
+            action_queue = DefaultActionQueue(PlayerID(0))
+            CachedAI(MctsAI(PlayerID(0), seed, action_queue, playouts), cache_).choose(state)
+        self.assertEqual((1, 2), (cache_.hits, cache_.misses))
+
+
+if __name__ == "__main__":
+    unittest.main()
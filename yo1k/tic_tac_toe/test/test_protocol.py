@@ -0,0 +1,59 @@
+import unittest
+from yo1k.tic_tac_toe import protocol
+from yo1k.tic_tac_toe.game import (
+    State, Player, Board, PlayerID, Mark, Phase, Action, Cell)
+
+
+class ProtocolTest(unittest.TestCase):
+    def test_state_round_trip(self) -> None:
+        player_x = Player(PlayerID(0), Mark.X)
+        player_o = Player(PlayerID(1), Mark.O)
+        player_o.wins = 2
+        state = State(
+                rounds=5,
+                players=(player_x, player_o),
+                board=Board([[Mark.X, None, None], [None, Mark.O, None], [None, None, Mark.X]]),
+                phase=Phase.OUTROUND,
+                round_=3,
+                step=2,
+                required_ready={player_o.id})
+        message = protocol.decode(protocol.encode_state(state, player_o.id))
+        self.assertEqual("state", message["type"])
+        self.assertEqual(1, message["player"])
+        self.assertEqual(state, protocol.decode_state(message))
+
+    def test_state_round_trip__large_board(self) -> None:
+        board = Board(size=15, win_length=5)
+        board.set(Cell(14, 7), Mark.X)
+        state = State(
+                rounds=1,
+                players=(Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O)),
+                board=board,
+                phase=Phase.INROUND,
+                step=1,
+                required_ready=set())
+        message = protocol.decode(protocol.encode_state(state, PlayerID(0)))
+        self.assertEqual(state, protocol.decode_state(message))
+
+    def test_action_round_trip(self) -> None:
+        for action in (Action.new_ready(), Action.new_surrender(), Action.new_occupy(Cell(2, 1))):
+            with self.subTest(action=action):
+                decoded = protocol.decode_action(protocol.encode_action(action))
+                assert decoded is not None
+                self.assertEqual(
+                        (action.ready, action.surrender, action.occupy is None),
+                        (decoded.ready, decoded.surrender, decoded.occupy is None))
+        occupy = protocol.decode_action(protocol.encode_action(Action.new_occupy(Cell(2, 1))))
+        assert occupy is not None and occupy.occupy is not None
+        self.assertEqual((2, 1), (occupy.occupy.x, occupy.occupy.y))
+
+    def test_decode_malformed_action(self) -> None:
+        for line in (b"", b"{", b"[]", b"{}", b'{"action":"jump"}', b'{"action":"occupy"}',
+                     b'{"action":"occupy","x":64,"y":0}', b'{"action":"occupy","x":-1,"y":0}',
+                     b'{"action":"occupy","x":true,"y":0}', b'{"action":"occupy","x":"1","y":0}'):
+            with self.subTest(line=line):
+                self.assertIsNone(protocol.decode_action(line))
+
+
+if __name__ == "__main__":
+    unittest.main()
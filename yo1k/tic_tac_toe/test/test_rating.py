@@ -0,0 +1,128 @@
+import unittest
+from bisect import bisect_left, insort
+from random import Random
+from yo1k.tic_tac_toe.game import Board, Mark, Phase, Player, PlayerID, State
+from yo1k.tic_tac_toe.rating import Elo, Glicko, Ladder, Rating, _SortedKeys, score
+from yo1k.tic_tac_toe.registry import AIS
+from yo1k.tic_tac_toe.tournament import play_game
+
+
+def _game_over(wins: tuple[int, int], rounds: int = 4) -> State:
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    for (player, player_wins) in zip(players, wins):
+        player.wins = player_wins
+    return State(rounds=rounds, players=players, board=Board(),
+                 phase=Phase.OUTROUND, round_=rounds - 1)
+
+
+class RatingSystemTest(unittest.TestCase):
+    def test_score(self) -> None:
+        state = _game_over((2, 1))
+        self.assertEqual(0.625, score(state, PlayerID(0)))
+        self.assertEqual(0.375, score(state, PlayerID(1)))
+        state = play_game((AIS["book"], AIS["book"]), 3, (0, 1))
+        self.assertEqual(0.5, score(state, PlayerID(0)))
+
+    def test_elo(self) -> None:
+        elo = Elo(k=32)
+        self.assertEqual(Rating(1516, games=1), elo.update(Rating(), Rating(), 1))
+        self.assertEqual(Rating(1484, games=1), elo.update(Rating(), Rating(), 0))
+        self.assertEqual(Rating(1500, games=1), elo.update(Rating(), Rating(), 0.5))
+        self.assertAlmostEqual(1804.83, elo.update(Rating(1800), Rating(1500), 1).value, 2)
+
+    def test_glicko(self) -> None:
+        glicko = Glicko()
+        rating = glicko.update(Rating(1500, 200), Rating(1400, 30), 1)
+        self.assertAlmostEqual(1563.4, rating.value, 1)
+        self.assertAlmostEqual(175.2, rating.deviation, 1)
+        self.assertEqual(1, rating.games)
+        winner = glicko.update(Rating(), Rating(), 1)
+        loser = glicko.update(Rating(), Rating(), 0)
+        self.assertAlmostEqual(1500 - winner.value, loser.value - 1500)
+        self.assertGreater(winner.value, 1500)
+        self.assertLess(winner.deviation, 350)
+        rating = Rating(1500, 50)
+        for _ in range(1_000):
+            rating = glicko.update(rating, rating, 0.5)
+        self.assertEqual(30, rating.deviation)
+        self.assertAlmostEqual(1500, rating.value)
+        self.assertGreater(Glicko(growth=30).update(rating, rating, 0.5).deviation, 30)
+
+
+class SortedKeysTest(unittest.TestCase):
+    def test_random(self) -> None:
+        rng = Random(0)
+        keys = _SortedKeys(load=2)
+        expected: list[tuple[float, int]] = []
+        for player in range(2_000):
+            key = (float(rng.randrange(100)), player)
+            idx = bisect_left(expected, key)
+            self.assertEqual(
+                    (expected[idx - 1] if idx > 0 else None,
+                     expected[idx] if idx < len(expected) else None),
+                    keys.neighbours(key))
+            if len(expected) > 0 and rng.random() < 0.4:
+                removed = expected.pop(rng.randrange(len(expected)))
+                keys.remove(removed)
+            else:
+                insort(expected, key)
+                keys.add(key)
+            self.assertEqual(len(expected), len(keys))
+        self.assertEqual(expected, list(keys))
+        self.assertEqual((None, None), _SortedKeys().neighbours((0, 0)))
+
+
+class LadderTest(unittest.TestCase):
+    def test_join(self) -> None:
+        ladder = Ladder()
+        players = [ladder.add(Rating(value)) for value in (1500, 1200, 1800, 1450, 1630, 1700)]
+        self.assertEqual(list(range(6)), players)
+        for player in players[:3]:
+            ladder.queue(player)
+        self.assertEqual(3, ladder.queued_count())
+        self.assertEqual(0, ladder.join(3))
+        self.assertEqual(2, ladder.join(4))
+        self.assertEqual(1, ladder.join(5))
+        self.assertEqual(0, ladder.queued_count())
+        self.assertFalse(ladder.is_queued(1))
+        ladder.queue(0)
+        ladder.queue(1)
+        ladder.leave(0)
+        self.assertEqual(1, ladder.join(2))
+
+    def test_max_difference(self) -> None:
+        ladder = Ladder(max_difference=100)
+        for value in (1500, 1650, 1560):
+            ladder.add(Rating(value))
+        self.assertIsNone(ladder.join(0))
+        self.assertIsNone(ladder.join(1))
+        self.assertEqual(0, ladder.join(2))
+        self.assertEqual(1, ladder.queued_count())
+
+    def test_record(self) -> None:
+        ladder = Ladder(Elo())
+        (first, second) = (ladder.add(), ladder.add())
+        self.assertIsNone(ladder.join(first))
+        self.assertEqual(first, ladder.join(second))
+        ladder.record((second, first), _game_over((4, 0)))
+        self.assertEqual(Rating(1516, games=1), ladder.rating(second))
+        self.assertEqual(Rating(1484, games=1), ladder.rating(first))
+        ladder.queue(first)
+        with self.assertRaises(AssertionError):
+            ladder.record((first, second), _game_over((0, 4)))
+
+    def test_ratings_separate(self) -> None:
+        """Ratings of players of different strength drift apart over matches."""
+        ladder = Ladder()
+        strong = [ladder.add() for _ in range(10)]
+        weak = [ladder.add() for _ in range(10)]
+        for game in range(200):
+            (winner, loser) = (strong[game % 10], weak[(game * 3) % 10])
+            ladder.record((winner, loser), play_game(
+                    (AIS["minimax"], AIS["random"]), 1, (game, game)))
+        self.assertGreater(min(ladder.rating(player).value for player in strong),
+                           max(ladder.rating(player).value for player in weak))
+
+
+if __name__ == "__main__":
+    unittest.main()
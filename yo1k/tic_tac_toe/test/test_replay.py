@@ -0,0 +1,161 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from random import Random
+from yo1k.tic_tac_toe import client, replay
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.game import (
+    State, Player, Board, PlayerID, Mark, Logic, World, DefaultActionQueue, UndoStack)
+from yo1k.tic_tac_toe.replay import LogWriter, RecordingActionQueue
+from yo1k.tic_tac_toe.server import Server
+
+
+def _record_games(log: LogWriter, games: int, seed: int) -> list[State]:
+    """Plays `games` games of `RandomAI`s advanced in turns, so that frames of the games
+    are interleaved in `log`, and returns their final `State`s."""
+    rng = Random(seed)
+    states = []
+    worlds = []
+    for game in range(games):
+        players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+        if game % 2 == 1:
+            players = (Player(PlayerID(0), Mark.O), Player(PlayerID(1), Mark.X))
+        board = Board() if game % 3 != 0 else Board(size=7, win_length=4)
+        state = State(rounds=1 + game % 4, players=players, board=board)
+        match = log.start(state)
+        action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+        worlds.append(World(
+                state,
+                Logic(tuple(RecordingActionQueue(action_queue, log, match)
+                            for action_queue in action_queues)),
+                tuple(RandomAI(player.id, rng.randrange(1 << 32), action_queue)
+                      for (player, action_queue) in zip(players, action_queues))))
+        states.append(state)
+    while not all(Logic.is_game_over(state) for state in states):
+        for (world, state) in zip(worlds, states):
+            if not Logic.is_game_over(state):
+                world.advance()
+    return states
+
+
+class ReplayTest(unittest.TestCase):
+    def test_replay(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "log.bin"
+            log = LogWriter(path)
+            states = _record_games(log, 12, 0)
+            for match in range(len(states)):
+                log.end(match)
+            log.close()
+            data = path.read_bytes()
+            self.assertEqual(list(range(len(states))), replay.matches(data))
+            replays = replay.load(data, checkpoint_interval=5)
+            for (match, state) in enumerate(states):
+                with self.subTest(match=match):
+                    match_replay = replays[match]
+                    self.assertTrue(match_replay.is_ended())
+                    self.assertEqual(state, match_replay.state())
+
+    def test_seek(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "log.bin"
+            log = LogWriter(path)
+            _record_games(log, 3, 1)
+            log.close()
+            match_replay = replay.load(path.read_bytes(), checkpoint_interval=4)[2]
+        self.assertFalse(match_replay.is_ended())
+        state = match_replay.state(0)
+        undo = UndoStack()
+        for (idx, (player_id, action)) in enumerate(match_replay.actions()):
+            with self.subTest(idx=idx):
+                self.assertEqual(state, match_replay.state(idx))
+            Logic.make(state, player_id, action, undo)
+        self.assertEqual(state, match_replay.state())
+        # states returned are copies
+        match_replay.state().board.clear()
+        self.assertEqual(state, match_replay.state())
+
+    def test_append(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "log.bin"
+            states = []
+            for seed in range(2):
+                log = LogWriter(path)
+                states += _record_games(log, 2, seed)
+                log.close()
+            data = path.read_bytes()
+        self.assertEqual([0, 1, 2, 3], replay.matches(data))
+        replays = replay.load(data)
+        for (match, state) in enumerate(states):
+            self.assertEqual(state, replays[match].state())
+
+    def test_next_match(self) -> None:
+        """The number of the next match is read from the `.next` file rather than the log,
+        which is searched only if that file does not exist."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "log.bin"
+            next_path = Path(tmp_dir) / "log.bin.next"
+            # `next_match` is written to the `.next` file, which `-1` removes
+            for (next_match, expected) in ((None, 0), (None, 1), (7, 7), (-1, 8)):
+                if next_match is not None:
+                    if next_match < 0:
+                        next_path.unlink()
+                    else:
+                        next_path.write_bytes(next_match.to_bytes(4, "little"))
+                log = LogWriter(path)
+                _record_games(log, 1, 0)
+                log.flush()
+                # numbers reserved by a writer which is not closed are skipped
+                self.assertEqual(expected + LogWriter.const_reserved_matches(),
+                                 int.from_bytes(next_path.read_bytes(), "little"))
+                log.close()
+                self.assertEqual(expected, replay.matches(path.read_bytes())[-1])
+                self.assertEqual(expected + 1, int.from_bytes(next_path.read_bytes(), "little"))
+
+    def test_invalid(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "log.bin"
+            log = LogWriter(path)
+            _record_games(log, 1, 2)
+            log.close()
+            data = path.read_bytes()
+        invalid_logs = {
+                "magic": b"x" + data[1:],
+                "truncated": data[:-1],
+                "kind": data + bytes([replay.END + 1]),
+                "started": replay.MAGIC + bytes([replay.READY, 0, 0, 0, 0, 0])}
+        # the last occupy action is attributed to the other player
+        last_occupy = data.rindex(bytes([replay.OCCUPY, 0, 0, 0, 0]))
+        corrupted = bytearray(data)
+        corrupted[last_occupy + 5] ^= 1
+        invalid_logs["action"] = bytes(corrupted)
+        for (name, invalid_log) in invalid_logs.items():
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    replay.load(invalid_log)
+
+    def test_server(self) -> None:
+        async def play(log: LogWriter) -> Server:
+            server = Server(rounds=2, log=log)
+            tcp_server = await server.start("127.0.0.1", 0)
+            (host, port) = tcp_server.sockets[0].getsockname()[:2]
+            async with tcp_server:
+                await client.generate_load(host, port, connections=20)
+            return server
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "log.bin"
+            log = LogWriter(path)
+            server = asyncio.run(play(log))
+            log.close()
+            data = path.read_bytes()
+        self.assertEqual(10, server.matches_finished)
+        for (match, match_replay) in replay.load(data).items():
+            with self.subTest(match=match):
+                self.assertTrue(match_replay.is_ended())
+                self.assertTrue(Logic.is_game_over(match_replay.state()))
+
+
+if __name__ == "__main__":
+    unittest.main()
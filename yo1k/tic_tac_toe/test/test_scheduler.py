@@ -0,0 +1,205 @@
+import copy
+import queue
+import threading
+import time
+import unittest
+from functools import partial
+from random import Random
+from typing import Optional
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.game import (
+    AI, Action, Board, ConcurrentActionQueue, DefaultActionQueue, Logic, Mark, Phase, Player,
+    PlayerID, RunStats, State, World)
+from yo1k.tic_tac_toe.scheduler import Scheduler
+
+
+class CountingAI(AI):
+    def __init__(self) -> None:
+        self.calls: int = 0
+
+    def act(self, state: State) -> None:
+        self.calls += 1
+
+
+def _new_world(seed: int, human: bool = False) \
+        -> tuple[World, tuple[DefaultActionQueue, ...], CountingAI]:
+    """Returns a game of `RandomAI`s, or of a human player with `PlayerID(0)`,
+    whose `AI` only counts calls, and a `RandomAI` if `human`."""
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    state = State(rounds=3, players=players, board=Board())
+    action_queues = (DefaultActionQueue(players[0].id), DefaultActionQueue(players[1].id))
+    counting_ai = CountingAI()
+    ais = (counting_ai if human else RandomAI(players[0].id, seed, action_queues[0]),
+           RandomAI(players[1].id, seed + 1, action_queues[1]))
+    return World(state, Logic(action_queues), ais), action_queues, counting_ai
+
+
+class RemoteAI(AI):
+    """Sends a copy of `State` to a thread of the human player once per position
+    in which the player is awaited."""
+
+    def __init__(self, requests: queue.Queue[Optional[State]]):
+        self.__requests: queue.Queue[Optional[State]] = requests
+        self.__requested: Optional[tuple[Phase, int, int]] = None
+
+    def act(self, state: State) -> None:
+        position = (state.phase, state.round, state.step)
+        if position != self.__requested:
+            self.__requested = position
+            self.__requests.put(copy.deepcopy(state))
+
+
+def _play_human(
+        requests: queue.Queue[Optional[State]], action_queue: ConcurrentActionQueue,
+        seed: int) -> None:
+    rng = Random(seed)
+    while (state := requests.get()) is not None:
+        if state.phase is Phase.INROUND:
+            board = state.board
+            action_queue.add(board.empty_cell(rng.randrange(board.empty_count())).occupy)
+        else:
+            action_queue.add(Action.new_ready())
+
+
+class SignalingWorld(World):
+    """Puts itself to `over` once the game is over."""
+
+    def __init__(self, state: State, logic: Logic, ais: tuple[AI, ...], over: queue.Queue[World]):
+        super().__init__(state, logic, ais)
+        self.__over: queue.Queue[World] = over
+
+    def run(self, max_logic_calls: Optional[int] = None) -> RunStats:
+        stats = super().run(max_logic_calls)
+        if Logic.is_game_over(self.state):
+            self.__over.put(self)
+        return stats
+
+
+class CountingScheduler(Scheduler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.waits: int = 0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        self.waits += 1
+        return super().wait(timeout)
+
+
+class SchedulerTest(unittest.TestCase):
+    def test_ais(self) -> None:
+        scheduler = Scheduler(quantum=3)
+        matches = {}
+        for seed in range(0, 400, 2):
+            matches[scheduler.add(_new_world(seed)[0])] = seed
+        self.assertEqual(200, scheduler.ready_count())
+        self.assertEqual(set(matches), set(scheduler.run()))
+        self.assertEqual(0, scheduler.match_count())
+        for (match, seed) in matches.items():
+            expected = _new_world(seed)[0]
+            expected.run()
+            world = _new_world(seed)[0]
+            scheduler.add(world)
+            scheduler.run()
+            with self.subTest(match=match):
+                self.assertEqual(expected.state, world.state)
+
+    def test_fair(self) -> None:
+        scheduler = Scheduler(quantum=1)
+        worlds = [_new_world(seed)[0] for seed in range(0, 10, 2)]
+        for world in worlds:
+            scheduler.add(world)
+        scheduler.run_round()
+        for world in worlds:
+            self.assertIs(Phase.INROUND, world.state.phase)
+            self.assertEqual(0, world.state.step)
+        scheduler.run_round()
+        for world in worlds:
+            self.assertEqual(1, world.state.step)
+
+    def test_humans(self) -> None:
+        scheduler = Scheduler()
+        rng = Random(0)
+        humans = {}
+        for seed in range(0, 100, 2):
+            (world, action_queues, counting_ai) = _new_world(seed, human=True)
+            match = scheduler.add(world)
+            humans[match] = (world, counting_ai, RandomAI(PlayerID(0), seed, action_queues[0]))
+        self.assertEqual([], scheduler.run())
+        self.assertEqual(0, scheduler.ready_count())
+        over: set[int] = set()
+        while len(over) < len(humans):
+            calls = {match: counting_ai.calls for (match, (_, counting_ai, _)) in humans.items()}
+            acting = rng.sample(sorted(set(humans) - over), min(5, len(humans) - len(over)))
+            for match in acting:
+                (world, _, human) = humans[match]
+                human.act(world.state)
+                scheduler.notify(match)
+            over.update(scheduler.run())
+            for (match, (_, counting_ai, _)) in humans.items():
+                with self.subTest(match=match):
+                    if match in acting:
+                        self.assertLess(calls[match], counting_ai.calls)
+                    else:
+                        self.assertEqual(calls[match], counting_ai.calls)
+        for (match, (world, _, _)) in humans.items():
+            self.assertTrue(Logic.is_game_over(world.state))
+            self.assertIsNone(scheduler.world(match))
+
+    def test_threads(self) -> None:
+        """Human players on threads of their own add actions to `ConcurrentActionQueue`s
+        while `serve` advances the matches."""
+        scheduler = CountingScheduler()
+        over: queue.Queue[World] = queue.Queue()
+        worlds = []
+        humans = []
+        for seed in range(20):
+            players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+            state = State(rounds=3, players=players, board=Board())
+            action_queues = (ConcurrentActionQueue(players[0].id, capacity=1),
+                             DefaultActionQueue(players[1].id))
+            requests: queue.Queue[Optional[State]] = queue.Queue()
+            worlds.append(SignalingWorld(state, Logic(action_queues), (
+                    RemoteAI(requests), RandomAI(players[1].id, seed, action_queues[1])), over))
+            action_queues[0].on_add = partial(scheduler.notify, scheduler.add(worlds[-1]))
+            humans.append((threading.Thread(
+                    target=_play_human, args=(requests, action_queues[0], seed)), requests))
+        for (thread, _) in humans:
+            thread.start()
+        serving = threading.Thread(target=scheduler.serve)
+        serving.start()
+        self.assertEqual(set(map(id, worlds)), set(id(over.get(timeout=60)) for _ in worlds))
+        scheduler.stop()
+        serving.join()
+        for (thread, requests) in humans:
+            requests.put(None)
+            thread.join()
+        for world in worlds:
+            self.assertTrue(Logic.is_game_over(world.state))
+        self.assertEqual(0, scheduler.match_count())
+
+    def test_serve_sleeps(self) -> None:
+        scheduler = CountingScheduler()
+        (world, action_queues, counting_ai) = _new_world(0, human=True)
+        match = scheduler.add(world)
+        serving = threading.Thread(target=scheduler.serve)
+        serving.start()
+        for waits in (1, 2):
+            deadline = time.monotonic() + 10
+            while scheduler.waits < waits and time.monotonic() < deadline:
+                time.sleep(0.01)
+            calls = counting_ai.calls
+            # a spinning scheduler would wait and call `AI`s again meanwhile
+            time.sleep(0.1)
+            self.assertEqual(waits, scheduler.waits)
+            self.assertEqual(calls, counting_ai.calls)
+            if waits == 1:
+                action_queues[0].add(Action.new_ready())
+                scheduler.notify(match)
+        scheduler.stop()
+        serving.join(10)
+        self.assertFalse(serving.is_alive())
+        self.assertEqual(Phase.INROUND, world.state.phase)
+
+
+if __name__ == "__main__":
+    unittest.main()
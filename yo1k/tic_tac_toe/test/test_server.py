@@ -0,0 +1,81 @@
+import asyncio
+import math
+import unittest
+from yo1k.tic_tac_toe import client, protocol
+from yo1k.tic_tac_toe.game import Action, Cell, Phase
+from yo1k.tic_tac_toe.server import Server
+
+
+class ServerTest(unittest.TestCase):
+    def test_load(self) -> None:
+        stats = asyncio.run(client.generate_local_load(connections=100, rounds=3, seed=1))
+        self.assertEqual(100, stats.games)
+        self.assertLess(0, len(stats.latencies))
+        self.assertLessEqual(stats.percentile(50), stats.percentile(99))
+
+    def test_percentile(self) -> None:
+        stats = client.LoadStats()
+        self.assertTrue(math.isnan(stats.percentile(50)))
+        stats.latencies.append(0.25)
+        self.assertEqual(0.25, stats.percentile(99))
+        stats.latencies.append(0.5)
+        self.assertLessEqual(stats.percentile(1), stats.percentile(99))
+
+    def test_reject_actions(self) -> None:
+        async def test() -> None:
+            server = Server(rounds=1)
+            tcp_server = await server.start("127.0.0.1", 0)
+            (host, port) = tcp_server.sockets[0].getsockname()[:2]
+            async with tcp_server:
+                (reader_x, writer_x) = await asyncio.open_connection(host, port)
+                (reader_o, writer_o) = await asyncio.open_connection(host, port)
+                for reader in (reader_x, reader_o):
+                    state = protocol.decode_state(protocol.decode(await reader.readline()))
+                    self.assertIs(Phase.BEGINNING, state.phase)
+                writer_x.write(b"nonsense\n")
+                self.assertEqual(
+                        "error", protocol.decode(await reader_x.readline())["type"])
+                writer_x.write(protocol.encode_action(Action.new_occupy(Cell(0, 0))))
+                self.assertEqual(
+                        "error", protocol.decode(await reader_x.readline())["type"])
+                writer_x.close()
+                # the other player is disconnected once the match is aborted
+                while len(await reader_o.readline()) > 0:
+                    pass
+                writer_o.close()
+            self.assertEqual(1, server.matches_started)
+            self.assertEqual(0, server.matches_finished)
+
+        asyncio.run(test())
+
+    def test_long_line(self) -> None:
+        """A client sending a line longer than the stream limit is disconnected."""
+        errors: list[dict[str, object]] = []
+
+        async def test() -> None:
+            asyncio.get_running_loop().set_exception_handler(
+                    lambda _, context: errors.append(context))
+            server = Server(rounds=1)
+            tcp_server = await server.start("127.0.0.1", 0)
+            (host, port) = tcp_server.sockets[0].getsockname()[:2]
+            async with tcp_server:
+                (reader_x, writer_x) = await asyncio.open_connection(host, port)
+                (reader_o, writer_o) = await asyncio.open_connection(host, port)
+                await reader_x.readline()
+                writer_x.write(b"x" * 2 ** 17)
+                for reader in (reader_x, reader_o):
+                    try:
+                        while len(await reader.readline()) > 0:
+                            pass
+                    except ConnectionResetError:
+                        # the server closed the connection without reading all data
+                        pass
+                for writer in (writer_x, writer_o):
+                    writer.close()
+
+        asyncio.run(test())
+        self.assertEqual([], errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+from yo1k.tic_tac_toe.ai import RandomAI
+from yo1k.tic_tac_toe.game import (
+    AbstractBoard, Board, Cell, DefaultActionQueue, Logic, Mark, Phase, Player, PlayerID, State,
+    World)
+from yo1k.tic_tac_toe.shared import SharedState, SharedStore, status
+from yo1k.tic_tac_toe.test import test_game
+
+_stores: dict[int, SharedStore] = {}
+"""Stores by board size."""
+_next_slots: dict[int, int] = {}
+_new_state = test_game._new_state  # pylint: disable=W0212
+
+
+def tearDownModule() -> None:  # pylint: disable=C0103
+    for store in _stores.values():
+        store.close()
+        store.unlink()
+
+
+def _new_shared_state(*args: object, **kwargs: object) -> State:
+    """Returns a view of a new slot with the `State` made by `test_game._new_state`."""
+    state = _new_state(*args, **kwargs)  # type: ignore
+    size = state.board.size()
+    if size not in _stores:
+        _stores[size] = SharedStore(capacity=64, size=size)
+        _next_slots[size] = 0
+    slot = _next_slots[size]
+    _next_slots[size] = (slot + 1) % _stores[size].capacity()
+    return _stores[size].put(slot, state)
+
+
+def _store() -> SharedStore:
+    _new_shared_state()
+    return _stores[AbstractBoard.const_size()]
+
+
+class SharedLogicTest(unittest.TestCase):
+    """Runs the tests of the base class on `SharedState`s made by `_new_shared_state`."""
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(test_game, "_new_state", _new_shared_state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SharedLogicSingleActionTest(SharedLogicTest, test_game.LogicSingleActionTest):
+    pass
+
+
+class SharedLogicMultipleActionsTest(SharedLogicTest, test_game.LogicMultipleActionsTest):
+    pass
+
+
+class SharedMakeUnmakeTest(SharedLogicTest, test_game.MakeUnmakeTest):
+    pass
+
+
+def _play(name: str, slot: int, seed: int) -> None:
+    """Plays a game of `RandomAI`s on the view of `slot` of the store `name`
+    in the calling process."""
+    store = SharedStore(capacity=64, size=5, name=name)
+    state = store.state(slot)
+    action_queues = (DefaultActionQueue(PlayerID(0)), DefaultActionQueue(PlayerID(1)))
+    World(state, Logic(action_queues), (
+            RandomAI(PlayerID(0), seed, action_queues[0]),
+            RandomAI(PlayerID(1), seed + 1, action_queues[1]))).run()
+    del state
+    store.close()
+
+
+class SharedStoreTest(unittest.TestCase):
+    def test_put(self) -> None:
+        store = _store()
+        player_x = Player(PlayerID(0), Mark.X)
+        player_o = Player(PlayerID(1), Mark.O)
+        player_o.wins = 2
+        state = State(
+                rounds=5, players=(player_x, player_o), board=Board([
+                        [Mark.X, None, None], [None, Mark.O, None], [None, None, None]]),
+                phase=Phase.INROUND, round_=3, step=2, required_ready=set())
+        shared = store.put(0, state)
+        self.assertIsInstance(shared, SharedState)
+        self.assertEqual(state, shared)
+        self.assertEqual(shared, store.state(0))
+        shared.players[1].wins += 1
+        shared.required_ready.update({PlayerID(1)})
+        self.assertEqual(3, store.state(0).players[1].wins)
+        self.assertEqual({PlayerID(1)}, store.state(0).required_ready)
+        self.assertEqual(0b10, status(store)["required_ready"][0])
+        self.assertEqual(list(state.board.empty_cells()), list(shared.board.empty_cells()))
+
+    def test_processes(self) -> None:
+        store = SharedStore(capacity=64, size=5)
+        try:
+            for slot in range(8):
+                players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+                store.put(slot, State(
+                        rounds=3, players=players, board=Board(size=5, win_length=4)))
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                for future in [executor.submit(_play, store.name, slot, 2 * slot)
+                               for slot in range(8)]:
+                    future.result()
+            fields = status(store)
+            for slot in range(8):
+                with self.subTest(slot=slot):
+                    self.assertTrue(Logic.is_game_over(store.state(slot)))
+                    self.assertEqual(2, fields["round"][slot])
+                    self.assertLessEqual(sum(fields["wins"][slot]), 3)
+            self.assertEqual(0, fields["rounds"][8])
+        finally:
+            store.close()
+            store.unlink()
+
+    def test_board(self) -> None:
+        store = SharedStore(capacity=1, size=AbstractBoard.const_max_size())
+        try:
+            board = store.put(0, State(
+                    rounds=1, players=(Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O)),
+                    board=Board(size=AbstractBoard.const_max_size(), win_length=5))).board
+            self.assertEqual(64 * 64, board.empty_count())
+            for i in range(5):
+                board.set(Cell(60 - i, 3 + i), Mark.O)
+            self.assertTrue(board.is_win(Cell(58, 5)))
+            board.unset(Cell(58, 5))
+            self.assertIsNone(board.get(Cell(58, 5)))
+            self.assertFalse(board.is_win(Cell(60, 3)))
+            self.assertEqual(64 * 64 - 4, board.empty_count())
+            self.assertEqual(
+                    {Cell(x, y) for x in range(64) for y in range(64)
+                     if board.get(Cell(x, y)) is None},
+                    set(board.empty_cells()))
+            self.assertIsNone(board.get(board.empty_cell(64 * 64 - 5)))
+            board.clear()
+            self.assertEqual(64 * 64, board.empty_count())
+            del board
+        finally:
+            store.close()
+            store.unlink()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from yo1k.tic_tac_toe import tournament
+from yo1k.tic_tac_toe.game import Logic
+from yo1k.tic_tac_toe.registry import AIS
+from yo1k.tic_tac_toe.tournament import Standings
+
+
+class TournamentTest(unittest.TestCase):
+    def test_play_game(self) -> None:
+        state = tournament.play_game(
+                (AIS["random"], AIS["random"]),
+                rounds=3,
+                seeds=tournament.game_seeds(seed=1, game=2))
+        self.assertIs(True, Logic.is_game_over(state))
+        self.assertEqual(2, state.round)
+
+    def test_standings_do_not_depend_on_workers(self) -> None:
+        expected = tournament.run(("random", "random"), games=50, seed=3, workers=1)
+        self.assertEqual(50, expected.games)
+        self.assertEqual(50 * 5, expected.rounds)
+        self.assertEqual(expected.rounds, sum(expected.wins) + expected.draws)
+        for workers in (2, 3):
+            with self.subTest(workers=workers):
+                self.assertEqual(
+                        expected,
+                        tournament.run(("random", "random"), games=50, seed=3, workers=workers))
+        self.assertNotEqual(
+                expected, tournament.run(("random", "random"), games=50, seed=4, workers=1))
+
+    def test_registered_ais_do_not_depend_on_workers(self) -> None:
+        """Moves of registered `AI`s depend only on the seeds of a game, not on the games
+        a worker process played before."""
+        for name in AIS:
+            with self.subTest(name=name):
+                self.assertEqual(
+                        tournament.run((name, "random"), games=12, rounds=1, workers=1),
+                        tournament.run((name, "random"), games=12, rounds=1, workers=4))
+
+    def test_perfect_play(self) -> None:
+        self.assertEqual(
+                Standings(games=10, rounds=50, wins=[0, 0]),
+                tournament.run(("book", "minimax"), games=10, workers=2))
+        self.assertEqual(0, tournament.run(("random", "book"), games=20, workers=2).wins[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Self-play tournaments between `AI`s.
+
+Run `python -m yo1k.tic_tac_toe.tournament --help` for the command-line usage.
+"""
+from __future__ import annotations
+import argparse
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from time import perf_counter
+from typing import Optional
+from yo1k.tic_tac_toe.game import (
+    State, Player, PlayerID, Mark, Board, Logic, World, DefaultActionQueue)
+from yo1k.tic_tac_toe.registry import AIS, AIFactory
+from yo1k.tic_tac_toe.util import eq
+
+
+@eq
+class Standings:
+    """Aggregated outcomes of rounds played between two `AI`s.
+
+    `wins[i]` is the number of rounds won by the `AI` playing for `State.players[i]`.
+    """
+
+    def __init__(self, games: int = 0, rounds: int = 0, wins: Optional[Sequence[int]] = None):
+        self.games: int = games
+        self.rounds: int = rounds
+        self.wins: list[int] = [0] * State.const_player_count() if wins is None else list(wins)
+
+    @property
+    def draws(self) -> int:
+        return self.rounds - sum(self.wins)
+
+    def add(self, state: State) -> None:
+        """Adds the outcome of a game that is over."""
+        assert Logic.is_game_over(state)
+        self.games += 1
+        self.rounds += state.rounds
+        for player in state.players:
+            self.wins[player.id.idx] += player.wins
+
+    def merge(self, other: Standings) -> None:
+        self.games += other.games
+        self.rounds += other.rounds
+        for (idx, wins) in enumerate(other.wins):
+            self.wins[idx] += wins
+
+    def __repr__(self) -> str:
+        return (f"{type(self).__qualname__}("
+                f"games={self.games},"
+                f"rounds={self.rounds},"
+                f"wins={self.wins},"
+                f"draws={self.draws})")
+
+
+def game_seeds(seed: int, game: int) -> tuple[int, int]:
+    """Returns RNG seeds of both `AI`s in the game number `game` of a tournament.
+    The seeds depend only on `seed` and `game`, and are the same on all platforms."""
+    rng = Random(f"{seed}:{game}")
+    return rng.getrandbits(64), rng.getrandbits(64)
+
+
+def play_game(ais: Sequence[AIFactory], rounds: int, seeds: Sequence[int]) -> State:
+    """Plays a game between `AI`s created by `ais` and returns the `State` once it is over."""
+    players = (Player(PlayerID(0), Mark.X), Player(PlayerID(1), Mark.O))
+    action_queues = tuple(DefaultActionQueue(player.id) for player in players)
+    state = State(rounds=rounds, players=players, board=Board())
+    world = World(
+            state,
+            Logic(action_queues),
+            tuple(new_ai(player.id, ai_seed, action_queue)
+                  for (new_ai, player, ai_seed, action_queue)
+                  in zip(ais, players, seeds, action_queues)))
+    world.run()
+    assert Logic.is_game_over(state)
+    return state
+
+
+def _play_games(ai_names: Sequence[str], rounds: int, seed: int, games: range) -> Standings:
+    """Plays `games` of a tournament in a worker process."""
+    ais = tuple(AIS[name] for name in ai_names)
+    standings = Standings()
+    for game in games:
+        standings.add(play_game(ais, rounds, game_seeds(seed, game)))
+    return standings
+
+
+def run(
+        ai_names: Sequence[str],
+        games: int,
+        rounds: int = State.default_rounds(),
+        seed: int = 0,
+        workers: Optional[int] = None) -> Standings:
+    """Plays `games` games between `AI`s named `ai_names` in `AIS` using a pool of `workers`
+    processes, and returns `Standings` which do not depend on `workers`."""
+    assert len(ai_names) == State.const_player_count(), \
+        f"{len(ai_names)}, {State.const_player_count()}"
+    for name in ai_names:
+        assert name in AIS, f"{name}"
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    # a few chunks per worker balance the load when games take different time
+    chunk_count = min(games, workers * 4)
+    chunks = [range(games * i // chunk_count, games * (i + 1) // chunk_count)
+              for i in range(chunk_count)]
+    standings = Standings()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_standings in executor.map(
+                _play_games,
+                [ai_names] * chunk_count,
+                [rounds] * chunk_count,
+                [seed] * chunk_count,
+                chunks):
+            standings.merge(chunk_standings)
+    return standings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+            prog="python -m yo1k.tic_tac_toe.tournament",
+            description="Plays seeded games between two AIs in parallel and reports standings.")
+    parser.add_argument("ai_x", choices=AIS.keys(), help="the AI playing for X")
+    parser.add_argument("ai_o", choices=AIS.keys(), help="the AI playing for O")
+    parser.add_argument("--games", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=State.default_rounds())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+            "--workers", type=int, default=None, help="defaults to the number of CPUs")
+    args = parser.parse_args(argv)
+    start = perf_counter()
+    standings = run((args.ai_x, args.ai_o), args.games, args.rounds, args.seed, args.workers)
+    duration = perf_counter() - start
+    print(f"{args.ai_x} (X) wins: {standings.wins[0]}, "
+          f"{args.ai_o} (O) wins: {standings.wins[1]}, "
+          f"draws: {standings.draws}, rounds: {standings.rounds}", end=os.linesep)
+    print(f"{standings.games / duration:,.0f} games/s", end=os.linesep)
+
+
+if __name__ == "__main__":
+    main()
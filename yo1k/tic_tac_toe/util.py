@@ -1,12 +1,39 @@
 from __future__ import annotations
+from collections.abc import Sequence
 from typing import TypeVar, Type
 
 T = TypeVar("T")  # pylint: disable=C0103
 
 
 def eq(cls: Type[T]) -> Type[T]:
-    """Class decorator providing generic comparison functionality."""
+    """Class decorator providing generic comparison functionality.
+
+    Compares attributes in `__dict__`, if any, and in `__slots__` of `cls` and its bases.
+    """
+    slots = tuple(_mangle(klass, name)
+                  for klass in cls.__mro__
+                  for name in _slots(klass)
+                  if name not in ("__dict__", "__weakref__"))
+
     def __eq__(self: T, other: object) -> bool:
-        return isinstance(other, self.__class__) and self.__dict__ == other.__dict__
+        if not isinstance(other, self.__class__):
+            return False
+        for name in slots:
+            if getattr(self, name) != getattr(other, name):
+                return False
+        return getattr(self, "__dict__", None) == getattr(other, "__dict__", None)
     cls.__eq__ = __eq__  # type: ignore
     return cls
+
+
+def _slots(cls: type) -> Sequence[str]:
+    slots = cls.__dict__.get("__slots__", ())
+    return (slots,) if isinstance(slots, str) else tuple(slots)
+
+
+def _mangle(cls: type, name: str) -> str:
+    """Returns the attribute name `name` declared in `cls` after private name mangling."""
+    if name.startswith("__") and not name.endswith("__"):
+        return f"_{cls.__name__.lstrip('_')}{name}"
+    else:
+        return name